@@ -0,0 +1,183 @@
+# Word Chain Admin
+# Live control socket for inspecting and managing a running Word Chain server
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: session table, Unix socket commands, command-line client
+# Updated: 10/19/2026 - analytics command (WordChainAnalytics.py)
+#                     - memory command (WordChainMemory.py)
+#                     - archive command (WordChainArchive.py)
+#
+# The server listens on a Unix domain socket named after its game port
+# (readable by its own user only). Each connection sends one command line
+# and gets a text reply:
+#   sessions        running games: state, round, turn, last word, who the
+#                   game is waiting on and for how long, peer addresses
+#   queue           players waiting in the lobby and games running
+#   end <game id>   force-end a game (no result is recorded)
+#   drain           stop accepting players, let running games finish, then exit
+#   reload          reload the dictionary and word index for new games
+#   analytics [summary | words [N] | word <word> | letters | hours | chains]
+#                   gameplay statistics (WordChainAnalytics.py)
+#   memory          memory per subsystem against its budget, process RSS,
+#                   and whether new games are being refused (WordChainMemory.py)
+#   archive [summary | word <word> [N] | player <name or id> [N] | game <id>]
+#                   finished games from the game archive (WordChainArchive.py)
+#
+# From a shell:  python WordChainAdmin.py [--port 12005] sessions
+#
+# Game threads never wait for the admin. Each game's entry in the session
+# table is an immutable Session that its game thread replaces whole, so a
+# reader copies the table (one C-level dict copy) and always sees each game
+# as it was at a single point in time.
+
+from socket import *
+from _thread import *
+import argparse
+import collections
+import os
+import sys
+import tempfile
+import time
+
+ADMIN_TIMEOUT = 10      # seconds an admin connection may take to send its command
+
+Session = collections.namedtuple("Session",
+                                 "game_id peers state round turn last_word current phase_since started words")
+
+
+def admin_path(port):
+    return os.path.join(tempfile.gettempdir(), f"wordchain-{port}.admin")
+
+
+def format_peer(addr):
+    if isinstance(addr, tuple) and len(addr) >= 2:
+        return f"{addr[0]}:{addr[1]}"
+    return str(addr)
+
+
+class SessionTable:
+    """Running games, readable at any time without locking the game threads."""
+
+    def __init__(self):
+        self.sessions = {}      # game_id -> Session, each replaced whole on every change
+        self._players = {}      # game_id -> players, for force-ending
+        self._ended = set()
+        self.waiting = 0        # players in the lobby
+        self.draining = False
+
+    def open(self, game_id, players):
+        now = time.monotonic()
+        self._players[game_id] = list(players)
+        self.sessions[game_id] = Session(game_id, tuple(format_peer(player.addr) for player in players),
+                                         "starting", 0, 0, None, None, now, now, ())
+
+    def update(self, game_id, **changes):
+        # Called only by the game's own thread; unknown games are ignored
+        session = self.sessions.get(game_id)
+        if session is None:
+            return
+        if changes.get("state", session.state) != session.state \
+                or changes.get("current", session.current) != session.current:
+            changes["phase_since"] = time.monotonic()
+        self.sessions[game_id] = session._replace(**changes)
+
+    def close(self, game_id):
+        self.sessions.pop(game_id, None)
+        self._players.pop(game_id, None)
+        self._ended.discard(game_id)
+
+    def snapshot(self):
+        return list(self.sessions.copy().values())
+
+    def end(self, game_id):
+        # Disconnect every player; the game thread sees them leave and stops
+        players = self._players.get(game_id)
+        if players is None:
+            return False
+        self._ended.add(game_id)
+        for player in players:
+            player.send("An administrator ended this game.\n")
+            player.finish()
+        return True
+
+    def was_ended(self, game_id):
+        return game_id in self._ended
+
+
+def format_sessions(sessions, now=None):
+    now = time.monotonic() if now is None else now
+    if not sessions:
+        return "No games running.\n"
+    lines = [f"{'GAME':>6}  {'STATE':<9} {'ROUND':>5} {'TURN':>5}  {'LAST WORD':<16} "
+             f"{'WAITING ON':<28} {'FOR':>6} {'AGE':>7}  PEERS"]
+    for s in sorted(sessions, key=lambda s: s.started):
+        waiting_on = "-"
+        if s.current is not None:
+            waiting_on = f"Player {s.current} ({s.peers[s.current - 1]})"
+        lines.append(f"{s.game_id:>6}  {s.state:<9} {s.round:>5} {s.turn:>5}  {(s.last_word or '-'):<16.16} "
+                     f"{waiting_on:<28} {now - s.phase_since:>5.1f}s {now - s.started:>6.0f}s  {' '.join(s.peers)}")
+    return "\n".join(lines) + "\n"
+
+
+def handle_admin(sock, sessions, actions):
+    sock.settimeout(ADMIN_TIMEOUT)
+    try:
+        command = sock.makefile("r", encoding="utf-8").readline().split()
+        if not command:
+            reply = "Empty command.\n"
+        elif command[0] == "sessions":
+            reply = format_sessions(sessions.snapshot())
+        elif command[0] == "queue":
+            reply = (f"Players waiting: {sessions.waiting}\nGames running: {len(sessions.sessions)}\n"
+                     f"Draining: {'yes' if sessions.draining else 'no'}\n")
+        elif command[0] in actions:
+            reply = actions[command[0]](command[1:])
+        else:
+            reply = f"Unknown command. Commands: sessions, queue, {', '.join(actions)}\n"
+        sock.sendall(reply.encode())
+    except OSError:
+        pass
+    try:
+        sock.close()
+    except Exception:
+        pass
+
+
+def admin_listener(path, sessions, actions):
+    # actions: command name -> callable(arguments) returning the reply text
+    if "AF_UNIX" not in globals():
+        print("Unix sockets are not available; the admin socket is disabled.")
+        return
+    if os.path.exists(path):
+        os.unlink(path)
+    listenSocket = socket(AF_UNIX, SOCK_STREAM)
+    listenSocket.bind(path)
+    os.chmod(path, 0o600)
+    listenSocket.listen(8)
+    print(f"Admin socket: {path}")
+    while True:
+        sock, _ = listenSocket.accept()
+        start_new_thread(handle_admin, (sock, sessions, actions))
+
+
+def admin_command(path, command):
+    with socket(AF_UNIX, SOCK_STREAM) as sock:
+        sock.settimeout(60)     # reload can take a while
+        sock.connect(path)
+        sock.sendall((" ".join(command) + "\n").encode())
+        reply = b""
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                return reply.decode()
+            reply += data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Word Chain server admin")
+    parser.add_argument("--port", type=int, default=12005, help="game port of the server to manage")
+    parser.add_argument("command", nargs="+", help="sessions | queue | end <game id> | drain | reload | analytics [...] | memory | archive [...]")
+    args = parser.parse_args()
+    try:
+        sys.stdout.write(admin_command(admin_path(args.port), args.command))
+    except OSError as e:
+        sys.exit(f"Cannot reach the server's admin socket: {e}")
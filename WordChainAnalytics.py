@@ -0,0 +1,345 @@
+# Word Chain Analytics
+# Gameplay statistics gathered from game events as they happen, kept in fixed-size arrays
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: event queue, letter/hour/chain arrays, count-min sketch and top words
+# Updated: 10/19/2026 - Average chain length from a running total, not the capped histogram
+#                     - Hourly snapshots are named after the hour they cover
+#
+# Game threads report three kinds of event: a word was accepted, a player
+# was eliminated (and why), and a game ended. Reporting one is a single
+# deque append, so a turn costs no more than it did. A background thread
+# takes the queued events every DRAIN_INTERVAL seconds and adds them to the
+# aggregates:
+#   - per-letter arrays: accepted words by last letter, eliminations by the
+#     letter the player had to start with, and games by their final letter
+#   - per-hour arrays (hour of day): turns taken and turns that timed out
+#   - a histogram of chain lengths (accepted words per game), plus their
+#     total, since the histogram's last bucket holds every longer chain
+#   - word counts in a count-min sketch (SKETCH_DEPTH rows of SKETCH_WIDTH
+#     counters), so memory stays the same however many distinct words are
+#     played, plus the TOP_WORDS most played words by sketch estimate
+#
+# The admin socket answers queries from memory ("analytics words", see
+# query()). Once an hour, and when the server stops, the aggregates are
+# written to WordChainAnalytics/analytics-YYYYMMDD-HH.json, named after the
+# hour that just ended (or, when the server stops, the current one); the newest
+# snapshot is read back at start-up, so the counts carry on across restarts.
+
+import array
+import collections
+import glob
+import json
+import os
+import threading
+import time
+import zlib
+
+ANALYTICS_DIR = "WordChainAnalytics"
+DRAIN_INTERVAL = 0.5    # seconds between passes of the background thread
+SNAPSHOTS_KEPT = 24 * 7 # hourly snapshot files kept on disk
+SKETCH_WIDTH = 4096     # counters per sketch row
+SKETCH_DEPTH = 4        # sketch rows; an estimate is the smallest of its counters
+TOP_WORDS = 50          # most played words tracked exactly by estimate
+CHAIN_BUCKETS = 201     # chain length histogram: 0 to 199 words, then 200 or more
+LETTERS = 27            # a-z, then one slot for every other letter
+
+WORD, ELIMINATION, GAME_OVER = range(3)
+
+# Why a player was eliminated, as reported by play_game()
+REASONS = ("timeout", "invalid", "used", "wrong_letter", "stuck", "empty", "overlong", "disconnected")
+
+
+def letter_slot(letter):
+    slot = ord(letter) - 97
+    return slot if 0 <= slot < 26 else 26
+
+
+def slot_letter(slot):
+    return chr(97 + slot) if slot < 26 else "other"
+
+
+class CountMinSketch:
+    """Approximate counts for any number of distinct words in fixed memory.
+
+    Estimates are never too low; they are too high by at most a small
+    fraction of all words counted, with high probability.
+    """
+
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.counts = array.array("Q", bytes(8 * width * depth))
+        self.total = 0
+
+    def _slots(self, word):
+        # One counter per row, from two hashes combined (double hashing)
+        data = word.encode()
+        first = zlib.crc32(data)
+        second = zlib.adler32(data) | 1
+        return [row * self.width + (first + row * second) % self.width for row in range(self.depth)]
+
+    def add(self, word, count=1):
+        # Returns the word's new estimate
+        counts = self.counts
+        estimate = None
+        for slot in self._slots(word):
+            counts[slot] += count
+            if estimate is None or counts[slot] < estimate:
+                estimate = counts[slot]
+        self.total += count
+        return estimate
+
+    def estimate(self, word):
+        return min(self.counts[slot] for slot in self._slots(word))
+
+
+class Analytics:
+    """Game event queue and the aggregates built from it."""
+
+    def __init__(self):
+        self.enabled = False    # events are dropped until start()
+        self.directory = ANALYTICS_DIR
+        self._events = collections.deque()
+        self._lock = threading.Lock()   # between the background thread and queries
+        self._hour = None               # hour of the last snapshot
+        self.reset()
+
+    def reset(self):
+        self.games = 0
+        self.words = 0
+        self.eliminations = dict.fromkeys(REASONS, 0)
+        self.letter_plays = array.array("Q", bytes(8 * LETTERS))
+        self.letter_deaths = array.array("Q", bytes(8 * LETTERS))
+        self.letter_game_ends = array.array("Q", bytes(8 * LETTERS))
+        self.hour_turns = array.array("Q", bytes(8 * 24))
+        self.hour_timeouts = array.array("Q", bytes(8 * 24))
+        self.chain_lengths = array.array("Q", bytes(8 * CHAIN_BUCKETS))
+        self.chain_words = 0    # accepted words over all games: the exact total behind the average
+        self.sketch = CountMinSketch()
+        self.top = {}           # word -> estimate, at most TOP_WORDS entries
+
+    # Called by game threads: one append each
+
+    def word(self, word):
+        if self.enabled:
+            self._events.append((WORD, word))
+
+    def elimination(self, reason, letter):
+        # letter: the letter the word had to start with, or None on the first turn
+        if self.enabled:
+            self._events.append((ELIMINATION, reason, letter))
+
+    def game_over(self, turns, letter):
+        if self.enabled:
+            self._events.append((GAME_OVER, turns, letter))
+
+    def memory_used(self):
+        # Bytes held by the aggregates and the events not yet drained (estimated per entry)
+        arrays = (self.letter_plays, self.letter_deaths, self.letter_game_ends, self.hour_turns, self.hour_timeouts,
+                  self.chain_lengths, self.sketch.counts)
+        return sum(a.buffer_info()[1] * a.itemsize for a in arrays) + len(self.top) * 128 + len(self._events) * 96
+
+    # Background thread
+
+    def start(self, directory=ANALYTICS_DIR):
+        self.directory = directory
+        self.restore()
+        self._hour = time.strftime("%Y%m%d-%H")
+        self.enabled = True
+        threading.Thread(target=self._run, name="analytics", daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(DRAIN_INTERVAL)
+            self.drain()
+            hour = time.strftime("%Y%m%d-%H")
+            if hour != self._hour:
+                self.save(self._hour)   # the snapshot closes the hour that just ended
+                self._hour = hour
+
+    def drain(self):
+        # Apply every queued event; events are timed by when they are applied
+        events = self._events
+        hour = time.localtime().tm_hour
+        with self._lock:
+            while events:
+                event = events.popleft()
+                if event[0] == WORD:
+                    word = event[1]
+                    self.words += 1
+                    self.hour_turns[hour] += 1
+                    if word:
+                        self.letter_plays[letter_slot(word[-1])] += 1
+                        self._count_word(word)
+                elif event[0] == ELIMINATION:
+                    _, reason, letter = event
+                    self.eliminations[reason] = self.eliminations.get(reason, 0) + 1
+                    if reason != "stuck":   # nobody took a turn
+                        self.hour_turns[hour] += 1
+                    if reason == "timeout":
+                        self.hour_timeouts[hour] += 1
+                    if letter:
+                        self.letter_deaths[letter_slot(letter)] += 1
+                else:
+                    _, turns, letter = event
+                    self.games += 1
+                    self.chain_lengths[min(turns, CHAIN_BUCKETS - 1)] += 1
+                    self.chain_words += turns
+                    if letter:
+                        self.letter_game_ends[letter_slot(letter)] += 1
+
+    def _count_word(self, word):
+        estimate = self.sketch.add(word)
+        top = self.top
+        if word in top or len(top) < TOP_WORDS:
+            top[word] = estimate
+            return
+        weakest = min(top, key=top.get)
+        if estimate > top[weakest]:
+            del top[weakest]
+            top[word] = estimate
+
+    # Snapshots
+
+    def to_json(self):
+        with self._lock:
+            return {"saved": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "games": self.games,
+                    "words": self.words,
+                    "eliminations": dict(self.eliminations),
+                    "letter_plays": self.letter_plays.tolist(),
+                    "letter_deaths": self.letter_deaths.tolist(),
+                    "letter_game_ends": self.letter_game_ends.tolist(),
+                    "hour_turns": self.hour_turns.tolist(),
+                    "hour_timeouts": self.hour_timeouts.tolist(),
+                    "chain_lengths": self.chain_lengths.tolist(),
+                    "chain_words": self.chain_words,
+                    "sketch": {"width": self.sketch.width, "depth": self.sketch.depth,
+                               "total": self.sketch.total, "counts": self.sketch.counts.tolist()},
+                    "top": dict(self.top)}
+
+    def save(self, hour=None):
+        # Write a snapshot (to a temporary file, then renamed) and prune old ones.
+        # hour: the "YYYYMMDD-HH" it is named after, by default the current one
+        self.drain()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"analytics-{hour or time.strftime('%Y%m%d-%H')}.json")
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(self.to_json(), f)
+            os.replace(path + ".tmp", path)
+            for old in sorted(glob.glob(os.path.join(self.directory, "analytics-*.json")))[:-SNAPSHOTS_KEPT]:
+                os.remove(old)
+        except OSError as e:
+            print(f"Could not save the analytics snapshot ({e}).")
+
+    def restore(self):
+        # Carry on from the newest snapshot, if there is one
+        snapshots = sorted(glob.glob(os.path.join(self.directory, "analytics-*.json")))
+        if not snapshots:
+            return
+        try:
+            with open(snapshots[-1], encoding="utf-8") as f:
+                data = json.load(f)
+            with self._lock:
+                self.reset()
+                self.games = data["games"]
+                self.words = data["words"]
+                self.eliminations.update(data["eliminations"])
+                for name in ("letter_plays", "letter_deaths", "letter_game_ends", "hour_turns", "hour_timeouts",
+                             "chain_lengths"):
+                    values = getattr(self, name)
+                    for i, value in enumerate(data[name][:len(values)]):
+                        values[i] = value
+                # Snapshots from before the total was kept: the histogram's estimate
+                self.chain_words = data.get("chain_words",
+                                            sum(length * games for length, games in enumerate(self.chain_lengths)))
+                sketch = data["sketch"]
+                if (sketch["width"], sketch["depth"]) == (self.sketch.width, self.sketch.depth):
+                    self.sketch.counts = array.array("Q", sketch["counts"])
+                    self.sketch.total = sketch["total"]
+                    self.top = dict(list(data["top"].items())[:TOP_WORDS])
+            print(f"Analytics restored from {snapshots[-1]} ({self.games} games).")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Could not read {snapshots[-1]} ({e}); analytics start from zero.")
+            with self._lock:
+                self.reset()
+
+    # Queries, answered from memory for the admin socket
+
+    def query(self, args):
+        self.drain()
+        what = args[0] if args else "summary"
+        with self._lock:
+            if what == "summary":
+                return self._summary()
+            if what == "words":
+                count = int(args[1]) if len(args) > 1 and args[1].isdigit() else 10
+                return self._top_words(count)
+            if what == "word" and len(args) == 2:
+                return f"'{args[1]}' played about {self.sketch.estimate(args[1].lower())} time(s).\n"
+            if what == "letters":
+                return self._letters()
+            if what == "hours":
+                return self._hours()
+            if what == "chains":
+                return self._chains()
+        return "Usage: analytics [summary | words [N] | word <word> | letters | hours | chains]\n"
+
+    def _average_chain(self):
+        return self.chain_words / self.games if self.games else 0.0
+
+    def _summary(self):
+        eliminations = ", ".join(f"{reason} {count}" for reason, count in self.eliminations.items() if count)
+        return (f"Games: {self.games}\nWords accepted: {self.words}\n"
+                f"Average chain length: {self._average_chain():.1f}\n"
+                f"Eliminations: {eliminations or 'none'}\n")
+
+    def _top_words(self, count):
+        if not self.top:
+            return "No words played yet.\n"
+        lines = [f"{'WORD':<24} {'PLAYED':>8}"]
+        for word, estimate in sorted(self.top.items(), key=lambda item: (-item[1], item[0]))[:count]:
+            lines.append(f"{word:<24.24} {estimate:>8}")
+        return "\n".join(lines) + f"\n(estimates; {self.sketch.total} words counted)\n"
+
+    def _letters(self):
+        # Letters that end the most games first
+        lines = [f"{'LETTER':<6} {'GAME ENDS':>9} {'ELIMINATIONS':>12} {'WORDS ENDING':>12} {'OUT RATE':>8}"]
+        for slot in sorted(range(LETTERS), key=lambda slot: (-self.letter_game_ends[slot], -self.letter_deaths[slot])):
+            deaths, plays = self.letter_deaths[slot], self.letter_plays[slot]
+            if not (deaths or plays):
+                continue
+            # Of the turns that had to start with this letter, the share that ended in elimination
+            rate = deaths / (deaths + plays) if deaths + plays else 0.0
+            lines.append(f"{slot_letter(slot):<6} {self.letter_game_ends[slot]:>9} {deaths:>12} {plays:>12} "
+                         f"{rate:>8.1%}")
+        return "\n".join(lines) + "\n"
+
+    def _hours(self):
+        lines = [f"{'HOUR':<5} {'TURNS':>8} {'TIMEOUTS':>8} {'RATE':>6}"]
+        for hour in range(24):
+            turns, timeouts = self.hour_turns[hour], self.hour_timeouts[hour]
+            if turns:
+                lines.append(f"{hour:02}:00 {turns:>8} {timeouts:>8} {timeouts / turns:>6.1%}")
+        return "\n".join(lines) + "\n"
+
+    def _chains(self):
+        if not self.games:
+            return "No games finished yet.\n"
+        points = []
+        for fraction in (0.5, 0.9, 0.99):
+            target = fraction * self.games
+            seen = 0
+            for length, games in enumerate(self.chain_lengths):
+                seen += games
+                if seen >= target:
+                    points.append(f"p{round(fraction * 100)} {length}")
+                    break
+        longest = max(length for length, games in enumerate(self.chain_lengths) if games)
+        cap = "+" if longest == CHAIN_BUCKETS - 1 else ""
+        return (f"Average chain length: {self._average_chain():.1f} words over {self.games} games\n"
+                f"{', '.join(points)}, longest {longest}{cap}\n")
+
+
+analytics = Analytics()
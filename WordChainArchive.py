@@ -0,0 +1,375 @@
+# Word Chain Archive
+# Every finished game's word chain, kept in compressed segments with an inverted index by word and player
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: journal, sealed segments, background index build and merge
+# Updated: 10/19/2026 - Memory estimate of the games in memory and the cached indexes
+#
+# Game threads hand each finished game to archive.add(): an archive id, the
+# time, the language, the players (seat, player ID, name), the finishing order
+# and every word in the order played. The game is appended to a journal
+# (one JSON line, flushed) and kept in memory. Every SEGMENT_GAMES games the
+# journal is sealed and a background thread
+#   - writes the games as one zlib-compressed segment,
+#     WordChainArchive/segment-<first id>-<last id>.seg
+#   - builds the segment's inverted index, index-<first>-<last>.idx: each
+#     word ("w:zebra"), player ID ("p:42") and lowercased name ("n:ada") to
+#     the ids of the games it appears in, in ascending order
+#   - merges index files: once MERGE_FAN_IN files of the same size sit side
+#     by side they become one, so a query opens a few large indexes rather
+#     than one per segment
+# A query ("archive word zebra", "archive player ada 100") takes the newest
+# matching ids from the games still in memory and from the indexes (the
+# parsed ones are cached), then reads only the segments holding those games.
+#
+# Files are written to a temporary name and renamed. After a crash the
+# journal and any sealed journal not yet written out are read back, indexes
+# that a finished merge replaced are removed, and segments without an index
+# are indexed again.
+
+import bisect
+import collections
+import glob
+import json
+import os
+import queue
+import re
+import threading
+import time
+import zlib
+
+ARCHIVE_DIR = "WordChainArchive"
+SEGMENT_GAMES = 256         # games per segment
+MERGE_FAN_IN = 4            # index files of one size merged into one
+INDEX_CACHE_FILES = 16      # parsed index files kept in memory
+QUERY_LIMIT = 20            # games listed by a query unless it asks for more
+GAME_BYTES = 640            # per game in memory: its dict, players and placements
+WORD_BYTES = 96             # per word of a game in memory, or key of a cached index: the string and its slot
+ID_BYTES = 36               # per game id in a cached index: the int and its list slot
+
+SEGMENT_NAME = re.compile(r"(segment|index)-(\d+)-(\d+)\.(seg|idx)$")
+
+
+def index_keys(game):
+    # Every key a game is found under
+    keys = {"w:" + word for word in game["words"]}
+    for _, player_id, name in game["players"]:
+        if player_id is not None:
+            keys.add(f"p:{player_id}")
+        keys.add("n:" + name.lower())
+    return keys
+
+
+def build_index(games):
+    index = collections.defaultdict(list)
+    for game in games:
+        for key in index_keys(game):
+            index[key].append(game["id"])
+    return index
+
+
+def write_compressed(path, data):
+    with open(path + ".tmp", "wb") as f:
+        f.write(zlib.compress(data.encode(), 6))
+    os.replace(path + ".tmp", path)
+
+
+def read_compressed(path):
+    with open(path, "rb") as f:
+        return zlib.decompress(f.read()).decode()
+
+
+def describe(game):
+    # One line per game for query results
+    players = ", ".join(f"{seat}:{name}" for seat, _, name in game["players"])
+    words = game["words"]
+    chain = " ".join(words) if len(words) <= 8 else " ".join(words[:4]) + " ... " + " ".join(words[-3:])
+    return (f"#{game['id']:<7} {time.strftime('%Y-%m-%d %H:%M', time.localtime(game['time']))} "
+            f"{game['language']:<6} {len(words):>4} words  [{players}]  {chain}")
+
+
+class GameArchive:
+    """Finished games on disk, searchable by word and by player."""
+
+    def __init__(self):
+        self.enabled = False        # games are not kept until start()
+        self.directory = ARCHIVE_DIR
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._active = []           # games in the journal, oldest first
+        self._sealing = {}          # first id -> games of a sealed journal not yet written as a segment
+        self._segments = []         # (first, last) of each segment file, ascending
+        self._indexes = []          # (first, last) of each index file, ascending
+        self._cache = collections.OrderedDict()     # (first, last) -> (parsed index, estimated bytes), LRU first
+        self._journal = None
+        self._work = queue.SimpleQueue()
+
+    def _path(self, kind, first=None, last=None):
+        if kind == "journal":
+            return os.path.join(self.directory, "journal.jsonl")
+        if kind == "sealed":
+            return os.path.join(self.directory, f"sealed-{first:010}.jsonl")
+        extension = "seg" if kind == "segment" else "idx"
+        return os.path.join(self.directory, f"{kind}-{first:010}-{last:010}.{extension}")
+
+    # --- start-up and recovery ---------------------------------------------
+
+    def start(self, directory=ARCHIVE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        for path in os.listdir(directory):
+            match = SEGMENT_NAME.match(path)
+            if match:
+                (self._segments if match[1] == "segment" else self._indexes).append((int(match[2]), int(match[3])))
+        self._segments.sort()
+        self._indexes.sort()
+        self._drop_merged_indexes()
+        last_id = self._segments[-1][1] if self._segments else 0
+        for path in sorted(glob.glob(os.path.join(directory, "sealed-*.jsonl"))):
+            games = self._read_journal(path)
+            if games and not any(first == games[0]["id"] for first, _ in self._segments):
+                self._sealing[games[0]["id"]] = games
+                self._work.put(("segment", games))
+                last_id = max(last_id, games[-1]["id"])
+            else:
+                os.remove(path)     # written out before the crash
+        indexed = [span for span in self._segments if self._indexed(span)]
+        for first, last in self._segments:
+            if (first, last) not in indexed:
+                self._work.put(("index", first, last))
+        self._active = self._read_journal(self._path("journal"))
+        if self._active:
+            last_id = max(last_id, self._active[-1]["id"])
+        self._next_id = last_id + 1
+        self._journal = open(self._path("journal"), "a", encoding="utf-8")
+        self.enabled = True
+        threading.Thread(target=self._run, name="archive", daemon=True).start()
+        print(f"Game archive: {self._next_id - 1} game(s) in {directory}.")
+
+    def _read_journal(self, path):
+        games = []
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        games.append(json.loads(line))
+                    except ValueError:
+                        break   # a line cut short by a crash
+        except OSError:
+            pass
+        return games
+
+    def _drop_merged_indexes(self):
+        # Indexes inside another's range were merged into it just before a crash
+        kept = []
+        for first, last in self._indexes:
+            if any(f <= first and last <= l and (f, l) != (first, last) for f, l in self._indexes):
+                os.remove(self._path("index", first, last))
+            else:
+                kept.append((first, last))
+        self._indexes = kept
+
+    def _indexed(self, span):
+        return any(first <= span[0] and span[1] <= last for first, last in self._indexes)
+
+    # --- adding games (game threads) ----------------------------------------
+
+    def add(self, language, players, placements, words):
+        # players: [(seat, player ID or None, name)]; placements: seats, winner first
+        if not self.enabled:
+            return None
+        with self._lock:
+            game = {"id": self._next_id, "time": int(time.time()), "language": language,
+                    "players": [list(player) for player in players], "placements": list(placements),
+                    "words": list(words)}
+            self._next_id += 1
+            try:
+                self._journal.write(json.dumps(game, separators=(",", ":")) + "\n")
+                self._journal.flush()
+            except (OSError, ValueError) as e:
+                print(f"Could not write to the game archive journal ({e}).")
+            self._active.append(game)
+            if len(self._active) >= SEGMENT_GAMES:
+                self._seal()
+        return game["id"]
+
+    def _seal(self):
+        # Called with the lock held: hand the journal's games to the background thread
+        games, self._active = self._active, []
+        self._journal.close()
+        os.replace(self._path("journal"), self._path("sealed", games[0]["id"]))
+        self._journal = open(self._path("journal"), "a", encoding="utf-8")
+        self._sealing[games[0]["id"]] = games
+        self._work.put(("segment", games))
+
+    def close(self):
+        with self._lock:
+            self.enabled = False
+            if self._journal is not None:
+                self._journal.close()
+
+    # --- background thread ----------------------------------------------------
+
+    def _run(self):
+        while True:
+            job = self._work.get()
+            try:
+                if job[0] == "segment":
+                    self._write_segment(job[1])
+                else:
+                    _, first, last = job
+                    lines = read_compressed(self._path("segment", first, last)).splitlines()
+                    self._write_index(first, last, build_index(json.loads(line) for line in lines))
+                self._merge()
+            except (OSError, ValueError, zlib.error) as e:
+                print(f"Game archive: {job[0]} failed ({e}).")
+
+    def _write_segment(self, games):
+        first, last = games[0]["id"], games[-1]["id"]
+        write_compressed(self._path("segment", first, last),
+                         "\n".join(json.dumps(game, separators=(",", ":")) for game in games))
+        self._write_index(first, last, build_index(games))
+        with self._lock:
+            bisect.insort(self._segments, (first, last))
+            del self._sealing[first]
+        os.remove(self._path("sealed", first))
+
+    def _write_index(self, first, last, index):
+        write_compressed(self._path("index", first, last), json.dumps(index, separators=(",", ":")))
+        with self._lock:
+            bisect.insort(self._indexes, (first, last))
+
+    def _merge(self):
+        # Merge the oldest run of MERGE_FAN_IN neighbouring index files of the same size
+        with self._lock:
+            indexes = list(self._indexes)
+        sizes = [self._size_class(span) for span in indexes]
+        for start in range(len(indexes) - MERGE_FAN_IN + 1):
+            if len(set(sizes[start:start + MERGE_FAN_IN])) == 1:
+                run = indexes[start:start + MERGE_FAN_IN]
+                break
+        else:
+            return
+        merged = collections.defaultdict(list)
+        for span in run:                    # ascending, so each list stays in order
+            for key, ids in self._load_index(span).items():
+                merged[key].extend(ids)
+        first, last = run[0][0], run[-1][1]
+        write_compressed(self._path("index", first, last), json.dumps(merged, separators=(",", ":")))
+        with self._lock:
+            self._indexes = sorted([span for span in self._indexes if span not in run] + [(first, last)])
+            for span in run:
+                self._cache.pop(span, None)
+        for span in run:
+            os.remove(self._path("index", *span))
+        self._merge()   # the merged file may complete a run of the next size
+
+    def _size_class(self, span):
+        # Segments covered, in powers of MERGE_FAN_IN
+        segments = max(1, round((span[1] - span[0] + 1) / SEGMENT_GAMES))
+        size = 0
+        while segments >= MERGE_FAN_IN:
+            segments //= MERGE_FAN_IN
+            size += 1
+        return size
+
+    def _load_index(self, span):
+        with self._lock:
+            cached = self._cache.get(span)
+            if cached is not None:
+                self._cache.move_to_end(span)
+                return cached[0]
+        index = json.loads(read_compressed(self._path("index", *span)))
+        size = sum(WORD_BYTES + len(ids) * ID_BYTES for ids in index.values())
+        with self._lock:
+            self._cache[span] = (index, size)
+            while len(self._cache) > INDEX_CACHE_FILES:
+                self._cache.popitem(last=False)
+        return index
+
+    def memory_used(self):
+        # Bytes held by the games not yet in a segment and by the cached indexes (estimated)
+        with self._lock:
+            games = self._active + [game for games in self._sealing.values() for game in games]
+            indexes = sum(size for _, size in self._cache.values())
+        return indexes + sum(GAME_BYTES + len(game["words"]) * WORD_BYTES for game in games)
+
+    # --- queries --------------------------------------------------------------
+
+    def find(self, key, limit=QUERY_LIMIT):
+        # Ids of the newest `limit` games found under key, newest first
+        with self._lock:
+            in_memory = self._active + [game for games in self._sealing.values() for game in games]
+            indexes = list(self._indexes)
+        ids = sorted((game["id"] for game in in_memory if key in index_keys(game)), reverse=True)
+        for span in reversed(indexes):
+            if len(ids) >= limit:
+                break
+            try:
+                ids.extend(reversed(self._load_index(span).get(key, [])))
+            except FileNotFoundError:
+                return self.find(key, limit)    # merged away meanwhile: start again with the merged index
+        return sorted(set(ids), reverse=True)[:limit]
+
+    def games(self, ids):
+        # The games with these ids, reading each segment that holds any of them once
+        with self._lock:
+            in_memory = {game["id"]: game for game in self._active}
+            for games in self._sealing.values():
+                in_memory.update((game["id"], game) for game in games)
+            segments = list(self._segments)
+        found = {}
+        wanted = collections.defaultdict(set)
+        for game_id in ids:
+            if game_id in in_memory:
+                found[game_id] = in_memory[game_id]
+                continue
+            at = bisect.bisect_right(segments, (game_id, float("inf"))) - 1
+            if at >= 0 and segments[at][0] <= game_id <= segments[at][1]:
+                wanted[segments[at]].add(game_id)
+        for span, game_ids in wanted.items():
+            for line in read_compressed(self._path("segment", *span)).splitlines():
+                game = json.loads(line)
+                if game["id"] in game_ids:
+                    found[game["id"]] = game
+        return [found[game_id] for game_id in ids if game_id in found]
+
+    def query(self, args):
+        # Admin socket: archive [summary | word <word> [N] | player <name or id> [N] | game <id>]
+        what = args[0] if args else "summary"
+        try:
+            if what == "summary":
+                return self._summary()
+            if what in ("word", "player") and len(args) in (2, 3):
+                limit = int(args[2]) if len(args) == 3 and args[2].isdigit() else QUERY_LIMIT
+                if what == "word":
+                    key = "w:" + args[1].lower()
+                else:
+                    key = f"p:{args[1]}" if args[1].isdigit() else "n:" + args[1].lower()
+                games = self.games(self.find(key, limit))
+                if not games:
+                    return f"No archived games for {what} {args[1]}.\n"
+                return "\n".join(describe(game) for game in games) + "\n"
+            if what == "game" and len(args) == 2 and args[1].isdigit():
+                games = self.games([int(args[1])])
+                if not games:
+                    return f"No archived game #{args[1]}.\n"
+                game = games[0]
+                order = ", ".join(f"Player {seat}" for seat in game["placements"])
+                return f"{describe(game)}\nFinishing order: {order}\nWords: {' '.join(game['words'])}\n"
+        except (OSError, ValueError, zlib.error) as e:
+            return f"Could not read the archive ({e}).\n"
+        return "Usage: archive [summary | word <word> [N] | player <name or id> [N] | game <id>]\n"
+
+    def _summary(self):
+        with self._lock:
+            games = self._next_id - 1
+            in_memory = len(self._active) + sum(len(games) for games in self._sealing.values())
+            segments, indexes = list(self._segments), list(self._indexes)
+        disk = sum(os.path.getsize(self._path("segment", *span)) for span in segments)
+        index_disk = sum(os.path.getsize(self._path("index", *span)) for span in indexes)
+        return (f"Games archived: {games} ({in_memory} not yet in a segment)\n"
+                f"Segments: {len(segments)}, {disk / 1024:.1f} KB\n"
+                f"Index files: {len(indexes)}, {index_disk / 1024:.1f} KB\n")
+
+
+archive = GameArchive()
@@ -0,0 +1,122 @@
+# Word Chain Bot
+# Computer opponent that plays from the precomputed word index
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: easy and hard bots
+# Updated: 10/19/2026 - Answers go into an Inbox rather than a socket pair
+#                     - Played words are parsed like the clients do, so words with apostrophes are marked used
+#                     - Gives up its turn instead of looping when no word is left to start with
+#
+# A BotConnection stands in for a player's Connection in a game room. The
+# server's messages are handed to send(), which the bot reads in place on
+# the game thread; its answers are queued in the same kind of inbox a
+# player's Connection is read from. No sockets or extra threads are used
+# per bot, and choosing a move is a handful of array lookups, so one
+# server process can host thousands of bot games.
+#
+# Difficulty:
+#   "easy" - a random unused word that starts with the right letter
+#   "hard" - a word ending on the letter that leaves the opponent the fewest
+#            remaining words (ideally none)
+
+import random
+
+from WordChainConnection import Inbox
+from WordChainMetrics import metrics
+from WordChainProtocol import WordPlayed, parse_line
+from WordChainWordIndex import LETTERS, letter_index
+
+BOT_DIFFICULTIES = ("easy", "hard")
+
+
+class BotConnection(Inbox):
+    """A computer player that looks like a Connection to the game engine."""
+
+    def __init__(self, index, difficulty="hard"):
+        if difficulty not in BOT_DIFFICULTIES:
+            raise ValueError(f"Unknown bot difficulty '{difficulty}'")
+        self.index = index
+        self.difficulty = difficulty
+        self.addr = ("bot", difficulty)
+        Inbox.__init__(self)
+        self.settimeout(15)
+        self.closed = False
+        self.pool = index.new_pool()
+        self.last_letter = None
+        metrics.inc("bot_players")
+
+    # --- Connection interface (settimeout, recv and poll come from Inbox) ---
+
+    def send(self, data):
+        if self.closed:
+            return False
+        if isinstance(data, bytes):
+            data = data.decode()
+        for line in data.splitlines():
+            self._read_line(line)
+        return True
+
+    sendall = send
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self._deliver(b"")
+
+    finish = close
+
+    def close_when_flushed(self, deadline=2.0):
+        self.close()
+
+    # --- playing --------------------------------------------------------------
+
+    def _answer(self, text):
+        self._deliver(text.encode())
+
+    def _read_line(self, line):
+        if line.startswith("Welcome to Word Chain"):
+            self.pool = self.index.new_pool()   # a new game
+            self.last_letter = None
+        elif " used '" in line:
+            event = parse_line(line)
+            if isinstance(event, WordPlayed) and event.word:
+                self.pool.mark_used(event.word)
+                self.last_letter = event.word[-1]
+        elif line.startswith("Your turn"):
+            word = self.choose_word()
+            if word is None:
+                self._answer("\n")  # stuck: no word left, concede the turn
+            else:
+                self.pool.mark_used(word)
+                self.last_letter = word[-1]
+                self._answer(word)
+        elif line.startswith("Rematch?"):
+            self._answer("yes")
+        elif line.startswith("Please enter your name for the record"):
+            self._answer(f"computer ({self.difficulty})")
+
+    def choose_word(self):
+        pool = self.pool
+        if self.last_letter is None:
+            if not any(pool.starting_counts):
+                return None     # every indexed word has been played
+            first = letter_index(random.choice(LETTERS))
+            while not pool.starting_counts[first]:
+                first = letter_index(random.choice(LETTERS))
+        elif "a" <= self.last_letter <= "z":
+            first = letter_index(self.last_letter)
+        else:
+            return None
+        row = first * 26
+        counts = pool.group_counts
+        endings = [last for last in range(26) if counts[row + last]]
+        if not endings:
+            return None
+        if self.difficulty == "easy":
+            last = random.choice(endings)
+        else:
+            # Words the opponent could answer with after we end on `last`;
+            # playing a word that starts with `last` itself removes one of them.
+            starting = pool.starting_counts
+            last = min(endings, key=lambda l: (starting[l] - (l == first), random.random()))
+        return pool.take(row + last)
@@ -10,14 +10,31 @@
 #                     - Refactored input with timeout to use threading for better UX
 # UpdatedL 11/30/2025 - Added high scores display after game over
 # Updated: 11/30/2025 - Added ASCII Art throughout the client
+# Updated: 10/19/2026 - Recognise "Player N used" messages from multi-player rooms
+#                     - Optional server/port arguments and tournament check-in
+#                     - Optional local dictionary checks before sending a word
+#                     - Follow a cluster coordinator's redirect to a game node
+#                     - Heartbeats; messages end with a newline so heartbeats cannot merge with them
+#                     - Connect over IPv6, or over the server's Unix socket when given a path
+#                     - Optional room language argument (e.g. de_DE)
+#                     - Connect-time handshake with a name, or the token saved in WordChainToken.txt
+#                     - Reconnect and resume the game with the session token when the connection drops
+#                     - Networking and message parsing moved to WordChainProtocol.py; this is the terminal front-end
 
-from socket import *
 import os
 import threading
 import time
 import sys
 import queue
 
+from WordChainClientDictionary import load_local_dictionary
+from WordChainProtocol import Client, Welcome, NewGame, Resumed, Token, DictionaryVersion, WordPlayed, Accepted, \
+    GameOver, YourTurn, RematchPrompt, NamePrompt, TournamentPrompt, Goodbye, Disconnected, Reconnecting, Message, \
+    Identified, SessionExpired, SERVER_PORT
+
+TOKEN_FILE = "WordChainToken.txt"   # the token the server issued for our name
+GOODBYE_WAIT = 5    # seconds to wait for the rest of the goodbye message (the high scores)
+
 def ascii_title():
     print(r"""+o==o--o==o--o==o--o==o--o==o--o==o==o+
 ||          WORD CHAIN GAME          ||
@@ -155,7 +172,7 @@ def countdown_timer(client_socket, response_event, timeout_seconds):
     if not response_event.is_set():
         # Timer reached zero and nobody responded: notify server.
         print("\nTime expired! Sending timer expired to server.")
-        client_socket.send("TimerExpired".encode())
+        client_socket.send("TimerExpired\n".encode())
         response_event.set()
         # Clear the reserved status line so it doesn't show a stale timer.
         try:
@@ -172,81 +189,87 @@ def countdown_timer(client_socket, response_event, timeout_seconds):
         except Exception:
             pass
 
-def client_main():
-    serverIP = "localhost"
-    serverPort = 12005
-    clientSocket = socket(AF_INET, SOCK_STREAM)
-    clientSocket.connect((serverIP, serverPort))
-
-    # Start a background thread to receive messages and put them into a queue.
-    message_queue = queue.Queue()
-
-    def socket_receiver(sock, msg_queue):
-        # Receiver only handles networking: receive data and enqueue messages.
-        # The main loop is responsible for all terminal output (printing).
-        while True:
-            data = sock.recv(1024)
-            if not data:
-                # Socket closed by server. Put a sentinel so the main loop
-                # can process any remaining queued messages (e.g. final
-                # "Thanks for playing" text) and then exit cleanly.
-                try:
-                    msg_queue.put(None)
-                except Exception:
-                    pass
-                return
-            text = data.decode()
-            msg_queue.put(text)
+def load_token():
+    try:
+        with open(TOKEN_FILE) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
 
-    recv_thread = threading.Thread(target=socket_receiver, args=(clientSocket, message_queue), daemon=True)
-    recv_thread.start()
+def save_token(token):
+    try:
+        with open(TOKEN_FILE, "w") as f:
+            f.write(token + "\n")
+    except OSError:
+        pass
+
+def ask_name():
+    # Without a saved token the server needs a name; none makes us a guest
+    try:
+        return input("Enter your name: ").strip() or None
+    except (EOFError, KeyboardInterrupt):
+        return None
+
+def client_main():
+    # Optional arguments: server address (or Unix socket path), port (e.g. a tournament on port 12007)
+    # and the language to play in (e.g. de_DE; the server's default otherwise)
+    serverIP = sys.argv[1] if len(sys.argv) > 1 else "localhost"
+    serverPort = int(sys.argv[2]) if len(sys.argv) > 2 else SERVER_PORT
+    language = sys.argv[3] if len(sys.argv) > 3 else None
+    token = load_token()
+    client = Client(serverIP, serverPort, name=None if token else ask_name(), token=token, language=language)
+    client.connect()
     clear_screen()
     ascii_title()
     print("Connected to Word Chain server. Awaiting Game Start...")
-    current_round = 1
-    current_turn = 1
-    my_count = 1
-    while True:
-        # Wait for the next message from the server (placed by receiver thread)
-        message = message_queue.get()
-        if message is None:
-            break
-        # Clear screen when a new game starts or a word is accepted so the
-        # player sees a clean prompt. Keep other messages visible for context.
-        if ("Accepted" in message) or ("Invalid word" in message) or ("Player used" in message) or  ("Game start" in message) or ("Starting new game" in message):
-            clear_screen()
 
-        for line in message.splitlines():
-            if line.strip().startswith("Your turn"):
-                continue
-            if line.startswith("Round "):
-                try:
-                    current_round = int(line.split()[1])
-                except Exception:
-                    current_round = max(1, current_round)
-                my_count = 1
-                continue
+    # A background thread reads events (and sends heartbeats) while the main
+    # loop below, which does all the terminal output, may be waiting on input()
+    event_queue = queue.Queue()
 
-            if line.startswith("Turn "):
-                try:
-                    current_turn = int(line.split()[1])
-                except Exception:
-                    current_turn = max(0, current_turn)
-                continue
+    def event_receiver():
+        for event in client.events():
+            event_queue.put(event)
 
-            if line.startswith("Accepted"):
-                my_count += 1
+    threading.Thread(target=event_receiver, daemon=True).start()
 
-            if "Game over! You won!" in line:
-                banner_win()
-                continue
+    # Optional local copy of the server's word list (WordChainClientWords.gz).
+    # It is only used once the server confirms both copies are the same version.
+    local_dictionary = load_local_dictionary()
+    local_checks = False
+    state = client.state
+    while True:
+        event = event_queue.get()
+        kind = type(event)
+        # Clear screen when a game starts or a word is played so the player
+        # sees a clean prompt. Keep other messages visible for context.
+        if kind in (Welcome, NewGame, Resumed, Accepted, WordPlayed) or "Invalid word" in event.text:
+            clear_screen()
 
-            if "Game over! You lost." in line:
+        if kind is Token:
+            # Identifies us next time without typing a name
+            save_token(event.token)
+        elif kind is DictionaryVersion:
+            if local_dictionary is None:
+                local_checks = False
+            elif local_dictionary.version == event.version:
+                if not local_checks:
+                    print("Local dictionary matches the server: words are checked before sending.")
+                local_checks = True
+            else:
+                print(f"Local dictionary is out of date (server {event.version}, "
+                      f"local {local_dictionary.version}); checks before sending are off.")
+                local_checks = False
+                local_dictionary = None
+        elif kind is GameOver:
+            if event.won:
+                banner_win()
+            else:
                 banner_lose()
-                continue
-
-            print(line)
-        if "Your turn" in message:
+        elif kind in (Message, Identified, Welcome, NewGame, Resumed, WordPlayed, Accepted, Reconnecting,
+                      SessionExpired):
+            print(event.text)
+        elif kind is YourTurn:
             # Use input_with_timeout for turn input so timeout handling and the
             # per-second countdown are centralized in one helper.
 
@@ -254,8 +277,8 @@ def client_main():
 
             # Reserve a status line and show prompt
             print()  # blank line reserved for timer/status
-            print(round_count(current_round))
-            print(your_turn_count(my_count))
+            print(round_count(state.round))
+            print(your_turn_count(state.accepted + 1))
             print("+--------------------+")
             print("|  >> YOUR TURN <<   |")
             print("+--------------------+")
@@ -265,34 +288,36 @@ def client_main():
 
             # Get input with timeout. input_with_timeout returns the string or
             # None on timeout.
+            turn_deadline = time.monotonic() + timeout_seconds
             word = input_with_timeout("", timeout_seconds)
 
+            # Check spelling, first letter and repeats locally so obvious
+            # mistakes are caught without a round trip. The server still
+            # decides: entering the same word again sends it anyway.
+            while word and word.strip() and word.strip() != "/hint" and local_checks:
+                problem = local_dictionary.problem(word, state.last_letter, state.used_words)
+                remaining = int(turn_deadline - time.monotonic())
+                if problem is None or remaining < 1:
+                    break
+                print(f"Warning: {problem} Enter it again to send anyway, or type another word.")
+                print()  # blank line reserved for timer/status
+                sys.stdout.write("Enter your word: ")
+                sys.stdout.flush()
+                retry = input_with_timeout("", remaining)
+                if retry is None or retry.strip().lower() == word.strip().lower():
+                    word = retry
+                    break
+                word = retry
+
             if word is None:
                 # Timed out
                 print("\nTime expired! Sending timer expired to server.")
-                try:
-                    clientSocket.send("TimerExpired".encode())
-                except Exception:
-                    pass
+                client.timer_expired()
             else:
-                word = word.strip()
-                if word == "":
-                    # Player intentionally (or accidentally) sent an empty word.
-                    # Send a newline so the server receives bytes that decode
-                    # to an empty string (server handles empty submissions).
-                    try:
-                        clientSocket.send("\n".encode())
-                    except Exception:
-                        pass
-                else:
-                    try:
-                        clientSocket.send(word.encode())
-                    except Exception:
-                        pass
-        elif "Rematch?" in message:
-            # Handle rematch prompt (no timer for this prompt, user has more time)
-            #print()  # blank line
-            #print(message)
+                # An empty word is sent as an empty line (the server handles empty submissions)
+                client.play(word)
+        elif kind is RematchPrompt:
+            print(event.text)
             sys.stdout.write("Enter your response (yes/no): ")
             sys.stdout.flush()
 
@@ -302,41 +327,40 @@ def client_main():
             answer = input_with_timeout("", rematch_timeout)
             if answer is None:
                 print("\nNo rematch response entered in time. Sending 'no' and exiting.")
-                try:
-                    clientSocket.send("no".encode())
-                except Exception:
-                    pass
-                try:
-                    clientSocket.close()
-                except Exception:
-                    pass
+                client.answer("no")
+                client.close()
                 # Exit the client application
                 return
 
             response = answer.strip().lower()
             if response == '':
                 response = 'no'
-
-            try:
-                clientSocket.send(response.encode())
-            except Exception:
-                pass
+            client.answer(response)
             print(f"Sent rematch response: {response}")
-        elif "Please enter your name for the record" in message:
-            # Server is asking for player name to store in records
-            # Message is already printed by the main loop, just get input
+        elif kind is TournamentPrompt or kind is NamePrompt:
+            # Tournament check-in (the name must match the registered player
+            # list), or the name to store in the records
+            print(event.text)
             try:
                 name = input()
             except (EOFError, KeyboardInterrupt):
-                name = "Anonymous"
-            try:
-                clientSocket.send(name.encode())
-            except Exception:
-                pass
-        elif "Thanks for playing" in message or not message:
+                name = "" if kind is TournamentPrompt else "Anonymous"
+            client.answer(name)
+        elif kind is Goodbye or kind is Disconnected:
+            print(event.text)
+            # The high scores come after "Thanks for playing!"; show everything
+            # until the server closes the connection
+            while kind is not Disconnected:
+                try:
+                    event = event_queue.get(timeout=GOODBYE_WAIT)
+                except queue.Empty:
+                    break
+                kind = type(event)
+                if kind is not Disconnected:
+                    print(event.text)
             print("Game session ended.")
             break
 
-    clientSocket.close()
+    client.close()
 
-client_main()
\ No newline at end of file
+client_main()
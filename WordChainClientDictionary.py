@@ -0,0 +1,56 @@
+# Word Chain Client Dictionary
+# Local copy of the server's word list, used by the clients to catch mistakes before sending
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: spelling, first-letter and duplicate checks
+#
+# The file is produced on the server with `python WordChainWordIndex.py`.
+# Its first line carries the dictionary version; the server announces its
+# own version at the start of every game and the client only uses the local
+# copy when the two match. The server always has the final say: a word the
+# local copy rejects can still be sent.
+
+import bisect
+import gzip
+import os
+
+CLIENT_DICTIONARY_FILE = "WordChainClientWords.gz"
+
+
+class LocalDictionary:
+    """Sorted word list searched with bisect; smaller than a set of the same words."""
+
+    def __init__(self, words, version):
+        self.words = words
+        self.version = version
+
+    def check(self, word):
+        i = bisect.bisect_left(self.words, word)
+        return i < len(self.words) and self.words[i] == word
+
+    def problem(self, word, last_letter, used_words):
+        # Reason the server would reject `word`, or None if it looks fine
+        word = word.strip().lower()
+        if last_letter and not word.startswith(last_letter):
+            return f"'{word}' does not start with '{last_letter}'."
+        if word in used_words:
+            return f"'{word}' has already been used."
+        if not self.check(word):
+            return f"'{word}' is not in the dictionary."
+        return None
+
+
+def load_local_dictionary(path=CLIENT_DICTIONARY_FILE):
+    # Returns a LocalDictionary, or None if there is no usable file
+    if not os.path.exists(path):
+        return None
+    opener = gzip.open if path.endswith(".gz") else open
+    try:
+        with opener(path, "rt", encoding="utf-8") as f:
+            header = f.readline().split()
+            if header[:2] != ["#", "wordchain-dictionary"] or len(header) != 3:
+                return None
+            words = f.read().split()
+    except (OSError, EOFError, ValueError):
+        return None
+    words.sort()    # normally already sorted; cheap if so
+    return LocalDictionary(words, header[2])
@@ -0,0 +1,382 @@
+# Word Chain Cluster
+# Coordinator that matches players and routes each room to the least-loaded game node
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: coordinator, node load reports, ticket redirects
+# Updated: 10/19/2026 - Nodes leave the coordinator when they hand over to a restarted process
+#                     - The client's handshake may follow its ticket
+#                     - Players who drop out of a game reconnect to the node with "Resume <token>"
+#                     - The coordinator groups its lobby by language and the ticket carries the room's language
+#
+# Running a cluster on one machine (each line in its own terminal):
+#   python WordChainCluster.py 2                                    coordinator + records service
+#   python WordChainServer.py --coordinator localhost --port 12101 --spectator-port 12102
+#   python WordChainServer.py --coordinator localhost --port 12201 --spectator-port 12202
+#   python WordChainClient.py                                       players connect to the coordinator
+#
+# Clients connect to the coordinator on the usual game port, with the usual
+# handshake; the coordinator only reads its "Language" line, so that, as on
+# a single server, only players of one language share a room. Once a room is
+# filled the coordinator picks the node with the least load, tells that node
+# to expect a ticket, and sends every player in the room
+#   Redirect <host> <port> <ticket>
+# The client reconnects to the node and sends "Ticket <ticket>", then its
+# handshake again; the node starts the game once the whole room has arrived. From then on the
+# coordinator is not involved: turns go straight between players and node.
+# A player whose connection drops reconnects to the same node and sends
+# "Resume <session token>" in place of a ticket.
+#
+# Nodes keep a connection to the coordinator's registry port and send JSON
+# lines on it: one hello with their game port, then a load report every
+# LOAD_REPORT_INTERVAL seconds (active games, average turn latency, CPU use).
+# A node that misses reports for NODE_STALE_AFTER seconds gets no new rooms.
+# The records service (WordChainRecordsService.py) runs inside the
+# coordinator process so every node updates the same records file.
+
+from socket import *
+from _thread import *
+import argparse
+import itertools
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+
+from WordChainMetrics import metrics, metrics_reporter
+from WordChainRecordsService import records_service, RECORDS_SERVICE_PORT
+from WordChainServer import fill_lobby, active_games, ROOM_SIZE, ROOM_MAX_PLAYERS, SERVER_PORT, HANDSHAKE_WAIT
+from WordChainDictionaries import DEFAULT_LANGUAGE, is_language_tag
+
+NODE_REGISTRY_PORT = 12010
+LOAD_REPORT_INTERVAL = 2            # seconds between node load reports
+NODE_STALE_AFTER = 3 * LOAD_REPORT_INTERVAL
+TICKET_WAIT = 30                    # seconds a node holds a room open for its redirected players
+
+
+class NodeInfo:
+    """What the coordinator knows about one game node."""
+
+    __slots__ = ("node_id", "host", "port", "sock", "bots", "games", "turn_latency_ms",
+                 "cpu_percent", "pending", "last_report", "send_lock")
+
+    def __init__(self, node_id, host, port, sock, bots):
+        self.node_id = node_id
+        self.host = host
+        self.port = port
+        self.sock = sock
+        self.bots = bots
+        self.games = 0
+        self.turn_latency_ms = 0.0
+        self.cpu_percent = 0.0
+        self.pending = 0            # rooms sent since the last load report
+        self.last_report = time.monotonic()
+        self.send_lock = threading.Lock()
+
+    def load(self):
+        # Compared as a tuple: games first, then CPU and latency as tie-breaks
+        return (self.games + self.pending, round(self.cpu_percent / 10), self.turn_latency_ms)
+
+    def send(self, message):
+        with self.send_lock:
+            self.sock.sendall((json.dumps(message) + "\n").encode())
+
+
+class LobbySocket:
+    """A player waiting in the coordinator's lobby: the raw socket, and the
+    room language from its handshake, read without holding up the lobby."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.sock.setblocking(False)
+        self.connected_at = time.monotonic()
+        self.closed = False
+        self._data = b""
+        self._language = None
+
+    def language(self):
+        # The language asked for, DEFAULT_LANGUAGE if the handshake has none,
+        # or None while it may still be on its way
+        if self._language is not None or self.closed:
+            return self._language
+        try:
+            data = self.sock.recv(1024)
+            if not data:
+                self.closed = True      # left the lobby
+                return None
+            self._data += data
+        except BlockingIOError:
+            pass
+        except OSError:
+            self.closed = True
+            return None
+        if not self._data and time.monotonic() - self.connected_at < HANDSHAKE_WAIT:
+            return None
+        self._language = DEFAULT_LANGUAGE
+        for line in self._data.decode(errors="replace").splitlines():
+            key, _, value = line.strip().partition(" ")
+            if key == "Language" and is_language_tag(value):
+                self._language = value
+        return self._language
+
+
+class Coordinator:
+    """Node registry plus room routing. Only touched when a node reports or a room fills."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.nodes = {}
+        self._node_ids = itertools.count(1)
+        self._room_ids = itertools.count(1)
+        metrics.gauge("cluster_nodes", lambda: len(self.live_nodes()))
+
+    def live_nodes(self):
+        cutoff = time.monotonic() - NODE_STALE_AFTER
+        with self._lock:
+            return [node for node in self.nodes.values() if node.last_report >= cutoff]
+
+    def bots_available(self):
+        return any(node.bots for node in self.live_nodes())
+
+    def least_loaded(self, needs_bots=False):
+        nodes = [node for node in self.live_nodes() if node.bots or not needs_bots]
+        if not nodes:
+            return None
+        with self._lock:
+            node = min(nodes, key=NodeInfo.load)
+            node.pending += 1
+            return node
+
+    def handle_node(self, sock, addr):
+        # One thread per node: hello, then load reports until the node goes away
+        reader = sock.makefile("r", encoding="utf-8")
+        node = None
+        try:
+            hello = json.loads(reader.readline()).get("hello")
+            node = NodeInfo(next(self._node_ids), hello.get("host") or addr[0], int(hello["port"]),
+                            sock, bool(hello.get("bots")))
+            with self._lock:
+                self.nodes[node.node_id] = node
+            print(f"Node {node.node_id} joined: {node.host}:{node.port}")
+            for line in reader:
+                load = json.loads(line).get("load")
+                if load is None:
+                    continue
+                with self._lock:
+                    node.games = int(load["games"])
+                    node.turn_latency_ms = float(load["turn_latency_ms"])
+                    node.cpu_percent = float(load["cpu_percent"])
+                    node.pending = 0
+                    node.last_report = time.monotonic()
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            pass
+        if node is not None:
+            with self._lock:
+                self.nodes.pop(node.node_id, None)
+            print(f"Node {node.node_id} left.")
+        try:
+            sock.close()
+        except Exception:
+            pass
+
+    def route(self, players, add_bot, language=DEFAULT_LANGUAGE):
+        # Send a filled room to the least-loaded node. players are LobbySockets.
+        node = self.least_loaded(needs_bots=add_bot and len(players) == 1)
+        ticket = f"{next(self._room_ids)}-{secrets.token_hex(8)}"
+        if node is not None:
+            try:
+                node.send({"expect": ticket, "players": len(players), "bot": add_bot, "language": language})
+            except OSError:
+                node = None
+        if node is None:
+            print("No game nodes available; sending the room away.")
+            metrics.inc("cluster_rooms_refused")
+            message = "No game servers are available. Please try again later.\n".encode()
+        else:
+            print(f"Room {ticket.split('-')[0]} ({len(players)} players, {language}) -> node {node.node_id}")
+            metrics.inc("cluster_rooms_routed")
+            message = f"Redirect {node.host} {node.port} {ticket}\n".encode()
+        for player in players:
+            try:
+                player.sock.settimeout(5)
+                player.sock.sendall(message)
+                player.sock.close()
+            except OSError:
+                pass
+
+
+def node_listener(coordinator, port=NODE_REGISTRY_PORT):
+    listenSocket = socket(AF_INET, SOCK_STREAM)
+    listenSocket.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
+    listenSocket.bind(("", port))
+    listenSocket.listen(16)
+    while True:
+        sock, addr = listenSocket.accept()
+        start_new_thread(coordinator.handle_node, (sock, addr))
+
+
+def coordinator_main(room_size=ROOM_SIZE, port=SERVER_PORT, node_port=NODE_REGISTRY_PORT,
+                     records_port=RECORDS_SERVICE_PORT):
+    coordinator = Coordinator()
+    start_new_thread(node_listener, (coordinator, node_port))
+    if records_port:
+        start_new_thread(records_service, (records_port,))
+    start_new_thread(metrics_reporter, ())
+
+    serverSocket = socket(AF_INET, SOCK_STREAM)
+    serverSocket.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
+    serverSocket.bind(("", port))
+    serverSocket.listen(ROOM_MAX_PLAYERS)
+    print(f"Word Chain coordinator is ready! Nodes register on port {node_port}.")
+    waiting = []    # players of other languages stay in the lobby between rooms
+    while True:
+        print(f"Waiting for {room_size} players to connect...")
+        room, add_bot = fill_lobby(serverSocket, room_size, lambda sock, addr: LobbySocket(sock),
+                                   coordinator.bots_available(), waiting, language_of=LobbySocket.language)
+        coordinator.route(room, add_bot, room[0].language())
+
+
+class ClusterNode:
+    """Node side of the cluster: reports load and admits redirected players."""
+
+    def __init__(self, coordinator_address, port, start_room, bots=False, handshake=None):
+        # handshake(player, data) takes the handshake lines sent along with a ticket
+        self.coordinator_address = coordinator_address
+        self.port = port
+        self.start_room = start_room
+        self.bots = bots
+        self.handshake = handshake
+        self.stopped = False
+        self._cond = threading.Condition()
+        self._rooms = {}            # ticket -> {"players", "bot", "language", "joined", "deadline"}
+        self._cpu_mark = (time.monotonic(), self._cpu_seconds())
+
+    @staticmethod
+    def _cpu_seconds():
+        times = os.times()
+        return times.user + times.system
+
+    def _load(self):
+        now, cpu = time.monotonic(), self._cpu_seconds()
+        last_now, last_cpu = self._cpu_mark
+        self._cpu_mark = (now, cpu)
+        return {"games": active_games(),
+                "turn_latency_ms": metrics.average("turn_latency_ms"),
+                "cpu_percent": round(100 * (cpu - last_cpu) / max(now - last_now, 1e-6), 1)}
+
+    def stop(self):
+        # Leave the coordinator (e.g. when a restarted process takes over this
+        # node's port); rooms already sent here still start or expire
+        self.stopped = True
+
+    def run(self):
+        # Keep a registry connection to the coordinator, reconnecting if it drops
+        self.stopped = False
+        while not self.stopped:
+            try:
+                with create_connection(self.coordinator_address, timeout=LOAD_REPORT_INTERVAL) as sock:
+                    print(f"Registered with coordinator {self.coordinator_address[0]}:{self.coordinator_address[1]}")
+                    sock.sendall((json.dumps({"hello": {"port": self.port, "bots": self.bots}}) + "\n").encode())
+                    self._serve_coordinator(sock)
+            except OSError as e:
+                if self.stopped:
+                    break
+                print(f"Coordinator connection lost ({e}); retrying.")
+            time.sleep(LOAD_REPORT_INTERVAL)
+        print("Left the coordinator.")
+
+    def _serve_coordinator(self, sock):
+        buffer = b""
+        next_report = time.monotonic()
+        while not self.stopped:
+            if time.monotonic() >= next_report:
+                sock.sendall((json.dumps({"load": self._load()}) + "\n").encode())
+                next_report = time.monotonic() + LOAD_REPORT_INTERVAL
+                self._expire_rooms()
+            sock.settimeout(max(0.01, next_report - time.monotonic()))
+            try:
+                data = sock.recv(4096)
+            except timeout:
+                continue
+            if not data:
+                raise OSError("coordinator closed the connection")
+            buffer += data
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                message = json.loads(line)
+                if "expect" in message:
+                    with self._cond:
+                        self._rooms[message["expect"]] = {"players": int(message["players"]),
+                                                          "bot": bool(message.get("bot")),
+                                                          "language": message.get("language") or DEFAULT_LANGUAGE,
+                                                          "joined": [], "deadline": time.monotonic() + TICKET_WAIT}
+                        self._cond.notify_all()
+
+    def _expire_rooms(self):
+        # Start rooms whose missing players never arrived, if enough are here to play
+        now = time.monotonic()
+        with self._cond:
+            expired = [ticket for ticket, room in self._rooms.items() if room["deadline"] <= now]
+            rooms = [self._rooms.pop(ticket) for ticket in expired]
+        for room in rooms:
+            joined = room["joined"]
+            if len(joined) >= 2 or (joined and room["bot"]):
+                self.start_room(joined, room["bot"], room["language"])
+            else:
+                for player in joined:
+                    player.send("Your opponents did not arrive. Please reconnect to play.\n")
+                    player.finish()
+
+    def admit(self, player):
+        # Read the player's ticket and add them to their room; the last
+        # arrival starts the game
+        player.settimeout(10)
+        try:
+            data = player.recv(1024)
+        except timeout:
+            data = b""
+        line, _, rest = data.partition(b"\n")
+        data = line.decode(errors="replace").split()
+        if data[:1] == ["Resume"] and self.handshake is not None:
+            # Reconnecting to a game already running here
+            self.handshake(player, line)
+            return
+        if len(data) != 2 or data[0] != "Ticket":
+            player.send("This is a cluster game node; please connect through the coordinator.\n")
+            player.finish()
+            return
+        if rest.strip() and self.handshake is not None:
+            self.handshake(player, rest)    # sent along with the ticket
+        ticket = data[1]
+        with self._cond:
+            # The coordinator's "expect" message may still be on its way
+            self._cond.wait_for(lambda: ticket in self._rooms, timeout=5)
+            room = self._rooms.get(ticket)
+            if room is not None:
+                room["joined"].append(player)
+                if len(room["joined"]) == room["players"]:
+                    del self._rooms[ticket]
+                else:
+                    room = None
+                    player.send("Waiting for the rest of your room...\n")
+                    return
+        if room is None:
+            metrics.inc("cluster_bad_tickets")
+            player.send("Unknown or expired ticket.\n")
+            player.finish()
+            return
+        self.start_room(room["joined"], room["bot"], room["language"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Word Chain cluster coordinator")
+    parser.add_argument("room_size", nargs="?", type=int, default=ROOM_SIZE,
+                        help=f"players per room, 2-{ROOM_MAX_PLAYERS} (default {ROOM_SIZE})")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="port players connect to")
+    parser.add_argument("--node-port", type=int, default=NODE_REGISTRY_PORT, help="port game nodes register on")
+    parser.add_argument("--records-port", type=int, default=RECORDS_SERVICE_PORT,
+                        help="records service port, 0 to run it separately")
+    args = parser.parse_args()
+    if not 2 <= args.room_size <= ROOM_MAX_PLAYERS:
+        sys.exit(f"Players per room must be between 2 and {ROOM_MAX_PLAYERS}.")
+    coordinator_main(args.room_size, args.port, args.node_port, args.records_port)
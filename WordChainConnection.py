@@ -0,0 +1,726 @@
+# Word Chain Connection
+# Non-blocking, bounded per-connection output buffers for the Word Chain server
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: write buffers with watermarks and slow-peer policies
+# Updated: 10/19/2026 - Reads go through the writer thread into per-connection inboxes
+#                     - Heartbeats, TCP keepalive and reaping of silent peers
+#                     - Token-bucket rate limits per connection and per IP, frame size limits
+#                     - Local peers (Unix socket, loopback) are exempt from the rate limits
+#                     - Sockets are closed by the writer thread after unregistering, so reused descriptors stay readable
+#                     - TCP_NODELAY, so consecutive small writes are not held back by Nagle
+#                     - Connections in a game survive a dropped socket for a grace window and can be reattached
+#                     - Memory estimate of the open connections and their kernel socket buffers
+#                     - Connections can start with input read elsewhere (a handoff from another process)
+#                     - Slow peers are disconnected by default; "pause" is opt-in and waits well under a second
+#                     - Heartbeats are stripped as whole lines, also when split across reads
+#                     - Heartbeats do not count against the rate limits; dropped input is answered with SLOW_DOWN
+#
+# Game threads call Connection.send(), which never blocks on the socket:
+# data is queued in the connection's output buffer and written with
+# non-blocking sends, either straight away (fast path) or later by the
+# shared ConnectionWriter thread once the socket becomes writable.
+#
+# The same thread reads every connection as data arrives and queues it in
+# the connection's inbox, where Connection.recv() picks it up. Because input
+# is read all the time, not only on a player's turn, a peer that hangs up is
+# noticed at once, wherever it is (lobby, game, rematch prompt).
+#
+# Peers that vanish without a FIN (a laptop going to sleep, a NAT timeout)
+# are caught two ways:
+#   - heartbeats: clients send HEARTBEAT every HEARTBEAT_INTERVAL seconds;
+#     the frame is stripped from the input and answered in kind, and a
+#     client that has sent one but then stays silent for REAP_AFTER seconds
+#     is reaped (closed), which wakes any game thread waiting on it
+#   - TCP keepalive, tuned to a similar window, for clients that do not
+#     send heartbeats
+#
+# Flood protection also happens on the writer thread, before any input
+# reaches a game thread: each connection and each source IP has a token
+# bucket of frames (newline-separated messages, heartbeats not counted),
+# frames over the budget are dropped with a SLOW_DOWN notice to the peer, a
+# peer that keeps flooding is disconnected, and a frame longer
+# than MAX_FRAME, or more than MAX_INBOX unread bytes, disconnects at once.
+# Peers on the same machine (Unix socket or loopback: bot farms, load
+# generators) skip the rate limits and the per-IP connection cap while
+# LOCAL_PEERS_EXEMPT is set; the size limits still apply to them.
+#
+# When a peer stops draining and its buffer passes the high watermark the
+# connection's policy decides what happens:
+#   "disconnect" - the peer is disconnected immediately (the default)
+#   "drop"       - new messages are discarded until the buffer drains
+#   "pause"      - the sender waits until the buffer drains below the low
+#                  watermark, and the peer is disconnected if that takes
+#                  longer than pause_timeout
+# The sender is usually a game thread, which must not stall the other
+# players behind one peer, so "pause" is only for callers that can afford
+# a short wait and pause_timeout stays well under a second. A player's
+# messages are a few hundred bytes a turn: 64 KiB unread means the peer has
+# stopped reading, and a player in a game is suspended for its grace
+# window like any other lost connection.
+#
+# A connection with a grace period (set by the server for players in a
+# game) is not closed when its peer goes away: it is suspended. Its socket
+# is dropped, output is discarded, and a game thread waiting on it keeps
+# waiting. If the player reconnects within `grace` seconds the new socket
+# is moved into the same Connection object (reattach()), so the game
+# thread, its timers and its waiters never notice; otherwise the writer
+# thread closes it and the game sees an ordinary disconnect.
+
+from socket import *
+import collections
+import ipaddress
+import selectors
+import threading
+import time
+
+from WordChainMetrics import metrics
+from WordChainListeners import UNIX_PEER
+
+HIGH_WATERMARK = 64 * 1024      # bytes buffered before the slow-peer policy applies
+LOW_WATERMARK = 16 * 1024       # paused senders resume once the buffer drains below this
+PAUSE_TIMEOUT = 0.25            # seconds a paused sender waits before disconnecting the peer
+HEARTBEAT = b"/heartbeat\n"
+HEARTBEAT_INTERVAL = 5          # seconds between heartbeats, in each direction
+REAP_AFTER = 15                 # seconds of silence before a heartbeating peer is reaped
+KEEPALIVE_IDLE = 10             # TCP keepalive: idle seconds before the first probe
+KEEPALIVE_INTERVAL = 5          # seconds between probes
+KEEPALIVE_COUNT = 3             # unanswered probes before the connection is dropped
+RATE_PER_SECOND = 4             # frames a connection may send per second...
+RATE_BURST = 12                 # ...with bursts up to this many
+IP_RATE_PER_SECOND = 40         # frames all connections from one IP may send per second...
+IP_RATE_BURST = 120             # ...with bursts up to this many
+FLOOD_STRIKES = 20              # rate-limited reads before the peer is disconnected
+SLOW_DOWN = b"Slow down: you are sending too fast, and your last message was not read. Send it again.\n"
+MAX_FRAME = 256                 # longest message in bytes
+MAX_INBOX = 4096                # unread bytes allowed to pile up for one connection
+MAX_CONNECTIONS_PER_IP = 8      # enforced by the server when it accepts players
+LOCAL_PEERS_EXEMPT = True       # no rate limits or per-IP cap for peers on this machine
+CONNECTION_BYTES = 8 * 1024     # Python objects of one connection: sockets, inbox, bucket, condition
+
+
+def enable_keepalive(sock, idle=KEEPALIVE_IDLE, interval=KEEPALIVE_INTERVAL, count=KEEPALIVE_COUNT):
+    # The tuning options differ between platforms; missing ones are skipped
+    try:
+        sock.setsockopt(SOL_SOCKET, SO_KEEPALIVE, 1)
+        for name, value in (("TCP_KEEPIDLE", idle), ("TCP_KEEPALIVE", idle),
+                            ("TCP_KEEPINTVL", interval), ("TCP_KEEPCNT", count)):
+            if name in globals():
+                sock.setsockopt(IPPROTO_TCP, globals()[name], value)
+        if "TCP_USER_TIMEOUT" in globals():
+            # Data the peer never acknowledges gives up in the same window
+            sock.setsockopt(IPPROTO_TCP, TCP_USER_TIMEOUT, (idle + interval * count) * 1000)
+    except OSError:
+        pass
+
+
+def is_local_peer(addr):
+    if not addr:
+        return False
+    if addr[0] == UNIX_PEER:
+        return True
+    try:
+        return ipaddress.ip_address(addr[0]).is_loopback
+    except ValueError:
+        return False
+
+
+class TokenBucket:
+    """Allows `rate` events per second on average and bursts of `capacity`."""
+
+    __slots__ = ("rate", "capacity", "tokens", "stamp")
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.stamp = time.monotonic()
+
+    def take(self, amount=1):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens < amount:
+            return False
+        self.tokens -= amount
+        return True
+
+
+class Inbox:
+    """Received data waiting for the game thread.
+
+    Filled by another thread through _deliver(); read with recv(), which
+    honours settimeout() and raises socket.timeout, or with poll() by code
+    that waits on several players at once through a shared threading.Event.
+    """
+
+    def __init__(self):
+        self._inbox = collections.deque()
+        self._inbox_cond = threading.Condition()
+        self._waiters = set()
+        self._timeout = None
+        self.inbox_bytes = 0
+        self.ended = False              # no more input will arrive
+
+    def settimeout(self, value):
+        self._timeout = value
+
+    def gettimeout(self):
+        return self._timeout
+
+    def recv(self, bufsize):
+        # Queued data, or b"" once input has ended
+        with self._inbox_cond:
+            if not self._inbox_cond.wait_for(lambda: self._inbox or self.ended, self._timeout):
+                raise timeout("timed out")
+            return self._take(bufsize)
+
+    def poll(self, bufsize=1024):
+        # Like recv() without waiting: None if nothing has arrived yet
+        with self._inbox_cond:
+            if not self._inbox and not self.ended:
+                return None
+            return self._take(bufsize)
+
+    def add_waiter(self, event):
+        with self._inbox_cond:
+            self._waiters.add(event)
+
+    def remove_waiter(self, event):
+        with self._inbox_cond:
+            self._waiters.discard(event)
+
+    def _take(self, bufsize):
+        data = b"".join(self._inbox)
+        self._inbox.clear()
+        if len(data) > bufsize:
+            self._inbox.append(data[bufsize:])
+            data = data[:bufsize]
+        self.inbox_bytes -= len(data)
+        return data
+
+    def _deliver(self, data):
+        # Queue data for the reader; b"" marks the end of input
+        with self._inbox_cond:
+            if data:
+                self._inbox.append(data)
+                self.inbox_bytes += len(data)
+            else:
+                self.ended = True
+            self._inbox_cond.notify_all()
+            waiters = list(self._waiters)
+        for event in waiters:
+            event.set()
+
+
+class Connection(Inbox):
+    """A socket whose writes go through a bounded output buffer and whose
+    reads arrive through an inbox filled by the writer thread."""
+
+    def __init__(self, sock, writer, addr=None, policy="disconnect", eager=True, read_only=False,
+                 high_watermark=HIGH_WATERMARK, low_watermark=LOW_WATERMARK, pause_timeout=PAUSE_TIMEOUT,
+                 pending=b""):
+        # pending: input already read from the socket elsewhere (another
+        # process, before a handoff), to be read before anything new
+        self.sock = sock
+        self.addr = addr
+        self.writer = writer
+        self.policy = policy
+        self.eager = eager              # try to write on the sending thread before queueing
+        self.read_only = read_only      # input is discarded by the writer (spectators)
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.pause_timeout = pause_timeout
+        Inbox.__init__(self)
+        enable_keepalive(sock)
+        try:
+            # Turns are several small writes in a row ("Player 1 used ...",
+            # "Your turn."); without this Nagle holds the second one until the
+            # client's delayed ACK, about 40 ms per turn
+            sock.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+        except OSError:
+            pass    # Unix sockets
+        self.connected_at = self.last_heard = time.monotonic()
+        self.heartbeats = False         # the peer sends heartbeats, so it gets them and can be reaped
+        self.bucket = TokenBucket(RATE_PER_SECOND, RATE_BURST)
+        self.rate_limited = not (LOCAL_PEERS_EXEMPT and is_local_peer(addr))
+        self.strikes = 0                # reads dropped by the rate limits
+        self._partial = b""             # the start of what may be a heartbeat, held until its newline
+        self._wsock = sock.dup()        # shares the file description, used for non-blocking IO
+        self._wsock.setblocking(False)
+        self._buffer = collections.deque()
+        self._offset = 0                # bytes of _buffer[0] already written
+        self.buffered = 0               # bytes waiting in _buffer
+        self.dropped = 0
+        self.closed = False
+        self.released = False           # socket handed over to a resumed session (see release())
+        self._queued = False            # handed to the writer thread
+        self._finishing = False         # close once the buffer is empty
+        self._cond = threading.Condition(threading.RLock())   # re-entrant: close() runs under it
+        self.grace = 0                  # seconds to stay suspended after the peer goes away; 0 closes at once
+        self.detached = False           # suspended: no socket until reattach()
+        self.detached_at = None
+        if pending:
+            self._deliver(pending)
+        writer.add(self)
+
+    # --- socket-like interface used by the game thread --------------------
+    # (settimeout, recv and poll come from Inbox)
+
+    def send(self, data):
+        # Queue data for the peer. Never raises and never blocks on the socket;
+        # returns False if the data was not queued (dropped or disconnected).
+        if isinstance(data, str):
+            data = data.encode()
+        with self._cond:
+            if self.closed:
+                return False
+            if self.detached:
+                return True     # discarded; a player who resumes is sent the game state instead
+            if self.buffered + len(data) > self.high_watermark:
+                metrics.inc("high_watermark_hits")
+                if not self._over_watermark():
+                    return False
+                if self.detached:
+                    return True     # went away while the sender was paused
+            self._buffer.append(data)
+            self.buffered += len(data)
+            if self._queued or not self.eager:
+                wake = not self._queued
+                self._queued = True
+            else:
+                if not self._write_locked():
+                    self.lost()
+                    return not self.closed
+                wake = bool(self._buffer)
+                self._queued = wake
+        if wake:
+            self.writer.wake(self)
+        return True
+
+    sendall = send
+
+    def close(self):
+        with self._cond:
+            if self.closed:
+                return
+            self.closed = True
+            self._buffer.clear()
+            self.buffered = 0
+            self._cond.notify_all()
+        self._deliver(b"")     # data already received can still be read
+        # The writer thread closes _wsock once it has unregistered it; closed
+        # here, its descriptor could be reused by a new connection while still
+        # registered. Shutting it down tells the peer straight away.
+        try:
+            self._wsock.shutdown(SHUT_RDWR)
+        except OSError:
+            pass
+        self.writer.discard(self)
+        try:
+            self.sock.close()
+        except Exception:
+            pass
+
+    def lost(self, wsock=None):
+        # The peer went away: suspend for the grace period if there is one,
+        # otherwise close. With `wsock`, only if that is still our socket
+        # (a reattach may have replaced it since it failed).
+        with self._cond:
+            if self.closed or self.detached or (wsock is not None and wsock is not self._wsock):
+                return
+            if not self.grace:
+                self.close()
+                return
+            self.detached = True
+            self.detached_at = time.monotonic()
+            self._buffer.clear()
+            self._offset = 0
+            self.buffered = 0
+            self._queued = False
+            self._cond.notify_all()     # paused senders and close_when_flushed() stop waiting
+            sock, wsock = self.sock, self._wsock
+        metrics.inc("connections_suspended")
+        try:
+            wsock.shutdown(SHUT_RDWR)
+        except OSError:
+            pass
+        self.writer.suspend(self, wsock)
+        try:
+            sock.close()
+        except Exception:
+            pass
+
+    def reattach(self, other):
+        # Move the socket of a new connection from the same player into this
+        # one, which may still look connected if the old socket has not
+        # failed yet. Returns False if this connection is already closed.
+        with self._cond:
+            if self.closed or not self.grace:
+                return False
+            if not self.detached:
+                self.lost()
+            sock, pending = other.release()
+            self.sock = sock
+            self.addr = other.addr
+            self._wsock = sock.dup()
+            self._wsock.setblocking(False)
+            self.rate_limited = other.rate_limited
+            self.last_heard = time.monotonic()
+            self.heartbeats = False
+            self.strikes = 0
+            self._partial = b""
+            self.detached = False
+            self.detached_at = None
+            self.writer.add(self)
+        if pending:
+            self._deliver(pending)
+        return True
+
+    def expire(self):
+        # Called by the writer thread: close if still suspended after the grace period
+        with self._cond:
+            if not self.detached or time.monotonic() - self.detached_at <= self.grace:
+                return
+            metrics.inc("suspensions_expired")
+            self.close()
+
+    def release(self):
+        # Give up this connection's socket without disconnecting the peer
+        # (its session is being resumed on another Connection, or another
+        # process is taking the server over). Nothing more is read from the
+        # socket here. Returns a new socket object for the peer and any input
+        # not read yet.
+        with self._cond:
+            sock = self.sock.dup()
+            self.closed = True
+            self.released = True
+            self._buffer.clear()
+            self.buffered = 0
+            self._cond.notify_all()
+        pending = (self.poll(MAX_INBOX) or b"") + self._partial
+        self._deliver(b"")
+        self.writer.discard(self)   # the writer thread closes _wsock
+        try:
+            self.sock.close()
+        except Exception:
+            pass
+        return sock, pending
+
+    def finish(self):
+        # Close once everything queued so far has been written, without waiting.
+        with self._cond:
+            if self.closed:
+                return
+            if not self._buffer:
+                self.close()
+                return
+            self._finishing = True
+            wake = not self._queued
+            self._queued = True
+        if wake:
+            self.writer.wake(self)
+
+    def close_when_flushed(self, deadline=2.0):
+        # Give queued goodbye messages a moment to reach the peer, then close.
+        end = time.monotonic() + deadline
+        with self._cond:
+            while self._buffer and not self.closed:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+        self.close()
+
+    # --- buffer management (called with self._cond held) ------------------
+
+    def _over_watermark(self):
+        if self.policy == "drop":
+            self.dropped += 1
+            metrics.inc("messages_dropped")
+            return False
+        if self.policy == "pause":
+            metrics.inc("sender_pauses")
+            end = time.monotonic() + self.pause_timeout
+            while self.buffered > self.low_watermark and not self.closed:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            if self.closed:
+                return False
+            if self.buffered <= self.low_watermark:
+                return True
+        metrics.inc("slow_peer_disconnects")
+        self.lost()     # a player in a game can reconnect and resync within its grace window
+        return False
+
+    def _write_locked(self):
+        # Write as much as the socket accepts without blocking.
+        # Returns False if the socket failed and the peer is gone.
+        try:
+            while self._buffer:
+                view = memoryview(self._buffer[0])[self._offset:]
+                sent = self._wsock.send(view)
+                metrics.inc("bytes_sent", sent)
+                self.buffered -= sent
+                if sent < len(view):
+                    self._offset += sent
+                    break
+                self._buffer.popleft()
+                self._offset = 0
+        except BlockingIOError:
+            pass
+        except OSError:
+            metrics.inc("send_errors")
+            return False
+        if self.buffered <= self.low_watermark:
+            self._cond.notify_all()
+        return True
+
+    def _flush(self):
+        # Called by the writer thread. Returns True while data is still pending.
+        with self._cond:
+            if self.closed:
+                return False
+            if not self._write_locked():
+                self.lost()
+                return False
+            self._queued = bool(self._buffer)
+            if not self._buffer:
+                self._cond.notify_all()     # wakes close_when_flushed()
+                if self._finishing:
+                    self.close()
+            return self._queued
+
+
+class ConnectionWriter:
+    """One selector thread that does the socket reads, and finishes the
+    writes, for every Connection; it also exchanges heartbeats and reaps
+    silent peers."""
+
+    def __init__(self, reap_after=REAP_AFTER):
+        self.reap_after = reap_after
+        self._next_heartbeat = time.monotonic() + HEARTBEAT_INTERVAL
+        self._lock = threading.Lock()
+        self._connections = set()
+        self._per_ip = collections.Counter()
+        self._ip_buckets = {}           # source IP -> TokenBucket, only used on the writer thread
+        self._pending = set()
+        self._suspended = set()         # connections waiting to be reattached
+        self._retired = []              # sockets of suspended connections, to unregister and close
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+        metrics.gauge("connections_open", lambda: len(self._connections))
+        metrics.gauge("buffered_bytes_total", lambda: sum(c.buffered for c in list(self._connections)))
+        metrics.gauge("buffered_bytes_max", lambda: max((c.buffered for c in list(self._connections)), default=0))
+        metrics.gauge("connections_backlogged", lambda: sum(1 for c in list(self._connections) if c.buffered))
+        metrics.gauge("connections_suspended_now", lambda: len(self._suspended))
+        threading.Thread(target=self._run, name="connection-writer", daemon=True).start()
+
+    def add(self, conn):
+        with self._lock:
+            self._suspended.discard(conn)
+            self._connections.add(conn)
+            self._per_ip[conn.addr[0] if conn.addr else None] += 1
+            self._pending.add(conn)     # registered for reading by the writer thread
+        self._signal()
+
+    def discard(self, conn):
+        with self._lock:
+            self._suspended.discard(conn)
+            self._forget(conn)
+            self._pending.add(conn)     # the writer thread unregisters it
+        self._signal()
+
+    def suspend(self, conn, wsock):
+        # conn has lost its socket but may be reattached (see Connection.lost)
+        with self._lock:
+            self._forget(conn)
+            self._suspended.add(conn)
+            self._retired.append(wsock)
+        self._signal()
+
+    def _forget(self, conn):
+        # Called with the lock held
+        if conn in self._connections:
+            self._connections.remove(conn)
+            ip = conn.addr[0] if conn.addr else None
+            self._per_ip[ip] -= 1
+            if self._per_ip[ip] <= 0:
+                del self._per_ip[ip]
+
+    def memory_used(self):
+        # (bytes held by the open and suspended connections, bytes their kernel socket buffers may hold)
+        with self._lock:
+            connections = list(self._connections) + list(self._suspended)
+        held = kernel = 0
+        for conn in connections:
+            held += CONNECTION_BYTES + conn.buffered + conn.inbox_bytes
+            if not conn.detached:
+                try:
+                    kernel += conn._wsock.getsockopt(SOL_SOCKET, SO_SNDBUF) \
+                        + conn._wsock.getsockopt(SOL_SOCKET, SO_RCVBUF)
+                except OSError:
+                    pass
+        return held, kernel
+
+    def connections_from(self, ip):
+        with self._lock:
+            return self._per_ip.get(ip, 0)
+
+    def wake(self, conn):
+        with self._lock:
+            self._pending.add(conn)
+        self._signal()
+
+    def _signal(self):
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass    # a wakeup is already pending
+
+    def _run(self):
+        while True:
+            for key, events in self._selector.select(1):
+                conn = key.data
+                if conn is None:
+                    try:
+                        while self._wake_r.recv(4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                    continue
+                if events & selectors.EVENT_READ:
+                    if key.fileobj is not conn._wsock:
+                        pass    # the old socket of a reattached connection, about to be retired
+                    elif conn.released:
+                        pass    # its socket now belongs to the resumed connection, which reads it
+                    elif conn.read_only:
+                        self._discard_input(conn)
+                    else:
+                        self._read_input(conn, key.fileobj)
+                if events & selectors.EVENT_WRITE:
+                    self._update(conn, conn._flush())
+
+            with self._lock:
+                pending = self._pending
+                self._pending = set()
+                retired = self._retired
+                self._retired = []
+            for wsock in retired:
+                try:
+                    self._selector.unregister(wsock)
+                except (KeyError, ValueError):
+                    pass
+                wsock.close()
+            for conn in pending:
+                self._update(conn, conn._flush())
+            if time.monotonic() >= self._next_heartbeat:
+                self._heartbeat()
+
+    def _discard_input(self, conn):
+        # Read-only peers: throw away anything they send and notice hang-ups.
+        try:
+            if not conn._wsock.recv(4096):
+                conn.close()
+        except BlockingIOError:
+            pass
+        except OSError:
+            conn.close()
+
+    def _read_input(self, conn, wsock):
+        try:
+            data = wsock.recv(MAX_INBOX)     # a longer read could only be oversized
+        except BlockingIOError:
+            return
+        except OSError:
+            metrics.inc("connections_lost")     # e.g. keepalive or user timeout expired
+            conn.lost(wsock)
+            return
+        if not data:
+            conn.lost(wsock)
+            return
+        conn.last_heard = time.monotonic()
+        # Everything below is cheap byte counting; nothing is decoded here
+        # A heartbeat is a whole line, and may be split across reads: hold a
+        # last line that could still become one until its newline arrives
+        data = conn._partial + data
+        end = data.rfind(b"\n") + 1
+        if end < len(data) and HEARTBEAT.startswith(data[end:]):
+            data, conn._partial = data[:end], data[end:]
+        else:
+            conn._partial = b""
+        if HEARTBEAT in data:
+            lines = data.split(b"\n")
+            kept = [line for line in lines[:-1] if line + b"\n" != HEARTBEAT]
+            if len(kept) < len(lines) - 1:
+                conn.heartbeats = True
+                data = b"".join(line + b"\n" for line in kept) + lines[-1]
+        if not data:
+            return
+        frames = data.count(b"\n") or 1
+        if conn.rate_limited and (not conn.bucket.take(frames) or not self._ip_bucket(conn).take(frames)):
+            metrics.inc("frames_rate_limited", frames)
+            conn.strikes += 1
+            if conn.strikes >= FLOOD_STRIKES:
+                metrics.inc("flood_disconnects")
+                conn.close()
+            else:
+                conn.send(SLOW_DOWN)    # rather than lose a word without a trace
+            return
+        if (len(data) > MAX_FRAME and max(map(len, data.split(b"\n"))) > MAX_FRAME) \
+                or conn.inbox_bytes + len(data) > MAX_INBOX:
+            metrics.inc("oversized_input_disconnects")
+            conn.close()
+            return
+        conn._deliver(data)
+
+    def _ip_bucket(self, conn):
+        ip = conn.addr[0] if conn.addr else None
+        bucket = self._ip_buckets.get(ip)
+        if bucket is None:
+            if len(self._ip_buckets) > 4 * len(self._connections) + 64:
+                # Forget IPs with no connections left, rather than growing forever
+                with self._lock:
+                    self._ip_buckets = {key: value for key, value in self._ip_buckets.items()
+                                        if key in self._per_ip}
+            bucket = self._ip_buckets[ip] = TokenBucket(IP_RATE_PER_SECOND, IP_RATE_BURST)
+        return bucket
+
+    def _heartbeat(self):
+        # Reap heartbeating peers that went silent and beat to the rest;
+        # close suspended connections whose grace period is over
+        now = time.monotonic()
+        self._next_heartbeat = now + HEARTBEAT_INTERVAL
+        with self._lock:
+            connections = [(conn, conn._wsock) for conn in self._connections if conn.heartbeats]
+            expired = [conn for conn in self._suspended if now - (conn.detached_at or now) > conn.grace]
+        for conn in expired:
+            conn.expire()
+        for conn, wsock in connections:
+            if now - conn.last_heard > self.reap_after:
+                metrics.inc("connections_reaped")
+                conn.lost(wsock)
+            elif not conn.buffered:     # a backlogged peer is getting data anyway
+                conn.send(HEARTBEAT)
+
+    def _update(self, conn, want_write):
+        if conn.closed:
+            try:
+                self._selector.unregister(conn._wsock)
+            except (KeyError, ValueError):
+                pass
+            conn._wsock.close()
+            return
+        if conn.detached:
+            return      # its old socket is in _retired
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if want_write else 0)
+        try:
+            self._selector.modify(conn._wsock, events, conn)
+        except KeyError:
+            self._selector.register(conn._wsock, events, conn)
+        except (ValueError, OSError):
+            pass
@@ -0,0 +1,125 @@
+# Word Chain Dictionaries
+# Per-language dictionaries and word indexes, loaded on first use and shared by every room
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: lazy loading, LRU eviction under a memory cap
+#
+# A room's language is picked at matchmaking time, and the room's game thread
+# asks the cache for it. A cached language is returned at once; otherwise the
+# game thread loads it itself, so only the players waiting for that language
+# wait. Other rooms, the lobby and every running game carry on, and a second
+# room asking for a language that is already loading waits for that load
+# rather than starting another.
+#
+# Each entry's size is estimated when it is loaded. When the total goes over
+# the cap, the least recently used languages are dropped from the cache.
+# Games already playing in a dropped language keep their own reference, so
+# its memory is freed once the last of them finishes.
+
+import collections
+import re
+import sys
+import threading
+
+from WordChainMetrics import metrics
+
+DEFAULT_LANGUAGE = "en_US"
+DICTIONARY_CACHE_BYTES = 256 * 1024 * 1024     # estimated memory the cache may hold
+ENCHANT_DICTIONARY_BYTES = 8 * 1024 * 1024     # rough size of one loaded enchant dictionary
+INDEXED_WORD_OVERHEAD = 64      # bytes per indexed word on top of the string: table, group and sorted list slots
+
+LANGUAGE_TAG = re.compile(r"[a-z]{2,3}(_[A-Z]{2})?$")
+
+Language = collections.namedtuple("Language", "language dictionary word_index size")
+
+
+class LanguageUnavailable(ValueError):
+    """No dictionary is installed for the requested language."""
+
+
+def is_language_tag(text):
+    return bool(LANGUAGE_TAG.match(text))
+
+
+def estimate_size(word_index):
+    size = ENCHANT_DICTIONARY_BYTES
+    if word_index is not None:
+        size += sum(sys.getsizeof(word) + INDEXED_WORD_OVERHEAD for word in word_index.words)
+        if word_index.scores is not None:
+            size += word_index.scores.nbytes
+    return size
+
+
+class DictionaryCache:
+    """Loaded languages, least recently used first, within a memory cap.
+
+    load(language) returns (dictionary, word_index) and raises
+    LanguageUnavailable if there is no such dictionary.
+    """
+
+    def __init__(self, load, capacity=DICTIONARY_CACHE_BYTES):
+        self.load = load
+        self.capacity = capacity
+        self.size = 0
+        self._entries = collections.OrderedDict()   # language -> Language
+        self._loading = {}      # language -> Event set when its load has finished
+        self._generation = 0    # bumped by clear(), so loads started before it are not cached
+        self._lock = threading.Lock()
+        metrics.gauge("dictionary_cache_bytes", lambda: self.size)
+        metrics.gauge("dictionary_cache_languages", lambda: len(self._entries))
+
+    def get(self, language):
+        # The Language entry, loaded on this thread unless another thread
+        # is already loading it. Raises LanguageUnavailable.
+        while True:
+            with self._lock:
+                entry = self._entries.get(language)
+                if entry is not None:
+                    self._entries.move_to_end(language)
+                    metrics.inc("dictionary_cache_hits")
+                    return entry
+                loading = self._loading.get(language)
+                if loading is None:
+                    loading = self._loading[language] = threading.Event()
+                    generation = self._generation
+                    break
+            loading.wait()
+            # Loaded (or failed) on another thread; look again
+
+        metrics.inc("dictionary_cache_misses")
+        entry = None
+        try:
+            dictionary, word_index = self.load(language)
+            entry = Language(language, dictionary, word_index, estimate_size(word_index))
+        finally:
+            with self._lock:
+                del self._loading[language]
+                if entry is not None and generation == self._generation:
+                    self._entries[language] = entry
+                    self.size += entry.size
+                    self._evict()
+            loading.set()
+        return entry
+
+    def cached(self, language):
+        with self._lock:
+            return language in self._entries
+
+    def languages(self):
+        # Cached languages, most recently used first
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self):
+        # Drop every entry; new games load their language again
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+            self._generation += 1
+
+    def _evict(self):
+        # Called with the lock held. The newest entry stays even on its own over the cap.
+        while self.size > self.capacity and len(self._entries) > 1:
+            language, entry = self._entries.popitem(last=False)
+            self.size -= entry.size
+            metrics.inc("dictionary_evictions")
+            print(f"Dictionary cache: dropped {language} ({entry.size // 1024} KB).")
@@ -0,0 +1,133 @@
+# Word Chain Handoff
+# Zero-downtime restarts: pass the listening sockets from a running server to its replacement
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: fd passing over a Unix socket, rollback if the new process fails
+# Updated: 10/19/2026 - The request event can be shared with other reasons to stop accepting
+#                     - Waiting players' input read so far (their handshake) goes along with their sockets
+#
+# A running server listens on a Unix socket named after its game port. A new
+# server started with --takeover (or spawned by the old one on SIGHUP) loads
+# its dictionary first, then connects and asks for the sockets:
+#   new -> old   TAKEOVER
+#   old -> new   {"listeners": n, "waiting": m, "pending": [...]} plus n + m
+#                file descriptors (listening sockets, then players waiting in
+#                the lobby); "pending" has each waiting player's input that
+#                the old process had already read, as Latin-1 text
+#   new -> old   READY, once it is accepting
+# The listening sockets are the same kernel objects in both processes, so
+# connections queue in the backlog during the switch and are never refused.
+# After READY the old process stops accepting and lets its games finish up
+# to DRAIN_DEADLINE seconds. Without READY it keeps serving as before.
+
+from socket import *
+import json
+import os
+import tempfile
+import threading
+
+DRAIN_DEADLINE = 600    # seconds the old process waits for its games before exiting
+HANDOFF_TIMEOUT = 30    # seconds the old process waits for READY
+HEADER_CHUNK = 65536    # bytes of the header read at a time; it ends with a newline
+
+
+def handoff_path(port):
+    return os.path.join(tempfile.gettempdir(), f"wordchain-{port}.handoff")
+
+
+def handoff_supported():
+    # fd passing needs Unix sockets and Python 3.9+
+    return "send_fds" in globals() and "AF_UNIX" in globals()
+
+
+class Handoff:
+    """Old-process side: waits for a replacement to ask for the sockets."""
+
+    def __init__(self, path, requested=None):
+        # `requested` is set when a replacement asks; it may be an event the
+        # server also sets for other reasons (e.g. draining), see `asked`
+        self.path = path
+        self.requested = requested if requested is not None else threading.Event()
+        self._listener = None
+        self._peer = None
+
+    @property
+    def asked(self):
+        return self._peer is not None
+
+    def listen(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)    # left by an earlier process; the takeover has finished
+        self._listener = socket(AF_UNIX, SOCK_STREAM)
+        self._listener.bind(self.path)
+        os.chmod(self.path, 0o600)
+        self._listener.listen(1)
+        threading.Thread(target=self._wait, name="handoff", daemon=True).start()
+
+    def _wait(self):
+        while True:
+            try:
+                peer, _ = self._listener.accept()
+            except OSError:
+                return
+            peer.settimeout(5)
+            try:
+                request = peer.recv(64)
+            except OSError:
+                request = b""
+            if request == b"TAKEOVER\n":
+                self._peer = peer
+                self.requested.set()
+                return
+            peer.close()
+
+    def hand_over(self, listeners, waiting):
+        # Send the sockets and wait for READY. `waiting` is (socket, input
+        # already read) for each lobby player. Returns True if the new process
+        # took over; on False the caller keeps serving and should listen() again.
+        header = json.dumps({"listeners": len(listeners), "waiting": len(waiting),
+                             "pending": [pending.decode("latin-1") for _, pending in waiting]}).encode() + b"\n"
+        peer, self._peer = self._peer, None
+        self.requested.clear()
+        try:
+            sent = send_fds(peer, [header], [sock.fileno() for sock in listeners + [sock for sock, _ in waiting]])
+            if sent < len(header):
+                # A long header may not go in one message. The new process
+                # may already have answered and closed when all of it went,
+                # so the rest is only sent when there is one.
+                peer.sendall(header[sent:])
+            peer.settimeout(HANDOFF_TIMEOUT)
+            ready = peer.recv(64) == b"READY\n"
+        except OSError:
+            ready = False
+        peer.close()
+        # The socket path now belongs to the new process, so it is not unlinked
+        self._listener.close()
+        return ready
+
+
+def take_over(path):
+    # New-process side. Returns (channel, listeners, waiting), waiting being
+    # (socket, input already read) per lobby player; call confirm(channel)
+    # once the listeners are being served. Raises OSError if nothing is running.
+    channel = socket(AF_UNIX, SOCK_STREAM)
+    channel.settimeout(HANDOFF_TIMEOUT)
+    channel.connect(path)
+    channel.sendall(b"TAKEOVER\n")
+    message, fds, _, _ = recv_fds(channel, HEADER_CHUNK, 4096)
+    while not message.endswith(b"\n"):
+        more = channel.recv(HEADER_CHUNK)
+        if not more:
+            raise OSError("the running server closed the handoff mid-header")
+        message += more
+    header = json.loads(message)
+    sockets = [socket(fileno=fd) for fd in fds]
+    count = header["listeners"]
+    pending = [text.encode("latin-1") for text in header.get("pending", ())]
+    return channel, sockets[:count], list(zip(sockets[count:], pending))
+
+
+def confirm(channel):
+    try:
+        channel.sendall(b"READY\n")
+    finally:
+        channel.close()
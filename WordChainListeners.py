@@ -0,0 +1,105 @@
+# Word Chain Listeners
+# IPv4, IPv6 and Unix domain socket listeners feeding one matchmaking queue
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: listener group with a socket-like accept()
+#
+# A ListenerGroup holds every listening socket of the game port and accepts
+# from whichever has a connection waiting, so the lobby code can treat the
+# group as one socket (settimeout() then accept()). Bot farms and load
+# generators on the same machine can connect over the Unix socket and skip
+# the TCP loopback stack.
+
+from socket import *
+import os
+import selectors
+import tempfile
+
+UNIX_PEER = "unix"      # host part of the address given to Unix socket peers
+
+
+def unix_socket_path(port):
+    return os.path.join(tempfile.gettempdir(), f"wordchain-{port}.sock")
+
+
+def peer_address(sock):
+    # (host, port) style address for any connected socket
+    if "AF_UNIX" in globals() and sock.family == AF_UNIX:
+        return (UNIX_PEER, sock.fileno())
+    return sock.getpeername()
+
+
+class ListenerGroup:
+    """Several listening sockets that accept() like one."""
+
+    def __init__(self, sockets):
+        self.sockets = list(sockets)
+        self._timeout = None
+        self._selector = selectors.DefaultSelector()
+        for sock in self.sockets:
+            sock.setblocking(False)
+            self._selector.register(sock, selectors.EVENT_READ)
+
+    def settimeout(self, value):
+        self._timeout = value
+
+    def accept(self):
+        # Raises socket.timeout if nothing arrives within the timeout
+        while True:
+            events = self._selector.select(self._timeout)
+            if not events:
+                raise timeout("timed out")
+            for key, _ in events:
+                try:
+                    sock, addr = key.fileobj.accept()
+                except (BlockingIOError, InterruptedError):
+                    continue    # another process sharing the socket took it
+                sock.setblocking(True)
+                if sock.family not in (AF_INET, AF_INET6):
+                    addr = peer_address(sock)
+                return sock, addr
+
+    def describe(self):
+        names = []
+        for sock in self.sockets:
+            address = sock.getsockname()
+            if sock.family == AF_INET6:
+                names.append(f"[{address[0]}]:{address[1]}")
+            elif sock.family == AF_INET:
+                names.append(f"{address[0] or '0.0.0.0'}:{address[1]}")
+            else:
+                names.append(address)
+        return ", ".join(names)
+
+    def close(self):
+        self._selector.close()
+        for sock in self.sockets:
+            sock.close()
+
+
+def open_listeners(port, ipv6=True, unix_path=None, backlog=16):
+    # IPv4 always; IPv6 and the Unix socket when asked for and supported
+    sockets = []
+    sock = socket(AF_INET, SOCK_STREAM)
+    sock.bind(("", port))
+    sock.listen(backlog)
+    sockets.append(sock)
+    if ipv6 and has_ipv6:
+        try:
+            sock = socket(AF_INET6, SOCK_STREAM)
+            sock.setsockopt(IPPROTO_IPV6, IPV6_V6ONLY, 1)   # IPv4 has its own socket
+            sock.bind(("::", port))
+            sock.listen(backlog)
+            sockets.append(sock)
+        except OSError as e:
+            print(f"IPv6 listener not available ({e}).")
+    if unix_path:
+        if "AF_UNIX" not in globals():
+            print("Unix sockets are not available on this platform.")
+        else:
+            if os.path.exists(unix_path):
+                os.unlink(unix_path)    # left by an earlier run
+            sock = socket(AF_UNIX, SOCK_STREAM)
+            sock.bind(unix_path)
+            sock.listen(backlog)
+            sockets.append(sock)
+    return ListenerGroup(sockets)
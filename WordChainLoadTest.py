@@ -0,0 +1,206 @@
+# Word Chain Load Test
+# Scripted players that measure turn latency and game throughput on each server endpoint
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: TCP and Unix socket endpoints, comparison table
+# Updated: 10/19/2026 - Players use the client library (WordChainProtocol.py); --asyncio runs them as tasks
+#
+# Usage: python WordChainLoadTest.py --endpoint tcp:localhost:12005 --endpoint unix:/tmp/wordchain-12005.sock
+#
+# Each endpoint gets --clients players that play --games games one after
+# another, chaining real words from the word list. A player gives up (sends
+# an empty word) after --turns accepted words, so games stay short and
+# throughput is measured rather than the size of the dictionary. Turn
+# latency is the time from sending a word to reading "Accepted!".
+# Endpoints are run one after another, not at the same time. Every player
+# identifies as "loadtest", so every game's record goes to that player. With --language the players
+# ask for rooms in that language and --words should be a list in it. Players
+# are threads, or with --asyncio tasks on one event loop, which is how to
+# run thousands of them from one process.
+
+from socket import *
+import argparse
+import asyncio
+import collections
+import random
+import sys
+import threading
+import time
+
+from WordChainWordIndex import WORD_LIST_PATHS
+from WordChainProtocol import Client, AsyncClient, Accepted, GameOver, RematchPrompt, NamePrompt, YourTurn
+
+
+def load_words(paths=WORD_LIST_PATHS):
+    # Lowercase alphabetic words grouped by first letter
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                words = {line.strip().lower() for line in f}
+        except OSError:
+            continue
+        by_letter = collections.defaultdict(list)
+        for word in words:
+            if word.isalpha() and word.isascii() and len(word) > 2:
+                by_letter[word[0]].append(word)
+        return by_letter
+    sys.exit("No word list found (looked for " + ", ".join(paths) + ").")
+
+
+def parse_endpoint(text):
+    # "tcp:host:port" or "unix:/path"
+    kind, _, rest = text.partition(":")
+    if kind == "unix" and rest:
+        return text, AF_UNIX, rest
+    host, sep, port = rest.rpartition(":")
+    if kind == "tcp" and sep and port.isdigit():
+        return text, None, (host.strip("[]") or "localhost", int(port))
+    raise argparse.ArgumentTypeError(f"expected tcp:host:port or unix:/path, got {text!r}")
+
+
+def client_address(endpoint):
+    # (host, port) for the client library; a Unix socket is a path as the host
+    _, family, address = endpoint
+    return (address, 0) if family == AF_UNIX else address
+
+
+class Results:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []     # seconds, one per accepted word
+        self.games = 0          # games won by a load test player, one per finished game
+        self.errors = 0
+
+
+class Player:
+    """Decides a load test player's replies; the same for threads and tasks."""
+
+    def __init__(self, words, turns, results):
+        self.words = words
+        self.turns = turns
+        self.results = results
+        self.sent_at = None
+
+    def reply(self, event, state):
+        # (line to send, whether it is a word) or None
+        kind = type(event)
+        if kind is Accepted and self.sent_at is not None:
+            with self.results.lock:
+                self.results.latencies.append(time.perf_counter() - self.sent_at)
+            self.sent_at = None
+        elif kind is GameOver and event.won:
+            with self.results.lock:
+                self.results.games += 1
+        elif kind is RematchPrompt:
+            return "no", False
+        elif kind is NamePrompt:
+            return "loadtest", False
+        elif kind is YourTurn:
+            word = None
+            if state.accepted < self.turns:
+                letter = state.last_letter or random.choice("abcdefghilmnoprst")
+                for _ in range(20):
+                    pick = random.choice(self.words[letter])
+                    if pick not in state.used_words:
+                        word = pick
+                        break
+            if word is None:
+                return "", True     # give up and end the game
+            self.sent_at = time.perf_counter()
+            return word, True
+        return None
+
+
+def play_one(endpoint, words, turns, results, language=None):
+    # Play one game on a fresh connection
+    player = Player(words, turns, results)
+    with Client(*client_address(endpoint), name="loadtest", language=language) as client:
+        for event in client.events():
+            reply = player.reply(event, client.state)
+            if reply is not None:
+                (client.play if reply[1] else client.answer)(reply[0])
+
+
+async def play_one_async(endpoint, words, turns, results, language=None):
+    player = Player(words, turns, results)
+    async with AsyncClient(*client_address(endpoint), name="loadtest", language=language) as client:
+        async for event in client.events():
+            reply = player.reply(event, client.state)
+            if reply is not None:
+                await (client.play if reply[1] else client.answer)(reply[0])
+
+
+def load_test_player(endpoint, words, games, turns, results, language=None):
+    for _ in range(games):
+        try:
+            play_one(endpoint, words, turns, results, language)
+        except OSError as e:
+            print(f"{endpoint[0]}: {e}")
+            with results.lock:
+                results.errors += 1
+
+
+async def load_test_player_async(endpoint, words, games, turns, results, language=None):
+    for _ in range(games):
+        try:
+            await play_one_async(endpoint, words, turns, results, language)
+        except (OSError, asyncio.TimeoutError) as e:
+            print(f"{endpoint[0]}: {e}")
+            results.errors += 1
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_endpoint(endpoint, words, clients, games, turns, language=None, use_asyncio=False):
+    results = Results()
+    if use_asyncio:
+        async def run_all():
+            await asyncio.gather(*(load_test_player_async(endpoint, words, games, turns, results, language)
+                                   for _ in range(clients)))
+        started = time.perf_counter()
+        asyncio.run(run_all())
+        results.elapsed = time.perf_counter() - started
+        return results
+    threads = [threading.Thread(target=load_test_player, args=(endpoint, words, games, turns, results, language))
+               for _ in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.elapsed = time.perf_counter() - started
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Word Chain load test")
+    parser.add_argument("--endpoint", type=parse_endpoint, action="append", required=True,
+                        help="tcp:host:port or unix:/path; repeat to compare endpoints")
+    parser.add_argument("--clients", type=int, default=8,
+                        help="players per endpoint, a multiple of the server's room size (default 8)")
+    parser.add_argument("--games", type=int, default=5, help="games each player plays (default 5)")
+    parser.add_argument("--turns", type=int, default=20, help="words a player plays before giving up (default 20)")
+    parser.add_argument("--words", help="word list to play from (default: the server's word list)")
+    parser.add_argument("--language", help="room language to ask for (default: the server's)")
+    parser.add_argument("--asyncio", action="store_true", help="run the players as asyncio tasks instead of threads")
+    args = parser.parse_args()
+
+    words = load_words([args.words] if args.words else WORD_LIST_PATHS)
+    rows = []
+    for endpoint in args.endpoint:
+        print(f"Running {args.clients} players x {args.games} games on {endpoint[0]}...")
+        results = run_endpoint(endpoint, words, args.clients, args.games, args.turns, args.language, args.asyncio)
+        latencies = [value * 1000 for value in results.latencies]
+        rows.append((endpoint[0], results.games, results.games / results.elapsed, len(latencies),
+                     percentile(latencies, 0.50), percentile(latencies, 0.95), percentile(latencies, 0.99),
+                     results.errors))
+
+    print(f"\n{'ENDPOINT':<36} {'GAMES':>6} {'GAMES/S':>8} {'TURNS':>7} {'P50 MS':>8} {'P95 MS':>8} "
+          f"{'P99 MS':>8} {'ERRORS':>6}")
+    for row in rows:
+        print(f"{row[0]:<36.36} {row[1]:>6} {row[2]:>8.2f} {row[3]:>7} {row[4]:>8.2f} {row[5]:>8.2f} "
+              f"{row[6]:>8.2f} {row[7]:>6}")
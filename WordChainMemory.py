@@ -0,0 +1,238 @@
+# Word Chain Memory
+# Memory used per subsystem, from estimates, tracemalloc snapshots and RSS, with budgets
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: subsystem estimates, tracemalloc attribution, budgets
+# Updated: 10/19/2026 - Records memory counts every loaded record store
+#                     - The game archive is a subsystem of its own
+#
+# Every MEMORY_SAMPLE_INTERVAL seconds a background thread works out how
+# much memory each subsystem holds:
+#   dictionary    loaded dictionaries and word indexes (the dictionary cache's estimate)
+#   sessions      running games: the words played so far plus a fixed overhead per game
+#   connections   Python side of each connection plus its queued output
+#   threads       touched stack of every thread (THREAD_STACK_BYTES each)
+#   records       player profiles and records loaded in memory
+#   caches        analytics aggregates
+#   archive       archived games not yet written to a segment, and the cached indexes
+# Estimates come from callbacks the subsystems register, so a sample costs
+# little. With --trace-memory, tracemalloc also records every Python
+# allocation and each sample attributes the traced bytes to the subsystem
+# whose module made the allocation (the innermost Word Chain frame); this
+# is accurate but slows the server down, so it is meant for sizing runs.
+# The process RSS is read from /proc where available. Kernel socket buffers
+# are reported as well, but they are not part of RSS.
+#
+# Budgets (--memory-budget rss=2048 --memory-budget records=512, in MB)
+# are checked on every sample against the larger of the traced and the
+# estimated figure. While any budget is exceeded the server refuses to
+# start new games, and running games carry on. The admin socket shows the
+# table ("memory"), and the metrics report has a gauge per subsystem.
+
+import argparse
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+from WordChainMetrics import metrics
+
+MEMORY_SAMPLE_INTERVAL = 10     # seconds between samples
+TRACE_FRAMES = 16               # frames kept per traced allocation, to find the subsystem
+THREAD_STACK_BYTES = 64 * 1024  # touched stack of a typical server thread
+SESSION_BYTES = 16 * 1024       # per running game: its thread's frames, session entry, timers
+WORD_BYTES = 48                 # per played word, on top of the string: list and set slots
+PROFILE_BYTES = 400             # per registered player: Profile and its three index entries
+RECORD_BYTES = 160              # per record: [wins, losses, best] and its dict entry
+SUBSYSTEMS = ("dictionary", "sessions", "connections", "threads", "records", "caches", "archive")
+
+# Module files whose allocations belong to each subsystem when tracing
+SUBSYSTEM_FILES = {
+    "WordChainDictionaries.py": "dictionary",
+    "WordChainWordIndex.py": "dictionary",
+    "WordChainServer.py": "sessions",
+    "WordChainAdmin.py": "sessions",
+    "WordChainBot.py": "sessions",
+    "WordChainSpectators.py": "sessions",
+    "WordChainConnection.py": "connections",
+    "WordChainListeners.py": "connections",
+    "WordChainRecords.py": "records",
+    "WordChainProfiles.py": "records",
+    "WordChainRecordsService.py": "records",
+    "WordChainAnalytics.py": "caches",
+    "WordChainArchive.py": "archive",
+}
+
+
+def format_bytes(value):
+    if value is None:
+        return "-"
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+
+
+def parse_budget(text):
+    # "name=MB" -> (name, bytes)
+    name, sep, megabytes = text.partition("=")
+    if not sep or name not in SUBSYSTEMS + ("rss",):
+        raise argparse.ArgumentTypeError(f"expected NAME=MB with NAME one of rss, {', '.join(SUBSYSTEMS)}; "
+                                         f"got {text!r}")
+    try:
+        return name, int(float(megabytes) * 2 ** 20)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a number of megabytes: {megabytes!r}")
+
+
+def sessions_memory(sessions):
+    # Running games in a SessionTable, with the words played in each
+    return sum(SESSION_BYTES + sum(sys.getsizeof(word) + WORD_BYTES for word in session.words)
+               for session in sessions.snapshot())
+
+
+def records_memory(profiles, record_stores):
+    # Profiles and the records of every loaded store; none on a cluster node using the records service
+    if profiles is None:
+        return 0
+    return len(profiles) * PROFILE_BYTES + sum(len(store.records) for store in record_stores) * RECORD_BYTES
+
+
+def current_rss():
+    # Resident set size in bytes, or None where /proc is not available
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class MemoryAccounting:
+    """Per-subsystem memory figures, refreshed by a background thread."""
+
+    def __init__(self):
+        self.budgets = {}           # subsystem or "rss" -> bytes
+        self._estimators = {}       # subsystem -> callback returning bytes
+        self.tracing = False
+        self.estimated = {}
+        self.traced = {}
+        self.rss = None
+        self.socket_buffers = 0
+        self.top_sites = []         # (bytes, "file:line") of the biggest traced allocation sites
+        self.over = []              # (name, used, budget) for every budget exceeded at the last sample
+        self.sampled_at = None
+        self._lock = threading.Lock()
+        for name in SUBSYSTEMS:
+            metrics.gauge(f"memory_{name}_bytes", lambda name=name: self.used(name))
+        metrics.gauge("memory_rss_bytes", lambda: self.rss)
+
+    def estimate(self, subsystem, callback):
+        self._estimators[subsystem] = callback
+
+    def watch_connections(self, writer):
+        # The ConnectionWriter's estimate, kept apart from the kernel socket buffers
+        def connections():
+            held, self.socket_buffers = writer.memory_used()
+            return held
+        self.estimate("connections", connections)
+
+    def start(self, budgets=None, trace=False, interval=MEMORY_SAMPLE_INTERVAL):
+        self.budgets = dict(budgets or {})
+        self.estimate("threads", lambda: threading.active_count() * THREAD_STACK_BYTES)
+        if trace:
+            tracemalloc.start(TRACE_FRAMES)
+            self.tracing = True
+        self.sample()
+        threading.Thread(target=self._run, args=(interval,), name="memory", daemon=True).start()
+
+    def _run(self, interval):
+        while True:
+            time.sleep(interval)
+            self.sample()
+
+    def used(self, name):
+        # The larger of the traced and estimated figure; RSS for "rss"
+        if name == "rss":
+            return self.rss
+        return max(self.traced.get(name, 0), self.estimated.get(name, 0))
+
+    def sample(self):
+        estimated = {}
+        for name, callback in list(self._estimators.items()):
+            try:
+                estimated[name] = int(callback() or 0)
+            except Exception:
+                estimated[name] = 0
+        traced, top_sites = self._attribute() if self.tracing else ({}, [])
+        with self._lock:
+            self.estimated = estimated
+            self.traced = traced
+            self.top_sites = top_sites
+            self.rss = current_rss()
+            self.sampled_at = time.time()
+            over = []
+            for name, budget in self.budgets.items():
+                used = self.used(name)
+                if used is not None and used > budget:
+                    over.append((name, used, budget))
+            if over and not self.over:
+                metrics.inc("memory_budget_exceeded")
+                print("Memory budget exceeded (" + ", ".join(f"{name} {format_bytes(used)} > {format_bytes(budget)}"
+                                                             for name, used, budget in over)
+                      + "); new games are refused.")
+            elif self.over and not over:
+                print("Memory back within budget; new games are accepted again.")
+            self.over = over
+
+    def _attribute(self):
+        # Traced bytes per subsystem, by the innermost Word Chain frame of each allocation
+        snapshot = tracemalloc.take_snapshot()
+        traced = dict.fromkeys(SUBSYSTEMS, 0)
+        traced["other"] = 0
+        sites = []
+        for statistic in snapshot.statistics("traceback"):
+            site = statistic.traceback[-1]
+            for frame in reversed(statistic.traceback):     # most recent call first
+                subsystem = SUBSYSTEM_FILES.get(os.path.basename(frame.filename))
+                if subsystem is not None:
+                    site = frame
+                    break
+            else:
+                subsystem = "other"
+            traced[subsystem] += statistic.size
+            sites.append((statistic.size, f"{os.path.basename(site.filename)}:{site.lineno}"))
+        sites.sort(key=lambda site: site[0], reverse=True)
+        return traced, sites[:5]
+
+    def refusing(self):
+        # Why new games are refused, or None
+        over = self.over
+        if not over:
+            return None
+        return ", ".join(f"{name} over its {format_bytes(budget)} budget" for name, _, budget in over)
+
+    def report(self, args=None):
+        # Text table for the admin socket
+        self.sample()
+        with self._lock:
+            lines = [f"{'SUBSYSTEM':<12} {'ESTIMATED':>10} {'TRACED':>10} {'BUDGET':>10}"]
+            for name in SUBSYSTEMS:
+                traced = self.traced.get(name) if self.tracing else None
+                lines.append(f"{name:<12} {format_bytes(self.estimated.get(name, 0)):>10} {format_bytes(traced):>10} "
+                             f"{format_bytes(self.budgets.get(name)):>10}")
+            if self.tracing:
+                lines.append(f"{'other':<12} {'-':>10} {format_bytes(self.traced.get('other', 0)):>10} {'-':>10}")
+            lines.append(f"{'process RSS':<12} {format_bytes(self.rss):>10} {'':>10} "
+                         f"{format_bytes(self.budgets.get('rss')):>10}")
+            if self.socket_buffers:
+                lines.append(f"Kernel socket buffers (not in RSS, at most): {format_bytes(self.socket_buffers)}")
+            if self.tracing:
+                lines.append(f"Traced in total: {format_bytes(tracemalloc.get_traced_memory()[0])}; largest sites: "
+                             + ", ".join(f"{site} {format_bytes(size)}" for size, site in self.top_sites))
+            else:
+                lines.append("Tracing is off (start the server with --trace-memory for traced figures).")
+            lines.append(f"New games: {'refused, ' + self.refusing() if self.over else 'accepted'}")
+        return "\n".join(lines) + "\n"
+
+
+memory = MemoryAccounting()
@@ -0,0 +1,68 @@
+# Word Chain Metrics
+# Process-wide counters and gauges for the Word Chain server
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: counters, gauges and periodic report
+# Updated: 10/19/2026 - Running averages (observe), used for cluster load reports
+
+import threading
+import time
+
+
+class Metrics:
+    """Named counters, running averages, and gauges computed on demand from callbacks."""
+
+    AVERAGE_WEIGHT = 0.1    # weight of each new sample in a running average
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._averages = {}
+        self._gauges = {}
+
+    def inc(self, name, amount=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def observe(self, name, value):
+        # Exponentially weighted average, so recent samples dominate
+        with self._lock:
+            previous = self._averages.get(name)
+            if previous is None:
+                self._averages[name] = value
+            else:
+                self._averages[name] = previous + self.AVERAGE_WEIGHT * (value - previous)
+
+    def average(self, name, default=0.0):
+        with self._lock:
+            return self._averages.get(name, default)
+
+    def gauge(self, name, callback):
+        # callback() is evaluated only when a snapshot is taken
+        with self._lock:
+            self._gauges[name] = callback
+
+    def snapshot(self):
+        with self._lock:
+            values = dict(self._counters)
+            values.update((name, round(value, 3)) for name, value in self._averages.items())
+            gauges = list(self._gauges.items())
+        for name, callback in gauges:
+            try:
+                values[name] = callback()
+            except Exception:
+                values[name] = None
+        return values
+
+    def report(self):
+        values = self.snapshot()
+        return "Metrics: " + ", ".join(f"{name}={values[name]}" for name in sorted(values))
+
+
+metrics = Metrics()
+
+
+def metrics_reporter(interval=60):
+    # Print a metrics line every `interval` seconds for capacity tracking.
+    while True:
+        time.sleep(interval)
+        print(metrics.report())
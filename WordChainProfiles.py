@@ -0,0 +1,100 @@
+# Word Chain Profiles
+# Stable integer player IDs for names and tokens, held in memory
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: profile cache backed by WordChainPlayers.txt
+# Updated: 10/19/2026 - register(): a new profile only, optionally keeping a given token
+#
+# Clients identify themselves straight after connecting, with a name or with
+# the token the server gave them the first time they played:
+#   Name <name>     registers a new player with that name; a name already
+#                   registered (case-insensitive) makes the client a guest
+#   Token <token>   the player the token was issued to
+# Either way the server answers "Hello <name>, you are player <id>.", and a
+# new player also gets "Token <token>", which is the only way back into the
+# profile. Records and leaderboards are keyed by the integer ID.
+#
+# WordChainPlayers.txt has one line per player, "id,name,token", appended as
+# players register. The whole file is read once and kept in memory, so a
+# lookup is a dict access.
+
+import collections
+import os
+import secrets
+import threading
+
+PLAYERS_FILE = "WordChainPlayers.txt"
+MAX_NAME_LENGTH = 24
+
+Profile = collections.namedtuple("Profile", "player_id name token")
+
+
+def clean_name(text):
+    # Names are one line of at most MAX_NAME_LENGTH characters without commas
+    name = " ".join(text.replace(",", " ").split())[:MAX_NAME_LENGTH]
+    return name or None
+
+
+class ProfileCache:
+    """Every registered player, by ID, name and token."""
+
+    def __init__(self, path=PLAYERS_FILE):
+        self.path = path
+        self.by_id = [None]     # player_id -> Profile; IDs start at 1
+        self.by_name = {}       # lowercased name -> Profile
+        self.by_token = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    fields = line.rstrip("\n").split(",")
+                    if len(fields) == 3 and fields[0].isdigit():
+                        self._add(Profile(int(fields[0]), fields[1], fields[2]))
+
+    def __len__(self):
+        return len(self.by_id) - 1
+
+    def _add(self, profile):
+        while len(self.by_id) <= profile.player_id:
+            self.by_id.append(None)
+        self.by_id[profile.player_id] = profile
+        self.by_name.setdefault(profile.name.lower(), profile)
+        self.by_token[profile.token] = profile
+
+    def get(self, player_id):
+        if 0 < player_id < len(self.by_id):
+            return self.by_id[player_id]
+        return None
+
+    def name_of(self, player_id):
+        profile = self.get(player_id)
+        return profile.name if profile is not None else f"player {player_id}"
+
+    def login(self, name=None, token=None):
+        # The Profile for a token, or for a name (registering it if new).
+        # None for an unknown token or an empty name.
+        if token is not None:
+            return self.by_token.get(token)
+        name = clean_name(name or "")
+        if name is None:
+            return None
+        profile = self.by_name.get(name.lower())
+        if profile is not None:
+            return profile
+        return self.register(name) or self.by_name.get(name.lower())   # or registered while we waited
+
+    def register(self, name, token=None):
+        # A new Profile for a name nobody has yet, keeping `token` if it is not
+        # taken (when players files are merged). None for an empty or taken name.
+        name = clean_name(name or "")
+        if name is None:
+            return None
+        with self._lock:
+            if name.lower() in self.by_name:
+                return None
+            if not token or token in self.by_token:
+                token = secrets.token_hex(8)
+            profile = Profile(len(self.by_id), name, token)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(f"{profile.player_id},{profile.name},{profile.token}\n")
+            self._add(profile)
+        return profile
@@ -0,0 +1,548 @@
+# Word Chain Protocol
+# Client side of the Word Chain protocol: connection, message decoding and typed events
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: decoder, game state, blocking and asyncio clients
+# Updated: 10/19/2026 - A game node that cannot be reached after a redirect ends in Disconnected, not an OSError
+#
+# Everything a program needs to play on a Word Chain server without a
+# terminal: the terminal client (WordChainClient.py), the load test and any
+# bot or integration test are front-ends over this module.
+#
+#   Decoder      turns received bytes into typed events (YourTurn, WordPlayed,
+#                GameOver, ...). It does no IO, so it works under any loop.
+#   GameState    what a player needs to know to choose a word: the words
+#                used so far, the letter the next word must start with,
+#                round, turn, seat. Clients keep it up to date from events.
+#   Client       blocking API: next_event(timeout) / events(), play(word), ...
+#   AsyncClient  the same API for asyncio, for many connections in one
+#                process (one task per player, no threads).
+#
+# Both clients follow a cluster coordinator's redirect, send heartbeats while
+# they wait for events, and, when the connection drops during a game,
+# reconnect with the session token and resume the seat (a Reconnecting
+# event, then the server's resync). Every event carries the line it was
+# decoded from in `text`, so a front-end can print it as it is.
+#
+# Example:
+#   with Client("localhost", 12005, name="ada") as client:
+#       for event in client.events():
+#           if isinstance(event, YourTurn):
+#               client.play(choose(client.state))
+
+from socket import *
+import asyncio
+import codecs
+import collections
+import re
+import select
+import time
+
+SERVER_PORT = 12005
+HEARTBEAT = b"/heartbeat\n"
+HEARTBEAT_INTERVAL = 5      # seconds between heartbeats sent to the server
+SERVER_SILENCE = 15         # seconds without data before a heartbeating server is given up on
+RESUME_WINDOW = 30          # seconds to keep trying to reconnect to a game (the server's SESSION_GRACE)
+RESUME_CONNECT_TIMEOUT = 5  # seconds one reconnection attempt may take
+READ_SIZE = 4096
+
+# Events. `text` is the server's line; the other fields are decoded from it.
+Message = collections.namedtuple("Message", "text")                         # any other line
+Welcome = collections.namedtuple("Welcome", "text seat players")            # a game starts
+Resumed = collections.namedtuple("Resumed", "text game_id seat players")    # back in a game after reconnecting
+Identified = collections.namedtuple("Identified", "text name player_id")
+Token = collections.namedtuple("Token", "text token")                       # identifies the player next time
+SessionToken = collections.namedtuple("SessionToken", "text token")         # resumes this game
+SessionExpired = collections.namedtuple("SessionExpired", "text")
+DictionaryVersion = collections.namedtuple("DictionaryVersion", "text version")
+Round = collections.namedtuple("Round", "text number")
+Turn = collections.namedtuple("Turn", "text number")
+YourTurn = collections.namedtuple("YourTurn", "text")
+Accepted = collections.namedtuple("Accepted", "text")
+WordPlayed = collections.namedtuple("WordPlayed", "text seat word")
+UsedWords = collections.namedtuple("UsedWords", "text words")
+GameOver = collections.namedtuple("GameOver", "text won")
+RematchPrompt = collections.namedtuple("RematchPrompt", "text")
+NamePrompt = collections.namedtuple("NamePrompt", "text")                   # name for the record
+TournamentPrompt = collections.namedtuple("TournamentPrompt", "text")
+NewGame = collections.namedtuple("NewGame", "text")                         # rematch accepted
+Goodbye = collections.namedtuple("Goodbye", "text")
+Redirect = collections.namedtuple("Redirect", "text host port ticket")      # from a cluster coordinator
+Heartbeat = collections.namedtuple("Heartbeat", "text")
+Reconnecting = collections.namedtuple("Reconnecting", "text")               # made by the client, not the server
+Disconnected = collections.namedtuple("Disconnected", "text")               # likewise; always the last event
+
+# Prompts are sent without a newline, so they are recognised while still in the buffer
+PROMPTS = {
+    "Please enter your name for the record: ": NamePrompt,
+    "Please enter your tournament name: ": TournamentPrompt,
+}
+# Lines with fields, tried in order
+PATTERNS = [
+    (re.compile(r"Player (\d+) used '(.*)'\.$"), lambda m: (int(m[1]), m[2]), WordPlayed),
+    (re.compile(r"Turn (\d+)$"), lambda m: (int(m[1]),), Turn),
+    (re.compile(r"Round (\d+)$"), lambda m: (int(m[1]),), Round),
+    (re.compile(r"Welcome to Word Chain! You are Player (\d+) of (\d+)\."),
+     lambda m: (int(m[1]), int(m[2])), Welcome),
+    (re.compile(r"Resumed game (\d+): you are Player (\d+) of (\d+)\."),
+     lambda m: (int(m[1]), int(m[2]), int(m[3])), Resumed),
+    (re.compile(r"Hello (.*), you are player (\d+)\.$"), lambda m: (m[1], int(m[2])), Identified),
+    (re.compile(r"Token (\S+)$"), lambda m: (m[1],), Token),
+    (re.compile(r"Session (\S+)$"), lambda m: (m[1],), SessionToken),
+    (re.compile(r"Dictionary version (\S+)$"), lambda m: (m[1],), DictionaryVersion),
+    (re.compile(r"Used words: (.*)$"), lambda m: (tuple(m[1].split()),), UsedWords),
+    (re.compile(r"Redirect (\S+) (\d+) (\S+)$"), lambda m: (m[1], int(m[2]), m[3]), Redirect),
+]
+# Lines without fields
+LINES = {
+    "Your turn.": YourTurn,
+    "Accepted!": Accepted,
+    "Game over! You won!": lambda text: GameOver(text, True),
+    "Game over! You lost.": lambda text: GameOver(text, False),
+    "Rematch?": RematchPrompt,
+    "Starting new game...": NewGame,
+    "Thanks for playing!": Goodbye,
+    "Session expired; that game can no longer be resumed.": SessionExpired,
+    "/heartbeat": Heartbeat,
+}
+
+
+def parse_line(line):
+    # One line from the server (without its newline) -> event
+    kind = LINES.get(line.strip())
+    if kind is not None:
+        return kind(line)
+    for pattern, fields, kind in PATTERNS:
+        match = pattern.match(line)
+        if match:
+            return kind(line, *fields(match))
+    return Message(line)
+
+
+class Decoder:
+    """Bytes from the server in, events out. Keeps partial lines (and
+    partial UTF-8 characters) until the rest arrives."""
+
+    def __init__(self):
+        self._text = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._buffer = ""
+
+    def feed(self, data):
+        self._buffer += self._text.decode(data)
+        lines = self._buffer.split("\n")
+        self._buffer = lines.pop()
+        events = [parse_line(line.rstrip("\r")) for line in lines]
+        prompt = PROMPTS.get(self._buffer)
+        if prompt is not None:
+            events.append(prompt(self._buffer))
+            self._buffer = ""
+        return events
+
+
+class GameState:
+    """The game as one player sees it, updated from that player's events."""
+
+    def __init__(self):
+        self.seat = None
+        self.players = None
+        self.round = 1
+        self.turn = 1
+        self.accepted = 0           # this player's words accepted this round
+        self.used_words = set()
+        self.last_letter = None     # the next word must start with this
+        self.pending_word = None    # sent, not yet accepted
+        self.session = None         # token to resume the game in progress
+        self.dictionary_version = None
+        self.result = None          # True won, False lost, None still playing
+
+    def apply(self, event):
+        kind = type(event)
+        if kind is Welcome or kind is Resumed:
+            if kind is Welcome:
+                self.used_words = set()
+                self.last_letter = None
+                self.pending_word = None
+                self.result = None
+            self.seat, self.players = event.seat, event.players
+        elif kind is WordPlayed:
+            self._played(event.word)
+        elif kind is UsedWords:
+            for word in event.words:
+                self._played(word)
+        elif kind is Accepted:
+            if self.pending_word:
+                self._played(self.pending_word)
+                self.pending_word = None
+            self.accepted += 1
+        elif kind is Round:
+            self.round = event.number
+            self.accepted = 0
+        elif kind is Turn:
+            self.turn = event.number
+        elif kind is GameOver:
+            self.result = event.won
+            self.pending_word = None
+        elif kind is SessionToken:
+            self.session = event.token
+        elif kind is SessionExpired or kind is Goodbye:
+            self.session = None     # nothing left to resume
+        elif kind is DictionaryVersion:
+            self.dictionary_version = event.version
+
+    def _played(self, word):
+        self.used_words.add(word)
+        self.last_letter = word[-1:]
+
+
+def handshake(name=None, token=None, language=None):
+    # Sent straight after connecting: who we are (a saved token, otherwise a
+    # name; neither makes us a guest) and the language to play in
+    lines = []
+    if token:
+        lines.append(f"Token {token}")
+    elif name:
+        lines.append(f"Name {name}")
+    if language:
+        lines.append(f"Language {language}")
+    return "".join(line + "\n" for line in lines).encode()
+
+
+def open_socket(host, port, timeout_seconds=None):
+    # A host starting with "/" is the server's Unix socket (same machine);
+    # anything else may be an IPv4 or IPv6 address or a name
+    if host.startswith("/"):
+        sock = socket(AF_UNIX, SOCK_STREAM)
+        sock.settimeout(timeout_seconds)
+        sock.connect(host)
+    else:
+        sock = create_connection((host, port), timeout_seconds)
+    sock.settimeout(None)
+    return sock
+
+
+class ClientBase:
+    """What the blocking and asyncio clients share: decoding, game state,
+    heartbeat timing and the events waiting to be returned."""
+
+    def __init__(self, host="localhost", port=SERVER_PORT, name=None, token=None, language=None):
+        self.address = (host, port)
+        self.greeting = handshake(name, token, language)
+        self.state = GameState()
+        self.closed = False
+        self._decoder = Decoder()
+        self._events = collections.deque()
+        self._heard_at = self._sent_at = time.monotonic()
+        self._server_heartbeats = False     # the server sends heartbeats, so its silence means it is gone
+
+    def _received(self, data):
+        # Decode data into events; returns a Redirect to follow, if any
+        self._heard_at = time.monotonic()
+        redirect = None
+        for event in self._decoder.feed(data):
+            if type(event) is Heartbeat:
+                self._server_heartbeats = True
+                continue
+            if type(event) is Redirect:
+                redirect = event
+            self.state.apply(event)
+            self._events.append(event)
+        return redirect
+
+    def _wait_time(self, deadline):
+        # Seconds to wait for data before the next heartbeat is due (or the deadline passes)
+        wait = self._sent_at + HEARTBEAT_INTERVAL - time.monotonic()
+        if deadline is not None:
+            wait = min(wait, deadline - time.monotonic())
+        return max(wait, 0)
+
+    def _heartbeat_due(self):
+        return time.monotonic() - self._sent_at >= HEARTBEAT_INTERVAL
+
+    def _server_silent(self):
+        return self._server_heartbeats and time.monotonic() - self._heard_at > SERVER_SILENCE
+
+    def _restart(self):
+        # A new connection: nothing half-received carries over
+        self._decoder = Decoder()
+        self._heard_at = self._sent_at = time.monotonic()
+        self._server_heartbeats = False
+
+    def _mark_sent(self, word):
+        if word and word.strip() and word.strip() != "/hint":
+            self.state.pending_word = word.strip().lower()
+
+
+class Client(ClientBase):
+    """Blocking client. Heartbeats are sent from next_event(), so a program
+    should keep calling it (a receiver thread, or a game loop) while it is
+    connected. send() and friends may be called from another thread."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sock = None
+
+    def connect(self, timeout_seconds=None):
+        self.sock = open_socket(*self.address, timeout_seconds)
+        if self.greeting:
+            # Must be the first thing sent: the server only looks for it straight after connecting
+            self.sock.sendall(self.greeting)
+        return self
+
+    def __enter__(self):
+        return self.connect() if self.sock is None else self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.closed = True
+        self.state.session = None
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+
+    # --- sending ----------------------------------------------------------
+
+    def send(self, line):
+        # One line to the server; False if the connection is gone
+        return self._send((line + "\n").encode())
+
+    def _send(self, data):
+        try:
+            self.sock.sendall(data)
+        except (OSError, AttributeError):
+            return False
+        self._sent_at = time.monotonic()
+        return True
+
+    def play(self, word):
+        # A word on our turn; "" gives up and "/hint" asks for a hint
+        self._mark_sent(word)
+        return self.send(word.strip())
+
+    def timer_expired(self):
+        return self.send("TimerExpired")
+
+    def answer(self, text):
+        # Reply to a rematch, name or tournament prompt
+        return self.send(text.strip())
+
+    # --- receiving --------------------------------------------------------
+
+    def next_event(self, timeout=None):
+        # The next event, or None if `timeout` seconds pass first. After the
+        # connection is gone, every call returns its Disconnected event.
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._events:
+            if self.closed:
+                return Disconnected("Connection closed.")
+            if self._heartbeat_due():
+                self._send(HEARTBEAT)
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            try:
+                ready, _, _ = select.select([self.sock], [], [], self._wait_time(deadline))
+                data = self.sock.recv(READ_SIZE) if ready else None
+            except (OSError, ValueError):
+                data = b""
+            if data is None:
+                if not self._server_silent():
+                    continue
+                data = b""
+            if data:
+                redirect = self._received(data)
+                if redirect is not None:
+                    self._follow(redirect)
+            else:
+                self._lost()
+        return self._events.popleft()
+
+    def events(self):
+        # Every event until (and including) Disconnected
+        while True:
+            event = self.next_event()
+            yield event
+            if type(event) is Disconnected:
+                return
+
+    def _follow(self, redirect):
+        # Play on the game node the coordinator sent us to, with the ticket first
+        self.sock.close()
+        self.address = (redirect.host, redirect.port)
+        try:
+            self.sock = open_socket(*self.address)
+            self.sock.sendall(f"Ticket {redirect.ticket}\n".encode() + self.greeting)
+        except OSError:
+            self._lost()
+            return
+        self._restart()
+
+    def _lost(self):
+        if self.state.session is not None and self._resume():
+            return
+        self.close()
+        self._events.append(Disconnected("Lost connection to the server."))
+
+    def _resume(self):
+        # Reconnect and resume the game; False if RESUME_WINDOW runs out first
+        self._events.append(Reconnecting("Connection lost; reconnecting..."))
+        deadline = time.monotonic() + RESUME_WINDOW
+        delay = 0.5
+        while time.monotonic() < deadline:
+            sock = None
+            try:
+                sock = open_socket(*self.address, RESUME_CONNECT_TIMEOUT)
+                sock.sendall(f"Resume {self.state.session}\n".encode())
+            except OSError:
+                if sock is not None:
+                    sock.close()
+                time.sleep(delay)
+                delay = min(delay * 2, 4)
+                continue
+            old, self.sock = self.sock, sock
+            try:
+                old.close()
+            except OSError:
+                pass
+            self._restart()
+            return True
+        return False
+
+
+class AsyncClient(ClientBase):
+    """asyncio client: the Client API with coroutines, for running many
+    players in one process."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reader = self.writer = None
+
+    async def connect(self, timeout_seconds=None):
+        await self._open(timeout_seconds)
+        if self.greeting:
+            await self._write(self.greeting)
+        return self
+
+    async def __aenter__(self):
+        return await self.connect() if self.writer is None else self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _open(self, timeout_seconds=None):
+        host, port = self.address
+        if host.startswith("/"):
+            opening = asyncio.open_unix_connection(host)
+        else:
+            opening = asyncio.open_connection(host, port)
+        self.reader, self.writer = await asyncio.wait_for(opening, timeout_seconds)
+
+    async def _write(self, data):
+        self.writer.write(data)
+        await self.writer.drain()
+        self._sent_at = time.monotonic()
+
+    async def close(self):
+        self.closed = True
+        self.state.session = None
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+
+    # --- sending ----------------------------------------------------------
+
+    async def send(self, line):
+        return await self._send((line + "\n").encode())
+
+    async def _send(self, data):
+        try:
+            await self._write(data)
+        except (OSError, AttributeError):
+            return False
+        return True
+
+    async def play(self, word):
+        self._mark_sent(word)
+        return await self.send(word.strip())
+
+    async def timer_expired(self):
+        return await self.send("TimerExpired")
+
+    async def answer(self, text):
+        return await self.send(text.strip())
+
+    # --- receiving --------------------------------------------------------
+
+    async def next_event(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._events:
+            if self.closed:
+                return Disconnected("Connection closed.")
+            if self._heartbeat_due():
+                await self._send(HEARTBEAT)
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            try:
+                data = await asyncio.wait_for(self.reader.read(READ_SIZE), self._wait_time(deadline))
+            except asyncio.TimeoutError:
+                if not self._server_silent():
+                    continue
+                data = b""
+            except OSError:
+                data = b""
+            if data:
+                redirect = self._received(data)
+                if redirect is not None:
+                    await self._follow(redirect)
+            else:
+                await self._lost()
+        return self._events.popleft()
+
+    async def events(self):
+        while True:
+            event = await self.next_event()
+            yield event
+            if type(event) is Disconnected:
+                return
+
+    async def _follow(self, redirect):
+        self.writer.close()
+        self.address = (redirect.host, redirect.port)
+        try:
+            await self._open()
+            await self._write(f"Ticket {redirect.ticket}\n".encode() + self.greeting)
+        except OSError:
+            await self._lost()
+            return
+        self._restart()
+
+    async def _lost(self):
+        if self.state.session is not None and await self._resume():
+            return
+        await self.close()
+        self._events.append(Disconnected("Lost connection to the server."))
+
+    async def _resume(self):
+        self._events.append(Reconnecting("Connection lost; reconnecting..."))
+        deadline = time.monotonic() + RESUME_WINDOW
+        delay = 0.5
+        while time.monotonic() < deadline:
+            old = self.writer
+            try:
+                await self._open(RESUME_CONNECT_TIMEOUT)
+                await self._write(f"Resume {self.state.session}\n".encode())
+            except (OSError, asyncio.TimeoutError):
+                if self.writer is not old:
+                    self.writer.close()     # connected, but the resume request did not go through
+                    self.writer = old
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 4)
+                continue
+            old.close()
+            self._restart()
+            return True
+        return False
@@ -0,0 +1,154 @@
+# Word Chain Records
+# Wins, losses and best scores keyed by player ID, updated in memory and journaled to disk
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: record store, journal and compaction, cached leaderboard
+# Updated: 10/19/2026 - Offline check, repair and merge of record files (WordChainRecordsTool.py)
+#
+# WordChainRecords.txt holds one line per player, "id,name,wins,losses,best"
+# (the name is a copy for people reading the file; the ID is the key). The
+# store reads it once at start-up and then keeps every record in a dict, so
+# recording a game costs one dict update per player plus one appended line
+# per player in WordChainRecords.journal. Journal lines have the same format
+# and carry the player's new totals, so replaying them is idempotent: a
+# later line simply replaces an earlier one.
+#
+# After COMPACT_AFTER journal lines the journal is switched for a new one
+# and a background thread rewrites the records file from memory (to a
+# temporary file, then renamed over the old one) and deletes the old
+# journal. At start-up the records file, any old journal left by a crash,
+# and the journal are read in that order.
+#
+# Rows in the old name-keyed format, "name,wins,losses,best", are given a
+# player ID through the profile cache when the file is first loaded; rows
+# that share a name are added together. The file is then rewritten in the
+# new format.
+
+import heapq
+import os
+import threading
+
+RECORDS_FILE = "WordChainRecords.txt"
+COMPACT_AFTER = 10000   # journal lines before the records file is rewritten
+TOP_SIZE = 10           # leaderboard entries kept up to date on every game
+
+
+class RecordStore:
+    """Every player's wins, losses and best score, keyed by player ID."""
+
+    def __init__(self, profiles, path=RECORDS_FILE, compact_after=COMPACT_AFTER):
+        self.profiles = profiles
+        self.path = path
+        self.journal_path = os.path.splitext(path)[0] + ".journal"
+        self.compact_after = compact_after
+        self.records = {}       # player_id -> [wins, losses, best]
+        self._lock = threading.Lock()
+        self._compacting = None
+        legacy = False
+        for path in (self.path, self.journal_path + ".old", self.journal_path):
+            if os.path.exists(path):
+                legacy |= self._load(path)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._journal_lines = 0
+        self._top = heapq.nlargest(TOP_SIZE, self.records, key=self._rank)
+        if legacy:
+            self.compact(wait=True)
+
+    def _rank(self, player_id):
+        return self.records[player_id][2], -player_id
+
+    def _load(self, path):
+        # Returns True if the file had rows in the old name-keyed format
+        legacy = False
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                fields = line.strip().split(",")
+                try:
+                    if len(fields) == 5:
+                        self.records[int(fields[0])] = [int(fields[2]), int(fields[3]), int(fields[4])]
+                    elif len(fields) == 4:
+                        profile = self.profiles.login(name=fields[0])
+                        if profile is None:
+                            continue
+                        wins, losses, best = int(fields[1]), int(fields[2]), int(fields[3])
+                        record = self.records.setdefault(profile.player_id, [0, 0, 0])
+                        record[0] += wins
+                        record[1] += losses
+                        record[2] = max(record[2], best)
+                        legacy = True
+                except ValueError:
+                    continue    # a line cut short by a crash
+        return legacy
+
+    def get(self, player_id):
+        record = self.records.get(player_id)
+        return tuple(record) if record is not None else (0, 0, 0)
+
+    def record(self, results):
+        # results: (player_id, won, score) for each player of one game
+        lines = []
+        with self._lock:
+            for player_id, won, score in results:
+                record = self.records.get(player_id)
+                if record is None:
+                    record = self.records[player_id] = [0, 0, 0]
+                record[0 if won else 1] += 1
+                record[2] = max(record[2], score)
+                lines.append(self._line(player_id, record))
+                self._update_top(player_id)
+            self._journal.write("".join(lines))
+            self._journal.flush()
+            self._journal_lines += len(lines)
+            compact = self._journal_lines >= self.compact_after and self._compacting is None
+        if compact:
+            self.compact()
+
+    def _line(self, player_id, record):
+        return f"{player_id},{self.profiles.name_of(player_id)},{record[0]},{record[1]},{record[2]}\n"
+
+    def _update_top(self, player_id):
+        # Best scores never go down, so the leaderboard only changes when a
+        # player reaches it or moves up within it
+        if player_id in self._top:
+            self._top.sort(key=self._rank, reverse=True)
+        elif len(self._top) < TOP_SIZE or self._rank(player_id) > self._rank(self._top[-1]):
+            self._top.append(player_id)
+            self._top.sort(key=self._rank, reverse=True)
+            del self._top[TOP_SIZE:]
+
+    def top(self, count=5):
+        # [(player_id, best)], best first; count can be at most TOP_SIZE
+        with self._lock:
+            return [(player_id, self.records[player_id][2]) for player_id in self._top[:count]]
+
+    def compact(self, wait=False):
+        # Start a new journal, then rewrite the records file in the background
+        with self._lock:
+            if self._compacting is not None:
+                return
+            self._journal.close()
+            if not os.path.exists(self.journal_path + ".old"):
+                os.replace(self.journal_path, self.journal_path + ".old")
+            # else the last rewrite failed: keep its old journal and carry on with this one
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+            self._journal_lines = 0
+            snapshot = self.records.copy()
+            thread = self._compacting = threading.Thread(target=self._rewrite, args=(snapshot,),
+                                                         name="records-compact", daemon=True)
+            thread.start()
+        if wait:
+            thread.join()
+
+    def _rewrite(self, snapshot):
+        # The snapshot's record lists are shared with the live store, so some
+        # may already hold newer totals; the new journal has those too.
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                for player_id, record in snapshot.items():
+                    f.write(self._line(player_id, record))
+            os.replace(temp_path, self.path)
+            os.remove(self.journal_path + ".old")
+        except OSError as e:
+            print(f"Could not rewrite {self.path} ({e}); the journal keeps every update.")
+        with self._lock:
+            self._compacting = None
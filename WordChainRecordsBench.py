@@ -0,0 +1,293 @@
+# Word Chain Records Benchmark
+# Scaling benchmark for the records and leaderboard paths, with a stored baseline to compare against
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: synthetic record files, latency percentiles, RSS and I/O per operation
+#
+# Usage: python WordChainRecordsBench.py [--sizes 1e3,1e4,1e5] [--baseline WordChainBenchBaseline.json]
+#
+# For each size a synthetic WordChainPlayers.txt and WordChainRecords.txt
+# with that many players is generated once into --data and reused by later
+# runs. Each size then runs in its own Python process (so peak RSS belongs
+# to that size alone), in a fresh copy of the files, and times the server's
+# own functions:
+#   load          the first local_records() call: reading both files at start-up
+#   store_record  --ops two-player games ended one after another
+#   get_top_5     --ops leaderboard reads
+#   burst         --bursts rounds of --burst-size games ending at the same moment
+#                 on separate threads, as when many rooms finish together
+#   compact       one full rewrite of the records file from memory
+# For each operation it reports the latency percentiles, the peak RSS of
+# the process once the operation has run, and the bytes read and written
+# per call (from /proc/self/io, so Linux only; the columns are blank
+# elsewhere).
+#
+# Results are written as JSON to --output. With --baseline the run is
+# compared against an earlier results file: any p95 latency, bytes per call
+# or peak RSS more than --tolerance above the baseline is listed as a
+# regression and the exit status is 1, so a deploy script can stop on it.
+# To make a run the new baseline, copy its results file over the baseline.
+#
+# The 1e7 size needs several GB of memory and some minutes to generate;
+# pick smaller --sizes for a quick check.
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+DEFAULT_SIZES = "1e3,1e4,1e5,1e6,1e7"
+OPERATIONS = ("load", "store_record", "get_top_5", "burst", "compact")
+OPS = 5000              # timed calls of store_record and get_top_5 per size
+BURSTS = 20             # concurrent game-end rounds per size
+BURST_SIZE = 32         # games ending at once in each round
+TOLERANCE = 0.25        # fraction above the baseline that counts as a regression
+MIN_LATENCY_CHANGE_MS = 0.05    # smaller p95 changes are timer noise, not regressions
+BEST_SCORE_RANGE = 60   # synthetic best scores are drawn from 0 up to this
+
+PLAYERS_FILE = "WordChainPlayers.txt"
+RECORDS_FILE = "WordChainRecords.txt"
+
+
+def parse_sizes(text):
+    try:
+        sizes = [int(float(size)) for size in text.split(",") if size.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected sizes like 1e3,1e4, got {text!r}")
+    if not sizes or min(sizes) < 2:
+        raise argparse.ArgumentTypeError("every size must be at least 2 players")
+    return sizes
+
+
+def generate(data_dir, size):
+    # The directory holding a synthetic player and records file for size players
+    path = os.path.join(data_dir, str(size))
+    if os.path.exists(os.path.join(path, "complete")):
+        return path
+    os.makedirs(path, exist_ok=True)
+    print(f"Generating {size} players in {path}...", file=sys.stderr)
+    rng = random.Random(size)   # the same files on every machine
+    with open(os.path.join(path, PLAYERS_FILE), "w", encoding="utf-8") as players, \
+            open(os.path.join(path, RECORDS_FILE), "w", encoding="utf-8") as records:
+        for player_id in range(1, size + 1):
+            name = f"player{player_id}"
+            players.write(f"{player_id},{name},{rng.getrandbits(64):016x}\n")
+            wins, losses = rng.randrange(50), rng.randrange(50)
+            records.write(f"{player_id},{name},{wins},{losses},{rng.randrange(BEST_SCORE_RANGE)}\n")
+    open(os.path.join(path, "complete"), "w").close()
+    return path
+
+
+def io_counters():
+    # (bytes read, bytes written) by this process's read and write calls so far
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(": ") for line in f.read().splitlines())
+        return int(fields["rchar"]), int(fields["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)    # bytes on macOS, KB elsewhere
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def summarize(latencies, calls, io_before, io_after):
+    # latencies in seconds; calls is how many calls the I/O is shared between
+    ms = [value * 1000 for value in latencies]
+    result = {"calls": calls,
+              "p50_ms": round(percentile(ms, 0.50), 4),
+              "p95_ms": round(percentile(ms, 0.95), 4),
+              "p99_ms": round(percentile(ms, 0.99), 4),
+              "max_ms": round(max(ms), 4) if ms else 0.0,
+              "read_bytes_per_call": None,
+              "written_bytes_per_call": None,
+              "peak_rss_mb": peak_rss_mb()}
+    if io_before is not None and io_after is not None:
+        result["read_bytes_per_call"] = round((io_after[0] - io_before[0]) / calls, 1)
+        result["written_bytes_per_call"] = round((io_after[1] - io_before[1]) / calls, 1)
+    return result
+
+
+def random_game(rng, size):
+    first, second = rng.sample(range(1, size + 1), 2)
+    return [(first, rng.randrange(BEST_SCORE_RANGE)), (second, rng.randrange(BEST_SCORE_RANGE))]
+
+
+def run_size(size, source, ops, bursts, burst_size):
+    # Time each operation against a fresh copy of the files for size players
+    work = tempfile.mkdtemp(prefix=f"wordchain-bench-{size}-")
+    for name in (PLAYERS_FILE, RECORDS_FILE):
+        shutil.copyfile(os.path.join(source, name), os.path.join(work, name))
+    os.chdir(work)
+    import WordChainServer as server    # after the chdir: the server keeps its files in the working directory
+
+    rng = random.Random(0)
+    results = {}
+    try:
+        io_before = io_counters()
+        started = time.perf_counter()
+        _, store = server.local_records()
+        results["load"] = summarize([time.perf_counter() - started], 1, io_before, io_counters())
+
+        games = [random_game(rng, size) for _ in range(ops)]
+        latencies = []
+        io_before = io_counters()
+        for placements in games:
+            started = time.perf_counter()
+            server.store_record(placements)
+            latencies.append(time.perf_counter() - started)
+        results["store_record"] = summarize(latencies, ops, io_before, io_counters())
+
+        latencies = []
+        io_before = io_counters()
+        for _ in range(ops):
+            started = time.perf_counter()
+            server.get_top_5()
+            latencies.append(time.perf_counter() - started)
+        results["get_top_5"] = summarize(latencies, ops, io_before, io_counters())
+
+        latencies = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(burst_size)
+
+        def end_game(placements):
+            barrier.wait()
+            started = time.perf_counter()
+            server.store_record(placements)
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+
+        io_before = io_counters()
+        for _ in range(bursts):
+            threads = [threading.Thread(target=end_game, args=(random_game(rng, size),)) for _ in range(burst_size)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        results["burst"] = summarize(latencies, bursts * burst_size, io_before, io_counters())
+
+        io_before = io_counters()
+        started = time.perf_counter()
+        store.compact(wait=True)
+        results["compact"] = summarize([time.perf_counter() - started], 1, io_before, io_counters())
+    finally:
+        os.chdir(os.path.dirname(os.path.abspath(__file__)))
+        shutil.rmtree(work, ignore_errors=True)
+    return results
+
+
+def run_in_child(size, source, args):
+    # Each size gets its own interpreter so its peak RSS is its own
+    command = [sys.executable, os.path.abspath(__file__), "--run-size", str(size), "--source", source,
+               "--ops", str(args.ops), "--bursts", str(args.bursts), "--burst-size", str(args.burst_size)]
+    env = dict(os.environ)
+    here = os.path.dirname(os.path.abspath(__file__))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [here, env.get("PYTHONPATH")]))
+    finished = subprocess.run(command, stdout=subprocess.PIPE, env=env, text=True)
+    if finished.returncode != 0:
+        sys.exit(f"The run for {size} players failed (exit status {finished.returncode}).")
+    return json.loads(finished.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance):
+    # Lines describing every regression against the baseline
+    regressions = []
+    for size, operations in results["sizes"].items():
+        for operation, current in operations.items():
+            before = baseline.get("sizes", {}).get(size, {}).get(operation)
+            if before is None:
+                continue
+            for metric in ("p95_ms", "read_bytes_per_call", "written_bytes_per_call", "peak_rss_mb"):
+                old, new = before.get(metric), current.get(metric)
+                if old is None or new is None or new <= old * (1 + tolerance):
+                    continue
+                if metric == "p95_ms" and new - old < MIN_LATENCY_CHANGE_MS:
+                    continue
+                regressions.append(f"{size:>10} {operation:<13} {metric:<23} {old:>12} -> {new}")
+    return regressions
+
+
+def print_table(results):
+    print(f"{'PLAYERS':>10} {'OPERATION':<13} {'CALLS':>7} {'P50 MS':>9} {'P95 MS':>9} {'P99 MS':>9} "
+          f"{'READ B/CALL':>12} {'WRITE B/CALL':>12} {'PEAK RSS MB':>11}")
+    for size, operations in results["sizes"].items():
+        for operation in OPERATIONS:
+            row = operations[operation]
+            read = "" if row["read_bytes_per_call"] is None else f"{row['read_bytes_per_call']:.0f}"
+            written = "" if row["written_bytes_per_call"] is None else f"{row['written_bytes_per_call']:.0f}"
+            rss = "" if row["peak_rss_mb"] is None else f"{row['peak_rss_mb']:.1f}"
+            print(f"{size:>10} {operation:<13} {row['calls']:>7} {row['p50_ms']:>9.3f} {row['p95_ms']:>9.3f} "
+                  f"{row['p99_ms']:>9.3f} {read:>12} {written:>12} {rss:>11}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Word Chain records benchmark")
+    parser.add_argument("--sizes", type=parse_sizes, default=parse_sizes(DEFAULT_SIZES),
+                        help=f"players in each synthetic records file (default {DEFAULT_SIZES})")
+    parser.add_argument("--ops", type=int, default=OPS,
+                        help=f"timed store_record and get_top_5 calls per size (default {OPS})")
+    parser.add_argument("--bursts", type=int, default=BURSTS, help=f"concurrent game-end rounds (default {BURSTS})")
+    parser.add_argument("--burst-size", type=int, default=BURST_SIZE,
+                        help=f"games ending at once in each round (default {BURST_SIZE})")
+    parser.add_argument("--data", default=os.path.join(tempfile.gettempdir(), "wordchain-bench"),
+                        help="where generated record files are kept between runs")
+    parser.add_argument("--output", default="WordChainBenchResults.json", help="results file to write")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help=f"fraction above the baseline that counts as a regression (default {TOLERANCE})")
+    parser.add_argument("--run-size", type=int, help=argparse.SUPPRESS)    # used by the child processes
+    parser.add_argument("--source", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_size:
+        print(json.dumps(run_size(args.run_size, args.source, args.ops, args.bursts, args.burst_size)))
+        sys.exit()
+
+    results = {"date": time.strftime("%Y-%m-%d %H:%M:%S"),
+               "python": platform.python_version(),
+               "platform": platform.platform(),
+               "ops": args.ops, "bursts": args.bursts, "burst_size": args.burst_size,
+               "sizes": {}}
+    for size in args.sizes:
+        source = generate(args.data, size)
+        print(f"Benchmarking {size} players...", file=sys.stderr)
+        results["sizes"][str(size)] = run_in_child(size, source, args)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print_table(results)
+    print(f"\nResults written to {args.output}.")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline} "
+                  f"(more than {args.tolerance:.0%} above the baseline):")
+            for line in regressions:
+                print(line)
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}.")
@@ -0,0 +1,156 @@
+# Word Chain Records Service
+# One shared records and leaderboard service for every game node in a cluster
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: store/top requests over TCP, client with local fallback
+# Updated: 10/19/2026 - Player logins, so every node hands out the same player IDs
+#                     - Logins while the service is down make the player a guest, never a node-local ID
+#                     - Registering a new name, separate from logging in
+#                     - Logins by token only; computer players have their own request, without a token
+#                     - Scoring-mode records kept apart from words-played records
+#
+# Requests and replies are single JSON lines:
+#   {"op": "store", "placements": [[player_id, score], ...], "scoring": false}  ->  {"ok": true}
+#   {"op": "top", "scoring": false}                 ->  {"ok": true, "text": "High Scores: ..."}
+#   {"op": "login", "token": token} ->  {"ok": true, "profile": [player_id, name, token]} (null if unknown)
+#   {"op": "register", "name": name} -> the same, with a new profile (null if the name is taken)
+#   {"op": "bot", "difficulty": d}  ->  the computer player's [player_id, name, null], registered on first use
+# Only a player's token gets their profile back, and a new player's token is
+# only sent to the node that registered them: the service's port is open to
+# the network, and a token is all it takes to play as someone.
+# The service keeps WordChainRecords.txt and WordChainPlayers.txt in its own
+# working directory, so all nodes share one set of players and records.
+# Records of scoring-mode games ("scoring": true, from nodes started with
+# --scoring) are points rather than words played, and go to
+# WordChainScores.txt instead.
+# Store and top calls only happen when a game ends, logins when a player
+# connects.
+
+from socket import *
+from _thread import *
+import json
+
+from WordChainBot import BOT_DIFFICULTIES
+from WordChainMetrics import metrics
+from WordChainProfiles import Profile
+
+RECORDS_SERVICE_PORT = 12011
+
+
+def handle_records_client(sock, store_record, get_top_5, login, register, bot_profile):
+    sock.settimeout(30)
+    reader = sock.makefile("r", encoding="utf-8")
+    try:
+        for line in reader:
+            try:
+                request = json.loads(line)
+                if request.get("op") == "store":
+                    store_record([(None if player_id is None else int(player_id), int(score))
+                                  for player_id, score in request["placements"]], bool(request.get("scoring")))
+                    reply = {"ok": True}
+                elif request.get("op") == "top":
+                    reply = {"ok": True, "text": get_top_5(bool(request.get("scoring")))}
+                elif request.get("op") == "login":
+                    token = request.get("token")
+                    reply = {"ok": True, "profile": login(token) if isinstance(token, str) and token else None}
+                elif request.get("op") == "register":
+                    reply = {"ok": True, "profile": register(request.get("name"))}
+                elif request.get("op") == "bot" and request.get("difficulty") in BOT_DIFFICULTIES:
+                    profile = bot_profile(request["difficulty"])
+                    reply = {"ok": True, "profile": profile._replace(token=None) if profile is not None else None}
+                else:
+                    reply = {"ok": False, "error": "unknown op"}
+            except (ValueError, KeyError, TypeError, OSError) as e:
+                reply = {"ok": False, "error": str(e)}
+            metrics.inc("records_requests")
+            sock.sendall((json.dumps(reply) + "\n").encode())
+    except OSError:
+        pass
+    try:
+        sock.close()
+    except Exception:
+        pass
+
+
+def records_service(port=RECORDS_SERVICE_PORT):
+    # Imported here so the service can run inside the coordinator process
+    from WordChainServer import store_record, get_top_5, login, register, bot_profile
+    listenSocket = socket(AF_INET, SOCK_STREAM)
+    listenSocket.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
+    listenSocket.bind(("", port))
+    listenSocket.listen(64)
+    print(f"Records service is ready on port {port}.")
+    while True:
+        sock, addr = listenSocket.accept()
+        start_new_thread(handle_records_client, (sock, store_record, get_top_5, login, register, bot_profile))
+
+
+class RecordsClient:
+    """Talks to a records service. If the service cannot be reached the
+    node falls back to its own local files, which can be merged later.
+    Logins have no fallback: player IDs only come from the service."""
+
+    def __init__(self, host, port=RECORDS_SERVICE_PORT, fallback_store=None, fallback_top=None):
+        self.address = (host, port)
+        self.fallback_store = fallback_store
+        self.fallback_top = fallback_top
+
+    def _call(self, request):
+        with create_connection(self.address, timeout=5) as sock:
+            sock.sendall((json.dumps(request) + "\n").encode())
+            reply = json.loads(sock.makefile("r", encoding="utf-8").readline())
+        if not reply.get("ok"):
+            raise OSError(reply.get("error", "records service error"))
+        return reply
+
+    def store_record(self, placements, scoring=False):
+        try:
+            self._call({"op": "store", "placements": placements, "scoring": scoring})
+        except (OSError, ValueError) as e:
+            metrics.inc("records_service_errors")
+            print(f"Records service unavailable ({e}); storing the record locally.")
+            self.fallback_store(placements)
+
+    def login(self, token):
+        # None (a guest) while the service is down: an ID made up on this node
+        # would belong to another player on the service, and their records
+        # would be credited to them. Guests are asked for a name again when
+        # the game ends, by which time the service may be back.
+        try:
+            profile = self._call({"op": "login", "token": token})["profile"]
+            return Profile(*profile) if profile is not None else None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            metrics.inc("records_service_errors")
+            print(f"Records service unavailable ({e}); the player plays as a guest.")
+            return None
+
+    def register(self, name):
+        # None if the name is taken, or while the service is down (see login)
+        try:
+            profile = self._call({"op": "register", "name": name})["profile"]
+            return Profile(*profile) if profile is not None else None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            metrics.inc("records_service_errors")
+            print(f"Records service unavailable ({e}); the player plays as a guest.")
+            return None
+
+    def bot_profile(self, difficulty):
+        # None while the service is down: the computer plays without a record
+        try:
+            profile = self._call({"op": "bot", "difficulty": difficulty})["profile"]
+            return Profile(*profile) if profile is not None else None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            metrics.inc("records_service_errors")
+            print(f"Records service unavailable ({e}); the computer player has no record.")
+            return None
+
+    def get_top_5(self, scoring=False):
+        try:
+            return self._call({"op": "top", "scoring": scoring})["text"]
+        except (OSError, ValueError, KeyError) as e:
+            metrics.inc("records_service_errors")
+            print(f"Records service unavailable ({e}); showing local high scores.")
+            return self.fallback_top()
+
+
+if __name__ == "__main__":
+    records_service()
@@ -0,0 +1,348 @@
+# Word Chain Records Tool
+# Offline check, repair and merge of record files in bounded memory
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: validation, external merge sort, per-player re-aggregation, atomic write
+# Updated: 10/19/2026 - Sources with their own players file are re-keyed by name; ID/name conflicts are reported
+#
+# Usage: python WordChainRecordsTool.py [--output WordChainRecords.txt] [--check] [--memory MB] RECORDS...
+#
+# Each RECORDS file is one source, read together with its journals
+# (RECORDS.journal.old, then RECORDS.journal) the way RecordStore reads
+# them at start-up. Within a source a later line for a player replaces an
+# earlier one and rows in the old name-keyed format are added together,
+# again as RecordStore does; this is what cleans up duplicate rows left by
+# past concurrent writes. Across sources, which are separate servers'
+# records, a player's wins and losses are added up and the best score is
+# the highest. The result is one line per player, in player ID order.
+#
+# Player IDs are only meaningful next to the players file that issued them.
+# The output's IDs are those of --players. A source with a players file of
+# its own beside it (another node's WordChainPlayers.txt) is re-keyed: each
+# of its IDs is looked up there, and the player's name gives the ID in
+# --players, where players new to it are registered with their token. A
+# source without one is taken to share --players; a row whose name does not
+# match the name --players has for its ID, or two sources giving one ID two
+# different names, is a conflict: it is shown and left out rather than
+# credited to the wrong player.
+#
+# Lines that are not records (wrong field count, non-numbers, negative
+# counts, a crash's cut-off line) are counted, shown and left out; with
+# --check nothing is written. The exit status is 1 if any invalid line or
+# conflict was found.
+#
+# Rows are sorted by an external merge sort, so files larger than memory
+# are fine: rows are parsed into runs of at most --memory MB, each run is
+# sorted and written to a temporary file, and the runs are merged
+# MERGE_FAN_IN at a time until one sorted stream is left, which is then
+# folded player by player. Memory grows with the number of players (the
+# players files are held in memory, as the server holds them), not with the
+# number of record lines. The output goes to a temporary file in the same directory and
+# is renamed over --output once complete; journals of the output file that
+# were read in are then deleted, since their lines are in the output. Stop
+# the server first: it keeps its records in memory and journals over the
+# file.
+
+import argparse
+import heapq
+import itertools
+import os
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+from WordChainProfiles import ProfileCache, PLAYERS_FILE, clean_name
+from WordChainRecords import RECORDS_FILE
+
+MEMORY = 64             # MB of parsed rows held before a run is written out
+ROW_BYTES = 256         # rough memory per buffered row: the sort key line and its list slot
+MERGE_FAN_IN = 64       # runs merged at once, each one an open file
+SHOW_INVALID = 10       # invalid lines printed before the rest are only counted
+
+# Run lines: "<player id><source><line>" as fixed-width digits, so that
+# plain string order is the order rows are folded in, then tab-separated
+# kind ("t" totals, "a" old name-keyed row to add), wins, losses, best, name
+KEY_WIDTHS = (19, 6, 12)
+
+
+def journal_paths(path):
+    base = os.path.splitext(path)[0] + ".journal"
+    return [journal for journal in (base + ".old", base) if os.path.exists(journal)]
+
+
+def is_placeholder(player_id, name):
+    # RecordStore writes "player <id>" for a player missing from its players file
+    return name == f"player {player_id}"
+
+
+def parse_record(line):
+    # (player_id or None, name, wins, losses, best), player_id None for an old
+    # name-keyed row; raises ValueError for anything else
+    fields = line.rstrip("\r\n").split(",")
+    if len(fields) == 5:
+        player_id, name, counts = int(fields[0]), fields[1], fields[2:]
+        if player_id <= 0:
+            raise ValueError("player ID must be positive")
+    elif len(fields) == 4:
+        player_id, name, counts = None, fields[0].strip(), fields[1:]
+        if not name:
+            raise ValueError("empty name")
+    else:
+        raise ValueError(f"{len(fields)} fields")
+    wins, losses, best = (int(count) for count in counts)
+    if min(wins, losses, best) < 0:
+        raise ValueError("negative count")
+    return player_id, name, wins, losses, best
+
+
+class Stats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.files = self.lines = self.bytes = self.invalid = self.conflicts = 0
+        self.legacy = self.collapsed = self.players = self.runs = self.passes = 0
+
+    def report(self, written):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        print(f"Read {self.lines} lines ({self.bytes / 2 ** 20:.1f} MB) from {self.files} file(s); "
+              f"{self.invalid} invalid, {self.legacy} in the old name-keyed format, {self.conflicts} conflicting.")
+        if written:
+            print(f"Wrote {self.players} player(s) to {written}; {self.collapsed} duplicate row(s) folded in.")
+        print(f"{self.runs} sorted run(s), {self.passes} merge pass(es), {elapsed:.2f}s: "
+              f"{self.lines / elapsed:,.0f} lines/s, {self.bytes / 2 ** 20 / elapsed:.1f} MB/s"
+              + (f", peak RSS {peak_rss_mb()} MB." if resource is not None else "."))
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)    # bytes on macOS, KB elsewhere
+
+
+class RecordsTool:
+    """One check or merge: sources in, sorted runs on disk, one records file out."""
+
+    def __init__(self, sources, players_path=PLAYERS_FILE, memory=MEMORY, check=False):
+        self.sources = sources
+        self.players_path = players_path
+        self.run_rows = max(1000, memory * 2 ** 20 // ROW_BYTES)
+        self.check = check
+        self.profiles = ProfileCache(players_path)  # the output's player IDs
+        self._provisional = {}  # --check: names that would be registered -> the ID they would get
+        self.stats = Stats()
+        self.temp_dir = None
+
+    def _namespace(self, path):
+        # The source's own players file, or None if it shares the output's
+        players = os.path.join(os.path.dirname(path), PLAYERS_FILE)
+        if not os.path.exists(players) or os.path.abspath(players) == os.path.abspath(self.players_path):
+            return None
+        return ProfileCache(players)
+
+    def _output_id(self, name, token=None):
+        # (ID in the output's players file, name) for a player name,
+        # registering it if new; None for a name that cannot be a player's
+        name = clean_name(name)
+        if name is None:
+            return None
+        profile = self.profiles.by_name.get(name.lower())
+        if profile is None and not self.check:
+            profile = self.profiles.register(name, token)
+        if profile is not None:
+            return profile.player_id, profile.name
+        # --check registers nothing: new names get the IDs they would be given
+        return self._provisional.setdefault(name.lower(), len(self.profiles.by_id) + len(self._provisional)), name
+
+    def _rekey(self, namespace, player_id, name):
+        # (output ID, name) for a row's ID and name, or a string saying why it conflicts
+        if namespace is not None:
+            profile = namespace.get(player_id)
+            if profile is None:
+                if is_placeholder(player_id, name):
+                    return f"player {player_id} is not in {namespace.path}"
+                return self._output_id(name) or "unusable name"
+            return self._output_id(profile.name, profile.token) or "unusable name"
+        profile = self.profiles.get(player_id)
+        if profile is not None and not is_placeholder(player_id, name) and profile.name.lower() != name.lower():
+            return f"{self.players_path} has player {player_id} as {profile.name!r}"
+        return player_id, profile.name if profile is not None else name
+
+    def rows(self):
+        # Run lines for every valid record, in file order
+        sequence = itertools.count()
+        for source, path in enumerate(self.sources):
+            namespace = self._namespace(path)
+            for name in [path] + journal_paths(path):
+                self.stats.files += 1
+                with open(name, "rb") as f:
+                    for number, raw in enumerate(f, 1):
+                        self.stats.lines += 1
+                        self.stats.bytes += len(raw)
+                        line = raw.decode("utf-8", errors="replace")
+                        if not line.strip():
+                            continue
+                        try:
+                            player_id, player_name, wins, losses, best = parse_record(line)
+                        except ValueError as e:
+                            self._invalid(name, number, line, e)
+                            continue
+                        kind = "t"
+                        if player_id is None:
+                            self.stats.legacy += 1
+                            kind = "a"
+                            key = self._output_id(player_name) or "unusable name"
+                        else:
+                            key = self._rekey(namespace, player_id, player_name)
+                        if isinstance(key, str):
+                            self._conflict(f"{name}:{number}: {key}: {line.strip()[:80]!r}")
+                            continue
+                        player_id, player_name = key
+                        yield (f"{player_id:0{KEY_WIDTHS[0]}d}{source:0{KEY_WIDTHS[1]}d}"
+                               f"{next(sequence):0{KEY_WIDTHS[2]}d}\t{kind}\t{wins}\t{losses}\t{best}\t{player_name}\n")
+
+    def _invalid(self, path, number, line, reason):
+        self.stats.invalid += 1
+        if self.stats.invalid <= SHOW_INVALID:
+            print(f"{path}:{number}: {reason}: {line.strip()[:80]!r}")
+        elif self.stats.invalid == SHOW_INVALID + 1:
+            print("More invalid lines follow; only their count is shown.")
+
+    def _conflict(self, message):
+        self.stats.conflicts += 1
+        if self.stats.conflicts <= SHOW_INVALID:
+            print(f"Conflict: {message}")
+        elif self.stats.conflicts == SHOW_INVALID + 1:
+            print("More conflicts follow; only their count is shown.")
+
+    def _write_run(self, lines):
+        lines.sort()
+        fd, path = tempfile.mkstemp(suffix=".run", dir=self.temp_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        self.stats.runs += 1
+        return path
+
+    def sorted_runs(self):
+        # Sorted run files of at most run_rows rows each
+        runs, lines = [], []
+        for line in self.rows():
+            lines.append(line)
+            if len(lines) >= self.run_rows:
+                runs.append(self._write_run(lines))
+                lines = []
+        if lines:
+            runs.append(self._write_run(lines))
+        return runs
+
+    def _merge_files(self, paths):
+        files = [open(path, encoding="utf-8") for path in paths]
+        try:
+            yield from heapq.merge(*files)
+        finally:
+            for f in files:
+                f.close()
+            for path in paths:
+                os.remove(path)
+
+    def merged(self, runs):
+        # One sorted stream of run lines, merging MERGE_FAN_IN runs per pass
+        while len(runs) > MERGE_FAN_IN:
+            self.stats.passes += 1
+            runs = [self._write_merge(runs[i:i + MERGE_FAN_IN]) for i in range(0, len(runs), MERGE_FAN_IN)]
+        self.stats.passes += 1
+        return self._merge_files(runs)
+
+    def _write_merge(self, paths):
+        fd, path = tempfile.mkstemp(suffix=".run", dir=self.temp_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.writelines(self._merge_files(paths))
+        return path
+
+    def players(self, lines):
+        # (player_id, name, wins, losses, best) per player, in ID order
+        id_width, source_width = KEY_WIDTHS[0], KEY_WIDTHS[0] + KEY_WIDTHS[1]
+        for player_id, group in itertools.groupby(lines, key=lambda line: line[:id_width]):
+            player_id = int(player_id)
+            wins = losses = best = 0
+            name = None
+            for source, source_rows in itertools.groupby(group, key=lambda line: line[id_width:source_width]):
+                # Fold one source's rows the way RecordStore loads them
+                record = None
+                source_name = None
+                for line in source_rows:
+                    _, kind, w, l, b, row_name = line.rstrip("\n").split("\t", 5)
+                    self.stats.collapsed += record is not None
+                    if kind == "t":
+                        record = [int(w), int(l), int(b)]
+                    else:
+                        record = record or [0, 0, 0]
+                        record[0] += int(w)
+                        record[1] += int(l)
+                        record[2] = max(record[2], int(b))
+                    if not is_placeholder(player_id, row_name):
+                        source_name = row_name
+                if name is not None and source_name is not None and source_name.lower() != name.lower():
+                    # Two sources, two players with this ID: keep the first, show the other
+                    self._conflict(f"player {player_id} is {name!r} in an earlier source but {source_name!r} "
+                                   f"in {self.sources[int(source)]}; its rows there are left out")
+                    continue
+                name = name or source_name
+                wins += record[0]
+                losses += record[1]
+                best = max(best, record[2])
+            self.stats.players += 1
+            yield player_id, name or f"player {player_id}", wins, losses, best
+
+    def run(self, output):
+        # Returns the Stats; writes output unless this is a check
+        self.temp_dir = tempfile.mkdtemp(prefix="wordchain-records-",
+                                         dir=os.path.dirname(os.path.abspath(output)))
+        try:
+            stream = self.merged(self.sorted_runs())
+            if self.check:
+                for _ in self.players(stream):
+                    pass
+                return self.stats
+            temp_path = output + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                for player_id, name, wins, losses, best in self.players(stream):
+                    f.write(f"{player_id},{name},{wins},{losses},{best}\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, output)
+        finally:
+            for leftover in os.listdir(self.temp_dir):
+                os.remove(os.path.join(self.temp_dir, leftover))
+            os.rmdir(self.temp_dir)
+        # The output's own journals are folded in now; replaying them on top would undo the merge
+        read = {os.path.abspath(path) for path in self.sources}
+        if os.path.abspath(output) in read:
+            for journal in journal_paths(output):
+                os.remove(journal)
+        elif journal_paths(output):
+            print(f"Note: {output} has journals that were not merged; the server will replay them over it.")
+        return self.stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check, repair and merge Word Chain record files")
+    parser.add_argument("records", nargs="+", help="record files, each with its journals; one per server")
+    parser.add_argument("--output", default=RECORDS_FILE, help="merged records file to write (default %(default)s)")
+    parser.add_argument("--players", default=PLAYERS_FILE,
+                        help="players file the output's IDs belong to; players from other sources are added "
+                             "(default %(default)s)")
+    parser.add_argument("--check", action="store_true", help="only validate; nothing is written")
+    parser.add_argument("--memory", type=int, default=MEMORY, metavar="MB",
+                        help="memory for sorting before rows spill to temporary files (default %(default)s MB)")
+    args = parser.parse_args()
+    sources = list(dict.fromkeys(os.path.abspath(path) for path in args.records))
+    missing = [path for path in sources if not os.path.exists(path)]
+    if missing:
+        sys.exit(f"No such file: {', '.join(missing)}")
+    tool = RecordsTool(sources, args.players, args.memory, args.check)
+    stats = tool.run(args.output)
+    stats.report(None if args.check else args.output)
+    if stats.invalid or stats.conflicts:
+        sys.exit(1)
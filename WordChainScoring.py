@@ -0,0 +1,96 @@
+# Word Chain Scoring
+# Points per word by length and rarity, from a table built when the dictionary loads
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: frequency ranks, per-word points array, chain multiplier
+#
+# In scoring mode (WordChainServer.py --scoring) an accepted word is worth
+#   length points  x  rarity  x  chain multiplier
+# where length points are the letters beyond the first two (at least 1),
+# rarity is 1 for the RARITY_TIERS[0] most frequent words, 2 up to the next
+# tier, and so on, and the chain multiplier grows by one every CHAIN_STEP
+# words the game's chain has reached (up to MAX_MULTIPLIER). So "eat" and
+# "tea" are worth 1 point each, while a long rare word late in a game can
+# be worth dozens.
+#
+# Word frequencies come from WordChainFrequencies-<language>.txt (or
+# WordChainFrequencies.txt for English): one word per line, most frequent
+# first, optionally followed by its count ("the 23135851162", the format of
+# common frequency lists). Without a list every word has rarity 1.
+#
+# The length and rarity points of every indexed word are worked out once,
+# when the language's dictionary and word index load, into an array in the
+# word index's order; scoring a move is then one dict lookup for the word's
+# slot (the index's own word table) and one array read. Words the dictionary
+# accepts but the index does not hold are scored on the spot, as the rarest.
+
+from array import array
+import bisect
+import os
+
+FREQUENCY_LIST_PATHS = ("WordChainFrequencies.txt",)
+RARITY_TIERS = (1000, 10000, 50000)     # frequency ranks where rarity steps up: x1, x2, x3, then x4
+CHAIN_STEP = 10                         # chain length per step of the multiplier
+MAX_MULTIPLIER = 4
+
+
+def frequency_list_paths(language):
+    # A list named after the language comes first; the general list is English
+    paths = (f"WordChainFrequencies-{language}.txt",)
+    if language.startswith("en"):
+        paths += FREQUENCY_LIST_PATHS
+    return paths
+
+
+def load_frequency_ranks(paths=FREQUENCY_LIST_PATHS):
+    # word -> rank (0 = most frequent) from the first list found, or None
+    for path in paths:
+        if os.path.exists(path):
+            break
+    else:
+        return None
+    ranks = {}
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            fields = line.split()
+            if fields:
+                ranks.setdefault(fields[0].lower(), len(ranks))
+    return ranks
+
+
+def rarity(rank, ranked=True):
+    # 1 for the most frequent words, up to len(RARITY_TIERS) + 1 for words not in the list
+    if not ranked:
+        return 1
+    if rank is None:
+        return len(RARITY_TIERS) + 1
+    return bisect.bisect_right(RARITY_TIERS, rank) + 1
+
+
+def word_points(word, rank=None, ranked=True):
+    return max(1, len(word) - 2) * rarity(rank, ranked)
+
+
+def chain_multiplier(chain_length):
+    # chain_length: words already in the game's chain
+    return min(MAX_MULTIPLIER, 1 + chain_length // CHAIN_STEP)
+
+
+class ScoreTable:
+    """Length and rarity points of every word in a word index."""
+
+    def __init__(self, word_index, ranks=None):
+        self.slots = word_index.words      # word -> position in sorted_words
+        self.ranked = ranks is not None
+        ranks = ranks or {}
+        self.points = array("H", (min(0xFFFF, word_points(word, ranks.get(word), self.ranked))
+                                  for word in word_index.sorted_words))
+
+    @property
+    def nbytes(self):
+        return self.points.itemsize * len(self.points)
+
+    def score(self, word):
+        slot = self.slots.get(word)
+        if slot is None:
+            return word_points(word, None, self.ranked)
+        return self.points[slot]
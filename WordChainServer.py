@@ -1,5 +1,5 @@
 # Word Chain Game Server
-# Version 1.6 Basic 2-player word chain game
+# Version 1.7 Word chain game for rooms of 2-16 players
 # Author: Alexander, Brandon, Jorie
 # Date: 10/9/2025     - Initial version 1.0
 # Updated: 11/05/2025 - Added countdown timer for player turns
@@ -10,277 +10,974 @@
 #                     - Refactored input with timeout to use threading for better UX
 # UpdatedL 11/30/2025 - Added high scores display after game over
 # Updated: 11/30/2025 - Added ASCII Art throughout the client
+# Updated: 10/19/2026 - Added spectator mode (WordChainSpectators.py)
+#                     - Player writes go through bounded non-blocking buffers (WordChainConnection.py)
+#                     - Rooms of 2-16 players with elimination; placements kept in WordChainPlacements.txt
+#                     - play_game() split out of the room thread so tournaments can run matches
+#                     - Computer opponent for players left waiting alone (WordChainBot.py)
+#                     - Games end as soon as no unused word fits; /hint command
+#                     - Announce the dictionary version for client-side word checks
+#                     - Cluster node mode (--coordinator) with a shared records service (WordChainCluster.py)
+#                     - Zero-downtime restart: --takeover or SIGHUP hands the listening sockets over (WordChainHandoff.py)
+#                     - Heartbeats and reaping of silent connections; lobby drops players who left
+#                     - Word length limit before validation; per-IP connection cap
+#                     - Admin socket: list sessions, queue depth, end games, drain, reload (WordChainAdmin.py)
+#                     - Listens on IPv4, IPv6 and a Unix socket at once (WordChainListeners.py)
+#                     - Rooms per language ("Language de_DE"), dictionaries cached on demand (WordChainDictionaries.py)
+#                     - Connect-time handshake (name or token); records keyed by player ID (WordChainRecords.py)
+#                     - Gameplay analytics from game events, queried on the admin socket (WordChainAnalytics.py)
+#                     - Session tokens: a player who drops mid-game can reconnect and resume within SESSION_GRACE
+#                     - Optional pool of validation worker processes, --validation-workers (WordChainValidation.py)
+#                     - Memory accounting per subsystem; new games are refused over a --memory-budget (WordChainMemory.py)
+#                     - Finished games go to a searchable archive, queried on the admin socket (WordChainArchive.py)
+#                     - Scoring mode (--scoring): points by word length, rarity and chain length (WordChainScoring.py)
+#                     - A name only registers a new player; an existing player needs their token
+#                     - Scoring-mode cluster nodes keep their records apart on the records service
+#                     - One deadline per turn, however many /hint requests the player sends
+#                     - A game thread that fails still closes its session, so a handoff can drain
+#                     - The game archive's memory is accounted and budgeted as a subsystem
 
 from socket import *
 from _thread import *
 import os
+import sys
+import argparse
+import signal
+import subprocess
+import time
+import itertools
+import secrets
+import threading
 import enchant  # Add PyEnchant
+from WordChainConnection import Connection, ConnectionWriter, REAP_AFTER, MAX_CONNECTIONS_PER_IP, LOCAL_PEERS_EXEMPT, \
+    is_local_peer
+from WordChainListeners import ListenerGroup, open_listeners, peer_address, unix_socket_path
+from WordChainMetrics import metrics, metrics_reporter
+from WordChainAnalytics import analytics
+from WordChainArchive import archive
+from WordChainValidation import validator
+from WordChainMemory import memory, parse_budget, sessions_memory, records_memory
+from WordChainSpectators import SpectatorHub, spectator_listener, open_spectator_socket, SPECTATOR_PORT
+from WordChainHandoff import Handoff, take_over, confirm, handoff_path, handoff_supported, DRAIN_DEADLINE
+from WordChainWordIndex import load_word_index, word_list_paths
+from WordChainScoring import ScoreTable, load_frequency_ranks, frequency_list_paths, word_points, chain_multiplier
+from WordChainDictionaries import DictionaryCache, LanguageUnavailable, DEFAULT_LANGUAGE, DICTIONARY_CACHE_BYTES, \
+    is_language_tag
+from WordChainBot import BotConnection
+from WordChainAdmin import SessionTable, admin_listener, admin_path
+from WordChainProfiles import ProfileCache, clean_name
+from WordChainRecords import RecordStore, RECORDS_FILE
 
-def load_dictionary():
-    # Use PyEnchant English dictionary
-    return enchant.Dict("en_US")
-
-
-def store_record(winner : str,loser : str,round_num : int):
-    #Store Game records in WordChainRecords.txt. 
-    file = open("WordChainRecords.txt","a+")
-    file.close()
-    with open("WordChainRecords.txt","r+") as f:
-        document = f.readlines()
-        if len(document) == 0:                              #if file is empty, no need to check for existing users
-            winner_record = f"{winner},1,0,{round_num}\n"   #Create user records
-            loser_record = f"{loser},0,1,{round_num}\n"     
-            document.append(winner_record)                  #append user records to document
-            document.append(loser_record)                   
-            f.writelines(document)                          #rewrite document
-            return 
-        winner_updated = False
-        loser_updated = False
-        new_document = []
-    
-        for line in document: #Stores all lines in f as an array (uses endline characters as separators)
-            split_line = line.split(',')
-            if split_line[0].lower() == winner.lower() and not winner_updated:
-                if int(split_line[3]) < round_num:                      #if the player gets a new high score  
-                    #update the high score
-                    split_line[3] = str(round_num) + '\n'
-                split_line[1] = str(int(split_line[1]) + 1)           
-                line = []
-                for entry in split_line:        # update the win counter
-                    line += entry + ','
-                line = ''.join(line).strip(',')
-                winner_updated = True
-                
-            if split_line[0].lower() == loser.lower() and not loser_updated: #same as above but for the losing player
-                if int(split_line[3]) < round_num:
-                    split_line[3] = str(round_num) + '\n'
-                split_line[2] = str(int(split_line[2]) + 1)
-                line = []
-                for entry in split_line:
-                    line += entry + ','
-                line = ''.join(line).strip(',')
-                loser_updated = True
-            new_document.append(line)
-                
-        #If there is no matching record 
-        if not winner_updated:
-            new_document.append(f"{winner},1,0,{round_num}\n")
-        if not loser_updated:
-            new_document.append(f"{loser},0,1,{round_num}\n")
-    #write edited file to document
-    with open("WordChainRecords.txt","w+") as f:
-        f.writelines(new_document)
-
-def get_top_5():
-    with open("WordChainRecords.txt") as f:
-        document = f.readlines()
-        # Sorts document by # of rounds
-        sorted_document = sorted(document, key=lambda x: int(x.split(',')[3]),reverse=True)
-        output = 'High Scores: \n'
-        for i,entry in enumerate(sorted_document[:5]):
-            output += f'{i+1}. {entry.split(',')[0]} \t Score:{entry.split(',')[3]}'
-        return output
-
-
-def word_chain_thread(player1, player2, dictionary):
-    print("Starting Word Chain game thread")
-    player1.settimeout(15)
-    player2.settimeout(15)
-
-    play_again = True
-    round_num = 0  # Initialize round counter for games
-    while play_again:  # Outer loop for multiple games
-        # Reset game state for each new game
-        used_words = []
-        current_player = player1
-        other_player = player2
-        current_is_p1 = True  # Track which player is current
-        last_letter = None
-        cp_message = ""
-        op_message = ""
-        turn_num = 0  # Initialize turn counter for this game
+SERVER_PORT = 12005
+ROOM_SIZE = 2           # players per room, set with the first command-line argument
+ROOM_MAX_PLAYERS = 16
+LOBBY_WAIT = 30         # seconds a partly filled room waits for more players once two are in
+BOT_WAIT = 20           # seconds a lone player waits before a computer opponent joins
+BOT_DIFFICULTY = "hard" # "easy" or "hard"
+HINTS_PER_GAME = 1      # /hint requests each player may make per game
+LOBBY_POLL = 1          # seconds between checks for lobby players who have left
+MAX_WORD_LENGTH = 45    # longest word accepted for a dictionary lookup
+HANDSHAKE_WAIT = 0.5    # seconds a new player has to send the handshake before playing as a guest
+TURN_TIMEOUT = 15       # seconds a player has to enter a word
+SESSION_GRACE = 30      # seconds a player who drops out of a game has to reconnect and resume it
+SCORES_FILE = "WordChainScores.txt"  # records of scoring-mode games, kept apart from words-played records
+
+records_lock = threading.Lock()
+records_service = None  # RecordsClient when this server is a cluster node
+profiles = None         # ProfileCache, see local_records()
+record_stores = {}      # RecordStore per records file, see local_records()
+scoring = False         # scoring mode, set by server_main()
+sessions = SessionTable()   # what the admin socket reports on
+resumable = {}              # session token -> Connection of a player in a running game
+
+def load_dictionary(language=DEFAULT_LANGUAGE):
+    # Use a PyEnchant dictionary, US English unless another language is asked for
+    return enchant.Dict(language)
+
+def load_language(language):
+    # Dictionary and word index for a room language (see DictionaryCache)
+    if not enchant.dict_exists(language):
+        raise LanguageUnavailable(f"No {language} dictionary is installed")
+    dictionary = load_dictionary(language)
+    word_index = load_word_index(dictionary, word_list_paths(language))
+    if scoring and word_index is not None:
+        # Every word's points are worked out here, so scoring a move is a lookup
+        word_index.scores = ScoreTable(word_index, load_frequency_ranks(frequency_list_paths(language)))
+        if not word_index.scores.ranked:
+            print(f"No word frequency list for {language}; words score by length only.")
+    return dictionary, word_index
+
+def handshake(player, data=None):
+    # The lines a client sends straight after connecting, all optional:
+    #   Name <name> or Token <token>   who the player is (see WordChainProfiles.py)
+    #   Language <tag>                  the room language
+    #   Resume <session token>          back into a running game after a dropped connection
+    # Sets player.profile (None for a guest) and player.language. `data` is
+    # the handshake when the caller has already read it; otherwise it is
+    # polled for. Returns False while the player still has time to send it.
+    # A name registers a new player, whose token is sent back; a name that
+    # is already registered makes the player a guest, since only the token
+    # proves who they are.
+    if hasattr(player, "profile"):
+        return True
+    if data is None:
+        data = player.poll()
+        if data is None and time.monotonic() - player.connected_at < HANDSHAKE_WAIT:
+            return False
+    profile = None
+    new = False
+    language = DEFAULT_LANGUAGE
+    for line in (data or b"").decode(errors="replace").splitlines():
+        key, _, value = line.strip().partition(" ")
+        if key == "Resume":
+            resume(player, value.strip())
+            break
+        if key == "Name":
+            profile = claim_name(player, value)
+            new = profile is not None
+        elif key == "Token":
+            profile = login(value.strip())
+            if profile is None:
+                player.send("Unknown token; you are playing as a guest.\n")
+        elif key == "Language" and value != language:
+            if is_language_tag(value) and enchant.dict_exists(value):
+                language = value
+            else:
+                player.send(f"Language {value[:16]} is not available; you will play in {language}.\n")
+    if profile is not None:
+        player.send(f"Hello {profile.name}, you are player {profile.player_id}.\n"
+                    + (f"Token {profile.token}\n" if new else ""))
+    player.profile = profile
+    player.language = language
+    # Passed on with the socket if the server hands over: the new process
+    # logs the player in by token, since the name is registered by now
+    player.handshake_data = ((f"Token {profile.token}\n" if profile is not None else "")
+                             + f"Language {language}\n").encode()
+    return True
+
+def claim_name(player, name):
+    # A new profile for a name nobody has registered, or None (a guest)
+    profile = register(name)
+    if profile is None and clean_name(name or "") is not None:
+        player.send(f"The name {clean_name(name)} is already registered; connect with its token to play as "
+                    "that player. You are playing as a guest.\n")
+    return profile
+
+def lobby_language(player):
+    # Groups the lobby by language once a player's handshake is in
+    return player.language if handshake(player) and not player.closed else None
+
+def resume(player, token):
+    # Move a reconnected player's socket into the connection their game is
+    # still using, then tell them where the game stands
+    suspended = resumable.get(token)
+    if suspended is None or not suspended.reattach(player):
+        metrics.inc("resumes_refused")
+        player.send("Session expired; that game can no longer be resumed.\n")
+        player.finish()
+        return
+    metrics.inc("sessions_resumed")
+    print(f"Player {suspended.seat} of game {suspended.game_id} resumed from {player.addr}.")
+    suspended.send(resync(suspended))
+
+def resync(player):
+    # Compact game state for a player who resumed: seat, round, turn, the
+    # words used so far and what the game is waiting for
+    session = sessions.sessions.get(player.game_id)
+    if session is None:
+        return "Resumed.\n"
+    text = (f"Resumed game {session.game_id}: you are Player {player.seat} of {len(session.peers)}.\n"
+            f"Round {session.round}\nTurn {session.turn}\n")
+    words = list(session.words)     # appended to by the game thread
+    if words:
+        text += "Used words: " + " ".join(words) + "\n"
+        text += f"Last word: '{words[-1]}'. The next word must start with '{words[-1][-1]}'.\n"
+    left = max(0, round(TURN_TIMEOUT - (time.monotonic() - session.phase_since)))
+    if session.state == "playing" and session.current == player.seat:
+        text += f"{left}s left on your turn.\nYour turn.\n"
+    elif session.state == "playing" and session.current is not None:
+        text += f"Waiting for Player {session.current} ({left}s left).\n"
+    elif session.state == "rematch":
+        text += "Rematch?\n"
+    elif session.state == "names" and getattr(player, "profile", None) is None:
+        text += "Please enter your name for the record: "
+    return text
+
+
+def local_records(scores=None):
+    # This process's profile cache and the record store for words-played games,
+    # or for scoring-mode games when `scores` (default: this server's own mode);
+    # loaded on first use. A records service keeps both for its nodes.
+    global profiles
+    path = SCORES_FILE if (scoring if scores is None else scores) else RECORDS_FILE
+    with records_lock:
+        if profiles is None:
+            profiles = ProfileCache()
+        if path not in record_stores:
+            record_stores[path] = RecordStore(profiles, path)
+    return profiles, record_stores[path]
+
+def store_record(placements, scores=None):
+    #Store a game's results, keyed by player ID (see WordChainRecords.py).
+    #placements is a list of (player_id, score) from first place to last; first place gets the win,
+    #everyone else gets a loss, and each player's best score is kept. Guests (player_id None) are skipped.
+    #scores: whether these are scoring-mode points (default: this server's mode).
+    _, store = local_records(scores)
+    store.record([(player_id, place == 0, score) for place, (player_id, score) in enumerate(placements)
+                  if player_id is not None])
+
+    #Keep the full finishing order of every game in WordChainPlacements.txt
+    with records_lock:
+        with open("WordChainPlacements.txt","a") as f:
+            finished = time.strftime("%Y-%m-%d %H:%M:%S")
+            f.write(f"{finished}," + ",".join(f"{player_id or 'guest'}:{score}" for player_id, score in placements) + "\n")
+
+def get_top_5(scores=None):
+    profiles, store = local_records(scores)
+    output = 'High Scores: \n'
+    for i, (player_id, best) in enumerate(store.top(5)):
+        output += f'{i+1}. {profiles.name_of(player_id)} \t Score:{best}\n'
+    return output
+
+def login(token):
+    # The profile a token was issued to, or None; cluster nodes share the records service's player IDs
+    if records_service is not None:
+        return records_service.login(token)
+    return local_records()[0].login(token=token)
+
+def register(name):
+    # A new profile for a name nobody has yet; None if it is taken
+    if records_service is not None:
+        return records_service.register(name)
+    return local_records()[0].register(name)
+
+def bot_profile(difficulty):
+    # The computer player's profile, registered on first use. Its token is
+    # never used, and the records service does not send it.
+    if records_service is not None:
+        return records_service.bot_profile(difficulty)
+    return local_records()[0].login(name=f"computer ({difficulty})")
+
+def save_record(placements):
+    # Cluster nodes keep one shared set of records through the records service
+    if records_service is not None:
+        records_service.store_record(placements, scoring)
+    else:
+        store_record(placements)
+
+def high_scores():
+    if records_service is not None:
+        return records_service.get_top_5(scoring)
+    return get_top_5()
+
+
+class TurnRing:
+    """Circular turn order of the players still in the game.
+
+    Seats form a doubly linked ring, so advancing the turn and eliminating
+    a player are both O(1) regardless of the room size.
+    """
+
+    class Seat:
+        __slots__ = ("player", "number", "prev", "next")
+
+        def __init__(self, player, number):
+            self.player = player
+            self.number = number
 
-        # Start the game
-        player1.send("Welcome to Word Chain! You are Player 1.\n".encode())
-        player2.send("Welcome to Word Chain! You are Player 2.\n".encode())
-        player1.send("Game starts! Please enter the first word:\n".encode())
-        player2.send("Waiting for Player 1 to start...\n".encode())
+    def __init__(self, players):
+        seats = [TurnRing.Seat(player, number) for number, player in enumerate(players, 1)]
+        for i, seat in enumerate(seats):
+            seat.prev = seats[i - 1]
+            seat.next = seats[(i + 1) % len(seats)]
+        self.current = seats[0]
+        self.size = len(seats)
 
-        round_num += 1  # Increment round number for each new game
-        player1.send(f"Round {round_num}\n".encode())
-        player2.send(f"Round {round_num}\n".encode())
+    def __len__(self):
+        return self.size
 
-        # Inner game loop (existing logic)
+    def advance(self):
+        self.current = self.current.next
+
+    def remove(self, seat):
+        # Unlink a seat; if it was the current seat the turn passes to the next player
+        seat.prev.next = seat.next
+        seat.next.prev = seat.prev
+        if self.current is seat:
+            self.current = seat.next
+        self.size -= 1
+
+
+def broadcast(players, text, skip=None):
+    # Encode once and queue the same bytes for every player in the room
+    data = text.encode()
+    for player in players:
+        if player is not skip:
+            player.send(data)
+
+
+def collect_responses(players, timeout_seconds):
+    # Wait for one message from each player at the same time rather than one after another.
+    # Returns {player: text}, with None for players who did not answer in time
+    # and "" for players who disconnected.
+    responses = {}
+    ready = threading.Event()   # set whenever any of the players receives data
+    for player in players:
+        player.add_waiter(ready)
+    deadline = time.monotonic() + timeout_seconds
+    try:
         while True:
-            current_player.send("Your turn.\n".encode())
+            ready.clear()
+            for player in players:
+                if player not in responses:
+                    data = player.poll(1024)
+                    if data is not None:
+                        responses[player] = data.decode(errors="replace").strip()
+            remaining = deadline - time.monotonic()
+            if len(responses) == len(players) or remaining <= 0:
+                break
+            ready.wait(remaining)
+    finally:
+        for player in players:
+            player.remove_waiter(ready)
+    for player in players:
+        responses.setdefault(player, None)
+    return responses
+
+
+def play_game(players, dictionary, game_id, spectators, round_num, word_index=None):
+    # Play one game in a room until a single player is left.
+    # Returns the players in finishing order and how many words each played,
+    # or in scoring mode how many points each scored.
+    # With a word index the game also tracks how many unused words start with
+    # each letter, which serves /hint requests and, when the index holds every
+    # word the dictionary accepts, ends the game as soon as nobody can answer.
+    count = len(players)
+    seat_of = {player: number for number, player in enumerate(players, 1)}
+    used_words = set()
+    ring = TurnRing(players)
+    eliminated = []  # Players in the order they were knocked out
+    words_played = dict.fromkeys(players, 0)
+    points = dict.fromkeys(players, 0)
+    scores = word_index.scores if word_index is not None else None
+    pool = word_index.new_pool() if word_index is not None else None
+    hints_left = dict.fromkeys(players, HINTS_PER_GAME)
+    last_letter = None
+    last_word = None
+    played = []  # Words in the order they were played, for players who resume
+    op_message = ""
+    turn_num = 0  # Initialize turn counter for this game
+
+    # Start the game
+    for player in players:
+        player.send(f"Welcome to Word Chain! You are Player {seat_of[player]} of {count}.\n")
+    if word_index is not None:
+        # Clients with a local word list only trust it when the versions match
+        broadcast(players, f"Dictionary version {word_index.version}\n")
+    if scoring:
+        broadcast(players, "Scoring game: longer and rarer words score more, and long chains multiply points.\n")
+    if pool is not None and HINTS_PER_GAME:
+        broadcast(players, f"Type /hint on your turn for a suggestion ({HINTS_PER_GAME} per game).\n")
+    players[0].send("Game starts! Please enter the first word:\n")
+    broadcast(players, "Waiting for Player 1 to start...\n", skip=players[0])
+
+    broadcast(players, f"Round {round_num}\n")
+    sessions.update(game_id, state="playing", round=round_num, turn=0, last_word=None, words=played)
+    spectators.describe_game(game_id, f"{count} players, round {round_num}")
+    spectators.publish(game_id, f"Round {round_num} starts with {count} players. Player 1 goes first.\n")
+
+    # Inner game loop: runs until one player is left
+    while len(ring) > 1:
+        seat = ring.current
+        current_player = seat.player
+        cp_message = ""
+        received = None
+        sessions.update(game_id, current=seat.number, turn=turn_num, last_word=last_word)
+        if pool is not None and last_letter and pool.dead_end(last_letter):
+            # Dead end: no unused word starts with last_letter, so nobody can answer
+            word = ""
+            cp_message = f"No unused words start with '{last_letter}'. You are stuck! "
+            op_message = f"Player {seat.number} is stuck: no unused words start with '{last_letter}'. "
+            reason = "stuck"
+            metrics.inc("dead_ends")
+        else:
+            current_player.send("Your turn.\n")
             try:
-                data = current_player.recv(1024)
+                data = read_move(current_player, pool, last_letter, hints_left)
+                received = time.perf_counter()
                 if not data:
                     # Socket closed by client
-                    play_again = False
-                    print("A player disconnected during the game.")
-                    break
-                word = data.decode().strip().lower()
-                # If the client sent an empty string (pressed enter with no word),
-                # treat as an invalid move rather than a socket close to avoid
-                # downstream errors in word validation.
-                if word == "":
-                    cp_message = "No word entered. "
-                    op_message = "Opponent failed to enter a word. "
-                    break
+                    print(f"Player {seat.number} disconnected during the game.")
+                    word = ""
+                    cp_message = "Disconnected. "
+                    op_message = f"Player {seat.number} disconnected. "
+                    reason = "disconnected"
+                elif len(data.strip()) > MAX_WORD_LENGTH:
+                    # Checked on the raw bytes, so junk is never decoded or looked up
+                    word = ""
+                    cp_message = f"Words can be at most {MAX_WORD_LENGTH} letters. "
+                    op_message = f"Player {seat.number} entered an overlong word. "
+                    reason = "overlong"
+                    metrics.inc("overlong_words")
+                else:
+                    word = data.decode(errors="replace").strip().lower()
+                    # If the client sent an empty string (pressed enter with no word),
+                    # treat as an invalid move rather than a socket close to avoid
+                    # downstream errors in word validation.
+                    if word == "":
+                        cp_message = "No word entered. "
+                        op_message = f"Player {seat.number} failed to enter a word. "
+                        reason = "empty"
             except timeout:
                 word = "timerexpired"
-            
-            if word == "timerexpired":
-                cp_message = "Time expired! "
-                op_message = "Opponent's time expired! "
-                break
-            # Check if word is valid using PyEnchant
-            if not dictionary.check(word):
-                cp_message = f"{word} is an Invalid word. "
-                op_message = f"Opponent used invalid word '{word}'. "
-                break
-            if word in used_words:
-                cp_message = f"{word} already used. "
-                op_message = f"Opponent tried to use '{word}' which has already been used. "
-                break
-            if last_letter and word[0] != last_letter:
-                cp_message = f"Word must start with '{last_letter}'. "
-                op_message = f"Opponent tried to use '{word}' which does not start with '{last_letter}'. "
-                break
 
-            # Word is valid
-            used_words.append(word)
-            last_letter = word[-1]
-            current_player.send(f"Accepted!\n".encode())
-            other_player.send(f"Player used '{word}'.\n".encode())
-
-            #INSERT ROUND COUNTER HERE
-            turn_num += 1
-            player1.send(f"Turn {turn_num}\n".encode())
-            player2.send(f"Turn {turn_num}\n".encode())
-
-            # Swap players
-            current_player, other_player = other_player, current_player
-            current_is_p1 = not current_is_p1
-
-        # Game over - determine winner
-        cp_message += "\nGame over! You lost.\n"
-        op_message += "\nGame over! You won!\n"
-        # Send messages relative to current/other (current_player lost in this design)
-        try:
-            current_player.send(cp_message.encode())
-        except Exception:
-            pass
-        try:
-            other_player.send(op_message.encode())
-        except Exception:
+        if cp_message:
             pass
-        print(f"Game over. Current message: {cp_message.strip()} | Other message: {op_message.strip()}")
+        elif word == "timerexpired":
+            cp_message = "Time expired! "
+            op_message = f"Player {seat.number}'s time expired! "
+            reason = "timeout"
+        # Check if word is valid using PyEnchant (in a validation worker when there is a pool)
+        elif not validator.check(dictionary, word):
+            cp_message = f"{word} is an Invalid word. "
+            op_message = f"Player {seat.number} used invalid word '{word}'. "
+            reason = "invalid"
+        elif word in used_words:
+            cp_message = f"{word} already used. "
+            op_message = f"Player {seat.number} tried to use '{word}' which has already been used. "
+            reason = "used"
+        elif last_letter and word[0] != last_letter:
+            cp_message = f"Word must start with '{last_letter}'. "
+            op_message = f"Player {seat.number} tried to use '{word}' which does not start with '{last_letter}'. "
+            reason = "wrong_letter"
 
-        # Rematch prompt
-        current_player.send("Rematch?\n".encode())
-        other_player.send("Rematch?\n".encode())
-        print("Sent rematch prompts to both players")
+        if cp_message:
+            # Current player is eliminated; the turn passes to the next player in the ring
+            ring.remove(seat)
+            eliminated.append(current_player)
+            current_player.send(f"{cp_message}You finished {len(ring) + 1} of {count}.\nGame over! You lost.\n")
+            if len(ring) > 1:
+                broadcast(players, f"{op_message}Player {seat.number} is out! {len(ring)} players remain.\n",
+                          skip=current_player)
+            spectators.publish(game_id, f"{op_message}Player {seat.number} is out after {turn_num} turns.\n")
+            analytics.elimination(reason, last_letter)
+            continue
 
-        # Receive rematch responses from the current and other player (in that order)
-        try:
-            response1 = current_player.recv(1024).decode().strip().lower()
-            if not response1:
-                play_again = False
-                print(f"Current player disconnected during rematch prompt")
+        # Word is valid
+        if received is not None:
+            # Server-side time to handle a word, reported to a cluster coordinator
+            metrics.observe("turn_latency_ms", (time.perf_counter() - received) * 1000)
+        used_words.add(word)
+        played.append(word)
+        if pool is not None:
+            pool.mark_used(word)
+        last_letter = word[-1]
+        last_word = word
+        words_played[current_player] += 1
+        own_points = other_points = ""
+        if scoring:
+            multiplier = chain_multiplier(turn_num)
+            gained = (scores.score(word) if scores is not None else word_points(word, ranked=False)) * multiplier
+            points[current_player] += gained
+            chain = f" x{multiplier} chain" if multiplier > 1 else ""
+            own_points = f"+{gained} points{chain}, {points[current_player]} in total.\n"
+            other_points = f"Player {seat.number} scored {gained} ({points[current_player]} in total).\n"
+        turn_num += 1
+        current_player.send(f"Accepted!\n{own_points}Turn {turn_num}\n")
+        broadcast(players, f"Player {seat.number} used '{word}'.\n{other_points}Turn {turn_num}\n", skip=current_player)
+        spectators.publish(game_id, f"Player {seat.number} played '{word}'"
+                                    + (f" for {gained} points.\n" if scoring else ".\n"))
+        analytics.word(word)
+        ring.advance()
+
+    # Game over - the last player standing wins
+    winner = ring.current.player
+    winner.send(f"{op_message}\nGame over! You won!\n")
+    placements = [winner] + eliminated[::-1]
+    print(f"Game over after {turn_num} turns. Finishing order: "
+          + ", ".join(f"Player {seat_of[player]}" for player in placements))
+    spectators.publish(game_id, f"Game over after {turn_num} turns: "
+                                f"Player {seat_of[winner]} wins round {round_num}!\n")
+    analytics.game_over(turn_num, last_letter)
+    if scoring:
+        broadcast(players, "Points: " + ", ".join(f"Player {seat_of[player]} {points[player]}" for player in players)
+                  + "\n")
+    archive.add(getattr(dictionary, "tag", None) or DEFAULT_LANGUAGE,
+                [(seat_of[player], *player_identity(player)) for player in players],
+                [seat_of[player] for player in placements], played)
+    return placements, points if scoring else words_played
+
+def player_identity(player):
+    # (player ID, name) for the archive; guests have no ID until they give a name at the end
+    profile = getattr(player, "profile", None)
+    return (profile.player_id, profile.name) if profile is not None else (None, "guest")
+
+
+def read_move(player, pool, last_letter, hints_left):
+    # The player's move, answering any /hint requests first. The turn has one
+    # deadline (the player's timeout from when it started), however many
+    # hints are asked for; raises timeout once it has passed.
+    limit = player.gettimeout()
+    deadline = time.monotonic() + limit if limit is not None else None
+    try:
+        data = player.recv(1024)
+        while data and data.decode(errors="replace").strip().lower() == "/hint":
+            player.send(give_hint(pool, last_letter, hints_left, player) + "Your turn.\n")
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise timeout("timed out")
+                player.settimeout(remaining)
+            data = player.recv(1024)
+        return data
+    finally:
+        player.settimeout(limit)
+
+
+def give_hint(pool, last_letter, hints_left, player):
+    # Suggest an unused word that starts with last_letter, limited per player per game
+    if pool is None:
+        return "Hints are not available on this server.\n"
+    if hints_left[player] <= 0:
+        return "No hints left this game.\n"
+    word = pool.hint(last_letter)
+    if word is None:
+        return "No hint available.\n"
+    hints_left[player] -= 1
+    metrics.inc("hints_given")
+    return f"Hint: try '{word}'.\n"
+
+
+def word_chain_thread(players, dictionary, game_id, spectators, word_index=None):
+    print(f"Starting Word Chain game thread (game {game_id}, {len(players)} players)")
+    metrics.inc("games_started")
+    count = len(players)
+    seat_of = {player: number for number, player in enumerate(players, 1)}
+    try:
+        spectators.open_game(game_id, f"{count} players, waiting to start")
+        sessions.open(game_id, players)
+        for player in players:
+            player.settimeout(TURN_TIMEOUT)
+            if isinstance(player, Connection):
+                # A player whose connection drops is held for SESSION_GRACE
+                # seconds and can reconnect with "Resume <token>"
+                player.game_id = game_id
+                player.seat = seat_of[player]
+                player.session_token = secrets.token_hex(16)
+                resumable[player.session_token] = player
+                player.grace = SESSION_GRACE
+                player.send(f"Session {player.session_token}\n")
+
+        play_again = True
+        round_num = 0  # Initialize round counter for games
+        while play_again:  # Outer loop for multiple games
+            round_num += 1  # Increment round number for each new game
+            placements, words_played = play_game(players, dictionary, game_id, spectators, round_num, word_index)
+            if sessions.was_ended(game_id):
+                print(f"Game {game_id} was ended by an administrator; no record is kept.")
                 break
-            print(f"Current player rematch response: {response1}")
-        except timeout:
-            response1 = "no"
-            print("Current player timeout on rematch prompt")
-        except Exception as e:
-            play_again = False
-            print(f"Error receiving from current player: {e}")
-            break
 
-        try:
-            response2 = other_player.recv(1024).decode().strip().lower()
-            if not response2:
+            # Rematch prompt, answered by everyone still connected
+            connected = [player for player in players if not player.closed]
+            sessions.update(game_id, state="rematch", current=None)
+            broadcast(connected, "Rematch?\n")
+            print("Sent rematch prompts to all players")
+            responses = collect_responses(connected, 15)
+            for player in connected:
+                print(f"Player {seat_of[player]} rematch response: {responses[player]}")
+
+            # Decide whether to play again
+            if len(connected) == count and all((responses[player] or "").lower() == "yes" for player in connected):
+                print("All players agreed to rematch!")
+                spectators.publish(game_id, "Rematch! A new round is starting.\n")
+                broadcast(players, "Starting new game...\n")
+                # Loop continues, resetting game state
+            else:
                 play_again = False
-                print(f"Other player disconnected during rematch prompt")
-                break
-            print(f"Other player rematch response: {response2}")
+                print("Rematch declined.")
+
+            # If rematch was declined or players disconnected, store the record.
+            # Players who skipped the handshake are asked for a name now; guests
+            # who do not give one keep their place but get no record.
+            if not play_again:
+                guests = [player for player in players if not player.closed and getattr(player, "profile", None) is None]
+                if guests:
+                    sessions.update(game_id, state="names")
+                    broadcast(guests, "Please enter your name for the record: ")
+                    for player, name in collect_responses(guests, 15).items():
+                        player.profile = claim_name(player, name) if name else None
+                        if player.profile is not None:
+                            player.send(f"Hello {player.profile.name}, you are player {player.profile.player_id}.\n"
+                                        f"Token {player.profile.token}\n")
+                records = []
+                for player in placements:
+                    profile = getattr(player, "profile", None)
+                    records.append((profile.player_id if profile is not None else None, words_played[player]))
+
+                # Store the game record
+                save_record(records)
+
+                # Now send goodbye messages
+                broadcast(players, "Thanks for playing!\n" + high_scores())
+    finally:
+        # Close connections once any queued goodbye text has been written,
+        # also when the game thread fails, so no session outlives its game
+        spectators.close_game(game_id)
+        for player in players:
+            if isinstance(player, Connection):
+                resumable.pop(getattr(player, "session_token", None), None)
+                player.grace = 0
+            player.close_when_flushed()
+        sessions.close(game_id)
+        metrics.inc("games_finished")
+    print("Game ended... Connections closed")
+
+def fill_lobby(serverSocket, room_size, admit, bots_available, lobby=None, stop=None, language_of=None):
+    # Fill one room; once two players are in, the room starts after LOBBY_WAIT
+    # seconds even if it is not full. Returns the room's players and whether
+    # a lone player waited BOT_WAIT seconds and should get a computer
+    # opponent. `lobby` holds players already waiting; players who get a
+    # room are taken out of it and the rest stay. With `stop` the accept
+    # loop returns no room once it is set. Players whose connection has
+    # closed are dropped from the lobby while it waits. admit(sock, addr)
+    # wraps a new socket, or returns None to refuse it. With language_of,
+    # only players of the same language share a room; language_of(player)
+    # returns None while a player's language is not known yet.
+    def deadline_for(count):
+        if count == 1 and bots_available:
+            return time.monotonic() + BOT_WAIT
+        if count >= 2:
+            return time.monotonic() + LOBBY_WAIT
+        return None
+
+    lobby = lobby if lobby is not None else []
+    counts = {}         # language -> players waiting at the last check
+    deadlines = {}      # language -> when its partly filled room starts
+    while True:
+        if stop is not None and stop.is_set():
+            return [], False
+        gone = [player for player in lobby if getattr(player, "closed", False)]
+        if gone:
+            lobby[:] = [player for player in lobby if player not in gone]
+            left = sum(1 for player in gone if not getattr(player, "released", False))   # not back in their game
+            if left:
+                metrics.inc("lobby_players_reaped", left)
+                print(f"{left} waiting player(s) left the lobby.")
+        sessions.waiting = len(lobby)
+
+        # Group the lobby by language, oldest group first
+        groups = {}
+        undecided = False
+        for player in lobby:
+            language = language_of(player) if language_of is not None else ""
+            if language is None:
+                undecided = True
+            else:
+                groups.setdefault(language, []).append(player)
+        for language in list(counts):
+            if language not in groups:
+                del counts[language], deadlines[language]
+        now = time.monotonic()
+        room = None
+        for language, group in groups.items():
+            count, before = len(group), counts.get(language, 0)
+            if before == 0 or before < count <= 2 or count < min(before, 2):
+                deadlines[language] = deadline_for(count)
+            counts[language] = count
+            if room is None and (count >= room_size or deadlines[language] is not None and now >= deadlines[language]):
+                room = group[:room_size]
+        if room is not None:
+            lobby[:] = [player for player in lobby if player not in room]
+            sessions.waiting = len(lobby)
+            return room, len(room) == 1
+
+        wait = LOBBY_POLL
+        for deadline in deadlines.values():
+            if deadline is not None:
+                wait = min(wait, max(0.01, deadline - now))
+        if undecided:
+            wait = min(wait, HANDSHAKE_WAIT / 10)
+        serverSocket.settimeout(wait)
+        try:
+            sock, addr = serverSocket.accept()
         except timeout:
-            response2 = "no"
-            print("Other player timeout on rematch prompt")
-        except Exception as e:
-            play_again = False
-            print(f"Error receiving from other player: {e}")
-            break
+            continue
+        player = admit(sock, addr)
+        if player is None:
+            continue    # refused
+        lobby.append(player)
+        print(f"Player {len(lobby)} connected.")
 
-        # Decide whether to play again
-        if response1 == "yes" and response2 == "yes":
-            print("Both players agreed to rematch!")
-            try:
-                current_player.send("Starting new game...\n".encode())
-            except Exception:
-                pass
-            try:
-                other_player.send("Starting new game...\n".encode())
-            except Exception:
-                pass
-            # Loop continues, resetting game state
-        else:
-            play_again = False
-            print(f"Rematch declined. current: {response1}, other: {response2}")
+def active_games():
+    values = metrics.snapshot()
+    return values.get("games_started", 0) - values.get("games_finished", 0)
 
-        # If rematch was declined or players disconnected, collect names and store record
-        if not play_again:
-            try:
-                current_player.send("Please enter your name for the record: ".encode())
-                loser_name = current_player.recv(1024).decode().strip().lower()
-            except Exception:
-                loser_name = "Unknown"
+def drain(deadline=DRAIN_DEADLINE):
+    # After a handoff: let the games in this process finish, up to `deadline` seconds
+    end = time.monotonic() + deadline
+    while active_games() > 0 and time.monotonic() < end:
+        time.sleep(1)
+    print(f"Drained; exiting with {active_games()} game(s) still running.")
 
-            try:
-                other_player.send("Please enter your name for the record: ".encode())
-                winner_name = other_player.recv(1024).decode().strip().lower()
-            except Exception:
-                winner_name = "Unknown"
+def server_main(room_size=ROOM_SIZE, port=SERVER_PORT, spectator_port=SPECTATOR_PORT, coordinator=None, records=None,
+                takeover=False, reap_after=REAP_AFTER, ipv6=True, unix_path=None,
+                dictionary_cache=DICTIONARY_CACHE_BYTES, validation_workers=0, memory_budgets=None, trace_memory=False,
+                scoring_mode=False):
+    global records_service, scoring
+    scoring = scoring_mode
+    validator.start(validation_workers)
+    # Other languages load when a room first asks for them
+    dictionaries = DictionaryCache(load_language, dictionary_cache)
+    word_index = dictionaries.get(DEFAULT_LANGUAGE).word_index
+    if word_index is None:
+        print("No word list found; computer opponents are disabled.")
+    else:
+        print(f"Word index ready: {len(word_index)} words. Computer opponents are available.")
+    writer = ConnectionWriter(reap_after)
 
-            # Store the game record
-            store_record(winner_name, loser_name, turn_num // 2)
+    # Listening sockets: inherited from the running server on --takeover, so
+    # that a restart never refuses a connection; otherwise opened here. Every
+    # game listener (IPv4, IPv6, Unix socket) feeds the same lobby.
+    waiting = []
+    channel = None
+    if takeover:
+        channel, listeners, waiting = take_over(handoff_path(port))
+        serverSocket, spectatorSocket = ListenerGroup(listeners[:-1]), listeners[-1]
+        waiting = [Connection(sock, writer, peer_address(sock), pending=pending) for sock, pending in waiting]
+        print(f"Took over the listening sockets ({len(waiting)} player(s) waiting).")
+    else:
+        serverSocket = open_listeners(port, ipv6, unix_path, ROOM_MAX_PLAYERS)
+        spectatorSocket = open_spectator_socket(spectator_port)
+    print(f"Word Chain server is ready! Listening on {serverSocket.describe()}")
 
-            # Now send goodbye messages
-            goodbyeMessage = "Thanks for playing!\n" + get_top_5()
-            try:
-                current_player.send(goodbyeMessage.encode())
-            except Exception:
-                pass
-            try:
-                other_player.send(goodbyeMessage.encode())
-            except Exception:
-                pass
+    # Set to stop accepting players: by a replacement process asking for the
+    # sockets, or by a drain command on the admin socket
+    stop = threading.Event()
+    handoff = Handoff(handoff_path(port), stop) if handoff_supported() else None
+    if handoff is not None:
+        handoff.listen()
+        if hasattr(signal, "SIGHUP"):
+            # kill -HUP <pid>: start a replacement, which takes over from this process
+            restart = [sys.executable] + [arg for arg in sys.argv if arg != "--takeover"] + ["--takeover"]
+            signal.signal(signal.SIGHUP, lambda signum, frame: subprocess.Popen(restart))
+    if channel is not None:
+        confirm(channel)
 
-    # Close connections
-    try:
-        player1.close()
-        player2.close()
-        print("Game ended... Connections closed")
-    except Exception:
-        pass
+    spectators = SpectatorHub(writer)
+    start_new_thread(spectator_listener, (spectators, spectator_port, spectatorSocket, stop))
+    start_new_thread(metrics_reporter, ())
+    analytics.start()
+    archive.start()
+    memory.estimate("dictionary", lambda: dictionaries.size)
+    memory.estimate("sessions", lambda: sessions_memory(sessions))
+    memory.estimate("records", lambda: records_memory(profiles, list(record_stores.values())))
+    memory.estimate("caches", analytics.memory_used)
+    memory.estimate("archive", archive.memory_used)
+    memory.watch_connections(writer)
+    memory.start(memory_budgets, trace_memory)
+    game_ids = itertools.count(1)
+
+    def end_game(args):
+        if len(args) != 1 or not args[0].isdigit():
+            return "Usage: end <game id>\n"
+        if not sessions.end(int(args[0])):
+            return f"No game {args[0]} is running.\n"
+        return f"Game {args[0]} ended.\n"
+
+    def drain_server(args):
+        sessions.draining = True
+        stop.set()
+        return f"Draining: no new players are accepted; the server exits once {active_games()} game(s) finish.\n"
+
+    def reload_dictionary(args):
+        # Empties the cache and loads the default language again on the admin
+        # thread; other languages reload when next used, and running games
+        # keep the dictionary they started with
+        nonlocal word_index
+        dictionaries.clear()
+        new_index = dictionaries.get(DEFAULT_LANGUAGE).word_index
+        word_index = new_index
+        metrics.inc("dictionary_reloads")
+        if new_index is None:
+            return "Dictionaries reloaded; no word list found, so computer opponents are disabled.\n"
+        return f"Dictionaries reloaded: {len(new_index)} {DEFAULT_LANGUAGE} words indexed (version {new_index.version}).\n"
+
+    start_new_thread(admin_listener, (admin_path(port), sessions,
+                                      {"end": end_game, "drain": drain_server, "reload": reload_dictionary,
+                                       "analytics": analytics.query, "memory": memory.report,
+                                       "archive": archive.query}))
 
-def server_main():
-    serverPort = 12005
-    serverSocket = socket(AF_INET, SOCK_STREAM)
-    serverSocket.bind(("", serverPort))
-    serverSocket.listen(2)
-    print("Word Chain server is ready!")
+    def admit(sock, addr):
+        # Cap connections per source IP before any per-player state is set up
+        if writer.connections_from(addr[0]) >= MAX_CONNECTIONS_PER_IP \
+                and not (LOCAL_PEERS_EXEMPT and is_local_peer(addr)):
+            metrics.inc("connections_refused_per_ip")
+            sock.close()
+            return None
+        return Connection(sock, writer, addr)
 
-    dictionary = load_dictionary()
+    def start_room(players, add_bot=False, language=DEFAULT_LANGUAGE):
+        start_new_thread(start_game, (players, add_bot, language))
+
+    def start_game(players, add_bot, language):
+        # On the game's own thread, so loading a language holds up nobody else.
+        # Players sent here by a cluster coordinator may still be mid-handshake.
+        refused = memory.refusing()
+        if refused is not None:
+            # Over a memory budget: turn the room away rather than run out of memory
+            print(f"Game refused: {refused}.")
+            metrics.inc("games_refused_memory")
+            for player in players:
+                player.send("The server is at capacity right now. Please try again in a few minutes.\n")
+                player.finish()
+            return
+        for player in players:
+            while not handshake(player):
+                time.sleep(HANDSHAKE_WAIT / 10)
+        if not dictionaries.cached(language):
+            broadcast(players, f"Loading the {language} dictionary...\n")
+        try:
+            entry = dictionaries.get(language)
+        except LanguageUnavailable as e:
+            print(f"{e}; playing in {DEFAULT_LANGUAGE}.")
+            broadcast(players, f"The {language} dictionary is not available; you will play in {DEFAULT_LANGUAGE}.\n")
+            entry = dictionaries.get(DEFAULT_LANGUAGE)
+        if add_bot:
+            if entry.word_index is None:
+                for player in players:
+                    player.send(f"There are no computer opponents for {entry.language}. Please try again later.\n")
+                    player.finish()
+                return
+            bot = BotConnection(entry.word_index, BOT_DIFFICULTY)
+            bot.profile = bot_profile(BOT_DIFFICULTY)
+            players.append(bot)
+            print(f"Player {len(players)} is a computer opponent ({BOT_DIFFICULTY}).")
+        print(f"Room language: {entry.language}")
+        word_chain_thread(players, entry.dictionary, next(game_ids), spectators, entry.word_index)
+
+    node = None
+    if coordinator is not None:
+        # Cluster node: the coordinator does the matchmaking and sends players
+        # here with a ticket naming their room
+        from WordChainCluster import ClusterNode
+        from WordChainRecordsService import RecordsClient
+        records_service = RecordsClient(*records, fallback_store=store_record, fallback_top=get_top_5)
+        node = ClusterNode(coordinator, port, start_room, bots=word_index is not None, handshake=handshake)
+        start_new_thread(node.run, ())
 
     while True:
-        print("Waiting for two players to connect...")
-        player1, addr1 = serverSocket.accept()
-        print("Player 1 connected.")
-        player2, addr2 = serverSocket.accept()
-        print("Player 2 connected.")
-        start_new_thread(word_chain_thread, (player1, player2, dictionary))
-
-server_main()
\ No newline at end of file
+        if node is not None:
+            serverSocket.settimeout(1)
+            while not stop.is_set():
+                try:
+                    sock, addr = serverSocket.accept()
+                except timeout:
+                    continue
+                player = admit(sock, addr)
+                if player is not None:
+                    start_new_thread(node.admit, (player,))
+            node.stop()
+        else:
+            print(f"Waiting for {room_size} players to connect...")
+            room, add_bot = fill_lobby(serverSocket, room_size, admit, word_index is not None, waiting, stop,
+                                       lobby_language)
+            if room:
+                start_room(room, add_bot, room[0].language)
+            if not stop.is_set():
+                continue
+
+        if handoff is None or not handoff.asked:
+            # Drain requested on the admin socket
+            for player in waiting:
+                player.send("The server is shutting down. Please reconnect later.\n")
+                player.finish()
+            waiting = []
+            break
+
+        # A replacement process asked for the sockets. The waiting players'
+        # connections are released first: this process stops reading them, and
+        # the peers are not disconnected when the local descriptors close.
+        released = []
+        for player in waiting:
+            if player.closed:
+                continue
+            try:
+                sock, pending = player.release()
+            except OSError:
+                continue    # closed meanwhile
+            # The handshake was read here already; the new process reads it again
+            released.append((sock, getattr(player, "handshake_data", b"") + pending))
+        print(f"Handing over to the new server ({len(released)} player(s) waiting)...")
+        if handoff.hand_over(serverSocket.sockets + [spectatorSocket], released):
+            for sock, _ in released:
+                sock.close()
+            waiting = []
+            break
+        print("The new server did not start; carrying on.")
+        waiting = [Connection(sock, writer, peer_address(sock), pending=pending) for sock, pending in released]
+        if sessions.draining:
+            stop.set()
+            continue
+        handoff.listen()
+        if node is not None:
+            start_new_thread(node.run, ())
+
+    # Either the new process owns the sockets and the waiting players now,
+    # or the server is draining and has said goodbye to them
+    serverSocket.close()
+    print(f"Stopped accepting players. Draining {active_games()} game(s)...")
+    drain()
+    analytics.save()
+    archive.close()
+
+def parse_address(text, default_port):
+    # "host:port" or "host" -> (host, port)
+    host, sep, port = text.rpartition(":")
+    if not sep:
+        return text, default_port
+    return host or "localhost", int(port)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Word Chain game server")
+    parser.add_argument("room_size", nargs="?", type=int, default=ROOM_SIZE,
+                        help=f"players per room, 2-{ROOM_MAX_PLAYERS} (default {ROOM_SIZE})")
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--spectator-port", type=int, default=SPECTATOR_PORT)
+    parser.add_argument("--coordinator", metavar="HOST[:PORT]",
+                        help="run as a game node of the cluster coordinated at HOST")
+    parser.add_argument("--records", metavar="HOST[:PORT]",
+                        help="shared records service (default: the coordinator's host)")
+    parser.add_argument("--reap-after", type=float, default=REAP_AFTER, metavar="SECONDS",
+                        help=f"drop clients whose heartbeats stop for this long (default {REAP_AFTER})")
+    parser.add_argument("--ipv6", action=argparse.BooleanOptionalAction, default=True,
+                        help="also listen on IPv6 (default on)")
+    parser.add_argument("--unix", metavar="PATH",
+                        help="Unix socket for local clients (default: wordchain-PORT.sock in the temp directory, "
+                             "'-' to disable)")
+    parser.add_argument("--dictionary-cache", type=int, default=DICTIONARY_CACHE_BYTES // 2 ** 20, metavar="MB",
+                        help="memory for cached language dictionaries (default %(default)s MB)")
+    parser.add_argument("--validation-workers", type=int, default=0, metavar="N",
+                        help="check words in N worker processes instead of on the game threads (default 0)")
+    parser.add_argument("--memory-budget", type=parse_budget, action="append", default=[], metavar="NAME=MB",
+                        help="refuse new games while NAME (rss, dictionary, sessions, connections, threads, records, "
+                             "caches or archive) uses more than MB megabytes; repeatable")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="trace Python allocations with tracemalloc for exact per-subsystem figures (slower)")
+    parser.add_argument("--scoring", action="store_true",
+                        help="score words by length, rarity and chain length; records and high scores show points "
+                             f"(kept in {SCORES_FILE})")
+    parser.add_argument("--takeover", action="store_true",
+                        help="take the listening sockets over from the server running on the same port")
+    args = parser.parse_args()
+    if not 2 <= args.room_size <= ROOM_MAX_PLAYERS:
+        sys.exit(f"Players per room must be between 2 and {ROOM_MAX_PLAYERS}.")
+    coordinator = records = None
+    if args.coordinator:
+        from WordChainCluster import NODE_REGISTRY_PORT
+        from WordChainRecordsService import RECORDS_SERVICE_PORT
+        coordinator = parse_address(args.coordinator, NODE_REGISTRY_PORT)
+        records = parse_address(args.records or coordinator[0], RECORDS_SERVICE_PORT)
+    server_main(args.room_size, args.port, args.spectator_port, coordinator, records, args.takeover, args.reap_after,
+                args.ipv6, None if args.unix == "-" else args.unix or unix_socket_path(args.port),
+                args.dictionary_cache * 2 ** 20, args.validation_workers, dict(args.memory_budget), args.trace_memory,
+                args.scoring)
@@ -0,0 +1,139 @@
+# Word Chain Spectators
+# Read-only spectator connections for live Word Chain games
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: encode-once fan-out to spectators
+# Updated: 10/19/2026 - Spectators use the shared Connection write buffers
+#                     - Listener can take an inherited socket and be stopped for a restart
+#
+# Every game event is encoded exactly once into an immutable bytes object
+# and the same object is queued on every spectator watching that game.
+# Spectator writes are left entirely to the ConnectionWriter thread, so the
+# game threads never wait on a spectator socket.
+
+from socket import *
+from _thread import *
+import threading
+
+from WordChainConnection import Connection
+from WordChainMetrics import metrics
+
+SPECTATOR_PORT = 12006
+SPECTATOR_BUFFER = 32 * 1024    # bytes buffered per spectator before the overflow policy applies
+SPECTATOR_OVERFLOW = "drop"     # "drop" disconnects slow spectators, "skip" discards events they missed
+
+
+class SpectatorHub:
+    """Tracks live games and fans their events out to attached spectators."""
+
+    def __init__(self, writer, buffer_limit=SPECTATOR_BUFFER, overflow=SPECTATOR_OVERFLOW):
+        self.writer = writer
+        self.buffer_limit = buffer_limit
+        self.policy = "drop" if overflow == "skip" else "disconnect"
+        self._lock = threading.Lock()
+        self._games = {}        # game_id -> (description, tuple of spectator Connections)
+        metrics.gauge("spectators", lambda: sum(len(entry[1]) for entry in list(self._games.values())))
+
+    # --- game side -------------------------------------------------------
+
+    def open_game(self, game_id, description):
+        with self._lock:
+            self._games[game_id] = (description, ())
+
+    def describe_game(self, game_id, description):
+        with self._lock:
+            if game_id in self._games:
+                self._games[game_id] = (description, self._games[game_id][1])
+
+    def close_game(self, game_id):
+        # Spectators get whatever is still queued, then are disconnected.
+        with self._lock:
+            entry = self._games.pop(game_id, None)
+        if entry is not None:
+            for spectator in entry[1]:
+                spectator.finish()
+
+    def publish(self, game_id, text):
+        # Encode once; every spectator of the game shares this bytes object.
+        entry = self._games.get(game_id)
+        if entry is None or not entry[1]:
+            return
+        data = text.encode()
+        gone = [spectator for spectator in entry[1] if not spectator.send(data) and spectator.closed]
+        if gone:
+            metrics.inc("spectators_dropped", len(gone))
+            with self._lock:
+                entry = self._games.get(game_id)
+                if entry is not None:
+                    self._games[game_id] = (entry[0], tuple(s for s in entry[1] if s not in gone))
+
+    # --- spectator side ---------------------------------------------------
+
+    def list_games(self):
+        with self._lock:
+            return [(game_id, entry[0], len(entry[1])) for game_id, entry in self._games.items()]
+
+    def attach(self, game_id, sock, addr):
+        with self._lock:
+            entry = self._games.get(game_id)
+            if entry is None:
+                return False
+            spectator = Connection(sock, self.writer, addr, policy=self.policy, eager=False, read_only=True,
+                                   high_watermark=self.buffer_limit)
+            spectator.send(f"Spectating game {game_id}: {entry[0]}\n".encode())
+            self._games[game_id] = (entry[0], entry[1] + (spectator,))
+        return True
+
+
+def handle_spectator(sock, addr, hub):
+    # Spectator protocol: "LIST" shows live games, "SPECTATE <game id>" attaches.
+    sock.settimeout(30)
+    try:
+        sock.send("Word Chain spectator port. Commands: LIST, SPECTATE <game id>\n".encode())
+        while True:
+            data = sock.recv(1024)
+            if not data:
+                break
+            command = data.decode(errors="replace").strip().split()
+            if not command:
+                continue
+            if command[0].upper() == "LIST":
+                games = hub.list_games()
+                if not games:
+                    sock.send("No games in progress.\n".encode())
+                for game_id, description, watchers in games:
+                    sock.send(f"{game_id}: {description} ({watchers} watching)\n".encode())
+            elif command[0].upper() == "SPECTATE" and len(command) == 2 and command[1].isdigit():
+                if hub.attach(int(command[1]), sock, addr):
+                    return  # the hub owns the socket from here on
+                sock.send(f"No game {command[1]} in progress.\n".encode())
+            else:
+                sock.send("Unknown command.\n".encode())
+    except Exception:
+        pass
+    try:
+        sock.close()
+    except Exception:
+        pass
+
+
+def open_spectator_socket(port=SPECTATOR_PORT):
+    listenSocket = socket(AF_INET, SOCK_STREAM)
+    listenSocket.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
+    listenSocket.bind(("", port))
+    listenSocket.listen(64)
+    return listenSocket
+
+
+def spectator_listener(hub, port=SPECTATOR_PORT, listenSocket=None, stop=None):
+    # listenSocket may be passed in (e.g. inherited on a restart); with `stop`
+    # the listener checks every second and returns once it is set
+    if listenSocket is None:
+        listenSocket = open_spectator_socket(port)
+    listenSocket.settimeout(None if stop is None else 1)
+    print(f"Spectators can connect on port {listenSocket.getsockname()[1]}.")
+    while stop is None or not stop.is_set():
+        try:
+            sock, addr = listenSocket.accept()
+        except timeout:
+            continue
+        start_new_thread(handle_spectator, (sock, addr, hub))
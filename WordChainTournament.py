@@ -0,0 +1,485 @@
+# Word Chain Tournament
+# Single-elimination and Swiss tournaments played on the Word Chain game engine
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: brackets, concurrent match scheduling, saved progress
+# Updated: 10/19/2026 - Check in with the connect-time handshake; records keyed by player ID
+#                     - Match events feed the gameplay analytics (snapshots in WordChainAnalytics/tournament)
+#                     - Matches are kept in the game archive (WordChainArchive/tournament)
+#                     - Failed matches are retried, then left for an admin decision (--report)
+#                     - Registered players check in with their token; a name alone never logs in as them
+#
+# Usage: python WordChainTournament.py players.txt [--format single|swiss] [--report MATCH=WINNER ...]
+#
+# players.txt lists the registered players, one name per line, best seed first.
+# Players connect to the tournament port and check in: with the token of
+# their player profile (see WordChainProfiles.py), or by name if the name is
+# not a registered player's, in which case their games are not recorded.
+# Check-in never creates profiles. Every match that has both of its players is started straight away on
+# its own thread, and a single-elimination winner moves on the moment their
+# match reports, so an event takes about as long as its longest chain of
+# matches rather than the sum of every match. Swiss pairings depend on the
+# whole round, so Swiss rounds are played one after another with every match
+# of a round running at the same time.
+#
+# Every result is appended to WordChainTournament.json as it arrives; starting
+# the tournament again with the same player list picks up where it left off.
+#
+# A match that fails (an error in the game, not a player leaving) is never
+# decided for anyone: the failure is noted in the state file and the match
+# is played again, up to MATCH_ATTEMPTS times. After that the match waits
+# for an admin, the rest of the tournament carries on as far as it can
+# without it, and the tournament is paused. The admin restarts it with
+# --report MATCH=WINNER, which is saved like any other result.
+
+from socket import *
+from _thread import *
+import argparse
+import itertools
+import json
+import math
+import os
+import threading
+import time
+
+from WordChainConnection import Connection, ConnectionWriter
+from WordChainMetrics import metrics
+from WordChainAnalytics import analytics, ANALYTICS_DIR
+from WordChainArchive import archive, ARCHIVE_DIR
+from WordChainServer import load_dictionary, play_game, store_record, login, local_records, HANDSHAKE_WAIT
+from WordChainWordIndex import load_word_index
+from WordChainSpectators import SpectatorHub, spectator_listener
+
+TOURNAMENT_PORT = 12007
+TOURNAMENT_SPECTATOR_PORT = 12008
+STATE_FILE = "WordChainTournament.json"
+CHECK_IN_TIMEOUT = 120      # seconds a match waits for its players before awarding a forfeit
+MATCH_ATTEMPTS = 3          # times a failing match is played before it waits for an admin decision
+MATCH_RETRY_DELAY = 5       # seconds between attempts
+
+
+class Bracket:
+    """Tournament state: who plays whom, and every reported result.
+
+    Matches are dicts {"id", "round", "players": [a, b], "winner"}. A None
+    player is a slot still waiting for an earlier result; "BYE" is an
+    empty slot.
+    """
+
+    def __init__(self, players, format="single"):
+        if len(players) < 2:
+            raise ValueError("A tournament needs at least two players")
+        if len(set(players)) != len(players):
+            raise ValueError("Registered player names must be unique")
+        self.players = list(players)
+        self.format = format
+        self.rounds = []            # list of rounds, each a list of matches
+        self.scores = dict.fromkeys(players, 0)
+        self.opponents = {player: [] for player in players}
+        if format == "single":
+            self.total_rounds = max(1, math.ceil(math.log2(len(players))))
+            self._build_single()
+        elif format == "swiss":
+            self.total_rounds = max(1, math.ceil(math.log2(len(players))))
+            self._pair_swiss()
+        else:
+            raise ValueError(f"Unknown tournament format '{format}'")
+
+    # --- persistence -------------------------------------------------------
+    # The state file holds a header line with the registered players and the
+    # format, then one JSON line per reported result. Saving a result is a
+    # single appended line, and loading replays the results in order, which
+    # rebuilds byes, later rounds and Swiss pairings exactly as they were.
+
+    def start_journal(self, path):
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as f:
+            f.write(json.dumps({"format": self.format, "players": self.players}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            header = json.loads(f.readline())
+            bracket = cls(header["players"], header["format"])
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except ValueError:
+                    break   # a final line torn by a crash; that match is simply replayed
+                if "winner" in result:      # failed attempts are only noted
+                    bracket.report(result["match"], result["winner"])
+        return bracket
+
+    # --- bracket building --------------------------------------------------
+
+    def _build_single(self):
+        # Standard seeding: 1 plays the lowest seed, and the top seeds can
+        # only meet in the late rounds. Seeds past the field size are byes.
+        size = 1 << self.total_rounds
+        order = [1]
+        while len(order) < size:
+            order = [seed for s in order for seed in (s, 2 * len(order) + 1 - s)]
+        seeded = [self.players[seed - 1] if seed <= len(self.players) else "BYE" for seed in order]
+        for round_num in range(1, self.total_rounds + 1):
+            matches = size >> round_num
+            self.rounds.append([{"id": f"{round_num}-{i}", "round": round_num, "players": [None, None], "winner": None}
+                                for i in range(matches)])
+        for i, match in enumerate(self.rounds[0]):
+            match["players"] = seeded[2 * i:2 * i + 2]
+        for match in list(self.rounds[0]):
+            if "BYE" in match["players"]:
+                self.report(match["id"], next(p for p in match["players"] if p != "BYE"))
+
+    def _pair_swiss(self):
+        # Pair players with equal scores, avoiding rematches where possible.
+        # The lowest ranked player without a bye so far sits out for a point.
+        round_num = len(self.rounds) + 1
+        seed = {player: i for i, player in enumerate(self.players)}
+        standing = sorted(self.players, key=lambda p: (-self.scores[p], seed[p]))
+        matches = []
+        if len(standing) % 2:
+            had_bye = {m["players"][0] for r in self.rounds for m in r if m["players"][1] == "BYE"}
+            bye = next((p for p in reversed(standing) if p not in had_bye), standing[-1])
+            standing.remove(bye)
+            matches.append({"id": f"{round_num}-bye", "round": round_num, "players": [bye, "BYE"], "winner": bye})
+            self.scores[bye] += 1
+        while standing:
+            player = standing.pop(0)
+            opponent = next((p for p in standing if p not in self.opponents[player]), standing[0])
+            standing.remove(opponent)
+            matches.append({"id": f"{round_num}-{len(matches)}", "round": round_num,
+                            "players": [player, opponent], "winner": None})
+        self.rounds.append(matches)
+
+    # --- results -----------------------------------------------------------
+
+    def match(self, match_id):
+        round_num, _, index = match_id.partition("-")
+        for match in self.rounds[int(round_num) - 1]:
+            if match["id"] == match_id:
+                return match
+        raise KeyError(match_id)
+
+    def ready_matches(self):
+        return [match for matches in self.rounds for match in matches
+                if match["winner"] is None and None not in match["players"]]
+
+    def report(self, match_id, winner):
+        # Record a result. Returns the matches that became playable because of it.
+        match = self.match(match_id)
+        if match["winner"] is not None:
+            return []
+        match["winner"] = winner
+        a, b = match["players"]
+        if self.format == "single":
+            if match["round"] == self.total_rounds:
+                return []
+            index = int(match_id.partition("-")[2])
+            next_match = self.rounds[match["round"]][index // 2]
+            next_match["players"][index % 2] = winner
+            return [next_match] if None not in next_match["players"] else []
+
+        if "BYE" not in (a, b):
+            self.scores[winner] += 1
+            self.opponents[a].append(b)
+            self.opponents[b].append(a)
+        if any(m["winner"] is None for m in self.rounds[-1]) or len(self.rounds) == self.total_rounds:
+            return []
+        self._pair_swiss()
+        return [m for m in self.rounds[-1] if m["winner"] is None]
+
+    @property
+    def finished(self):
+        if self.format == "single":
+            return self.rounds[-1][0]["winner"] is not None
+        return len(self.rounds) == self.total_rounds and all(m["winner"] is not None for m in self.rounds[-1])
+
+    def is_out(self, player):
+        # Single elimination: a player is out once they have lost a match
+        if self.format != "single":
+            return False
+        return any(player in m["players"] and m["winner"] not in (None, player)
+                   for matches in self.rounds for m in matches)
+
+    def standings(self):
+        if self.format == "single":
+            # Players ranked by how far they got; the champion wins the last match
+            reached = {}
+            for matches in self.rounds:
+                for m in matches:
+                    for p in m["players"]:
+                        if p not in (None, "BYE"):
+                            reached[p] = m["round"] + (m["winner"] == p)
+            return sorted(reached, key=lambda p: -reached[p])
+        # Swiss: by score, ties broken by the combined score of each player's opponents
+        buchholz = {p: sum(self.scores[o] for o in self.opponents[p]) for p in self.players}
+        return sorted(self.players, key=lambda p: (-self.scores[p], -buchholz[p]))
+
+
+class TournamentRunner:
+    """Starts every playable match at once and advances results as they arrive."""
+
+    def __init__(self, bracket, play_match, state_path=STATE_FILE, retry_delay=MATCH_RETRY_DELAY):
+        self.bracket = bracket
+        self.play_match = play_match    # play_match(match) -> winner name
+        self.state_path = state_path
+        self.retry_delay = retry_delay
+        self.undecided = []             # IDs of matches that failed every attempt
+        self._lock = threading.Lock()
+        self._running = set()
+        self._done = threading.Event()
+        self._journal = open(state_path, "a")
+
+    def run(self):
+        # The final standings, or None if the tournament is paused on undecided matches
+        with self._lock:
+            if self.bracket.finished:
+                return self.bracket.standings()
+            for match in self.bracket.ready_matches():
+                self._start(match)
+        self._done.wait()
+        return self.bracket.standings() if self.bracket.finished else None
+
+    def _start(self, match):
+        # Called with self._lock held
+        if match["id"] in self._running:
+            return
+        self._running.add(match["id"])
+        metrics.inc("tournament_matches_started")
+        threading.Thread(target=self._play, args=(match,), name=f"match-{match['id']}", daemon=True).start()
+
+    def _play(self, match):
+        for attempt in range(1, MATCH_ATTEMPTS + 1):
+            try:
+                winner = self.play_match(match)
+                break
+            except Exception as e:
+                print(f"Match {match['id']} failed ({e}), attempt {attempt} of {MATCH_ATTEMPTS}.")
+                metrics.inc("tournament_matches_failed")
+                with self._lock:
+                    self._save({"match": match["id"], "failed": str(e)})
+                if attempt < MATCH_ATTEMPTS:
+                    time.sleep(self.retry_delay)
+        else:
+            print(f"Match {match['id']} needs an admin decision: restart with --report {match['id']}=WINNER.")
+            with self._lock:
+                self._running.discard(match["id"])
+                self.undecided.append(match["id"])
+                if not self._running:
+                    self._done.set()
+            return
+        with self._lock:
+            self._running.discard(match["id"])
+            for ready in self.bracket.report(match["id"], winner):
+                self._start(ready)
+            self._save({"match": match["id"], "winner": winner})
+            # Nothing left running before the end means the rest waits on undecided matches
+            if self.bracket.finished or not self._running:
+                self._done.set()
+
+    def _save(self, entry):
+        # Called with self._lock held
+        self._journal.write(json.dumps(entry) + "\n")
+        self._journal.flush()
+
+
+class TournamentLobby:
+    """Registered players check in here and are handed to their matches."""
+
+    def __init__(self, bracket, dictionary, writer, spectators, word_index=None):
+        self.bracket = bracket
+        self.dictionary = dictionary
+        self.word_index = word_index
+        self.writer = writer
+        self.spectators = spectators
+        self.game_ids = itertools.count(1)
+        self._connections = {}
+        self._profiles = {}     # bracket name -> Profile of a player who checked in with their token
+        self._cond = threading.Condition()
+
+    def listen(self, port=TOURNAMENT_PORT):
+        listenSocket = socket(AF_INET, SOCK_STREAM)
+        listenSocket.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
+        listenSocket.bind(("", port))
+        listenSocket.listen(64)
+        print(f"Tournament check-in is open on port {port}.")
+        while True:
+            sock, addr = listenSocket.accept()
+            start_new_thread(self._check_in, (Connection(sock, self.writer, addr),))
+
+    def _check_in(self, conn):
+        # A client that sends a handshake (see WordChainServer.handshake) is
+        # checked in under its profile's name, or the name it gives; anyone
+        # else is asked for one
+        conn.settimeout(HANDSHAKE_WAIT)
+        try:
+            data = conn.recv(1024).decode(errors="replace")
+        except timeout:
+            data = ""
+        name = ""
+        profile = None
+        for line in data.splitlines():
+            key, _, value = line.strip().partition(" ")
+            if key == "Token":
+                profile = login(value.strip())
+                if profile is not None:
+                    # Profile names match case-insensitively; use the registered spelling
+                    registered = {player.lower(): player for player in self.bracket.scores}
+                    name = registered.get(profile.name.lower(), "")
+            elif key == "Name":
+                name = self._unclaimed(conn, value.strip())
+        if not name:
+            profile = None
+            conn.settimeout(60)
+            conn.send("Please enter your tournament name: ")
+            try:
+                name = self._unclaimed(conn, conn.recv(1024).decode(errors="replace").strip())
+            except timeout:
+                name = ""
+        if name not in self.bracket.scores or self.bracket.is_out(name):
+            conn.send("That name is not registered for this tournament.\nThanks for playing!\n")
+            conn.close_when_flushed()
+            return
+        with self._cond:
+            old = self._connections.get(name)
+            self._connections[name] = conn
+            self._profiles[name] = profile
+            self._cond.notify_all()
+        if old is not None:
+            old.close()     # a reconnect replaces the previous connection
+        conn.send(f"Checked in as {name}. Waiting for your match...\n")
+        print(f"{name} checked in.")
+
+    @staticmethod
+    def _unclaimed(conn, name):
+        # A name given without a token, or "" if it belongs to a registered
+        # player, who has to check in with their token instead
+        if name and local_records()[0].by_name.get(name.lower()) is not None:
+            conn.send(f"{name} is a registered player; check in with their token to play as them.\n")
+            return ""
+        return name
+
+    def _wait_for(self, names, deadline):
+        with self._cond:
+            while True:
+                present = {n: c for n, c in self._connections.items() if n in names and not c.closed}
+                remaining = deadline - time.monotonic()
+                if len(present) == len(names) or remaining <= 0:
+                    return present
+                self._cond.wait(remaining)
+
+    def play_match(self, match):
+        a, b = match["players"]
+        present = self._wait_for({a, b}, time.monotonic() + CHECK_IN_TIMEOUT)
+        if len(present) < 2:
+            winner = next(iter(present), a)
+            print(f"Match {match['id']}: {winner} advances by forfeit.")
+            if winner in present:
+                present[winner].send("Your opponent did not show up. You advance by forfeit.\n")
+            return winner
+
+        players = [present[a], present[b]]
+        for player in players:
+            player.settimeout(15)
+        game_id = next(self.game_ids)
+        self.spectators.open_game(game_id, f"Tournament round {match['round']}: {a} vs {b}")
+        placements, words_played = play_game(players, self.dictionary, game_id, self.spectators, match["round"],
+                                             self.word_index)
+        self.spectators.close_game(game_id)
+        names = {present[a]: a, present[b]: b}
+        winner, loser = names[placements[0]], names[placements[1]]
+        profiles = [self._profiles.get(names[p]) for p in placements]
+        store_record([(profile.player_id if profile is not None else None, words_played[p])
+                      for profile, p in zip(profiles, placements)])
+        print(f"Match {match['id']}: {winner} beat {loser}.")
+
+        present[winner].send(f"You won your round {match['round']} match. Waiting for your next match...\n")
+        if self.bracket.format == "single":
+            present[loser].send("You are out of the tournament.\nThanks for playing!\n")
+            present[loser].close_when_flushed()
+        else:
+            present[loser].send("Waiting for your next match...\n")
+        return winner
+
+    def announce(self, standings):
+        if standings is None:
+            text = "The tournament is paused until the organisers decide a match.\nThanks for playing!\n"
+        else:
+            text = "Tournament over! Final standings:\n" + "".join(
+                f"{i}. {name}\n" for i, name in enumerate(standings[:10], 1)) + "Thanks for playing!\n"
+        with self._cond:
+            connections = list(self._connections.values())
+        for conn in connections:
+            conn.send(text)
+            conn.close_when_flushed()
+
+
+def report_results(bracket, path, reports):
+    # Admin decisions (--report MATCH=WINNER), saved to the state file like played results
+    with open(path, "a") as journal:
+        for report in reports:
+            match_id, _, winner = report.partition("=")
+            try:
+                match = bracket.match(match_id)
+            except (KeyError, ValueError, IndexError):
+                raise SystemExit(f"--report {report}: no match {match_id} in this tournament.")
+            if winner not in match["players"] or winner == "BYE":
+                raise SystemExit(f"--report {report}: {winner} is not playing in match {match_id}.")
+            if match["winner"] is not None:
+                print(f"Match {match_id} is already decided ({match['winner']} won); --report ignored.")
+                continue
+            bracket.report(match_id, winner)
+            journal.write(json.dumps({"match": match_id, "winner": winner, "admin": True}) + "\n")
+            print(f"Match {match_id}: {winner} advances by admin decision.")
+
+
+def tournament_main():
+    parser = argparse.ArgumentParser(description="Run a Word Chain tournament.")
+    parser.add_argument("players", help="file with one registered player name per line, best seed first")
+    parser.add_argument("--format", choices=("single", "swiss"), default="single")
+    parser.add_argument("--state", default=STATE_FILE, help="where bracket progress is saved")
+    parser.add_argument("--port", type=int, default=TOURNAMENT_PORT)
+    parser.add_argument("--report", action="append", default=[], metavar="MATCH=WINNER",
+                        help="decide a match that could not be played (e.g. 2-0=alice); repeatable")
+    args = parser.parse_args()
+
+    with open(args.players) as f:
+        players = [line.strip() for line in f if line.strip()]
+
+    bracket = None
+    if os.path.exists(args.state):
+        bracket = Bracket.load(args.state)
+        if bracket.players != players or bracket.format != args.format:
+            raise SystemExit(f"{args.state} belongs to a different tournament; move it aside to start a new one.")
+        print(f"Resuming tournament from {args.state}.")
+    else:
+        bracket = Bracket(players, args.format)
+        bracket.start_journal(args.state)
+    report_results(bracket, args.state, args.report)
+
+    analytics.start(os.path.join(ANALYTICS_DIR, "tournament"))    # kept apart from a server's snapshots
+    archive.start(os.path.join(ARCHIVE_DIR, "tournament"))
+    writer = ConnectionWriter()
+    spectators = SpectatorHub(writer)
+    start_new_thread(spectator_listener, (spectators, TOURNAMENT_SPECTATOR_PORT))
+    dictionary = load_dictionary()
+    lobby = TournamentLobby(bracket, dictionary, writer, spectators, load_word_index(dictionary))
+    start_new_thread(lobby.listen, (args.port,))
+
+    print(f"{args.format.title()} tournament with {len(players)} players, {bracket.total_rounds} rounds.")
+    runner = TournamentRunner(bracket, lobby.play_match, args.state)
+    standings = runner.run()
+    if standings is None:
+        print("Tournament paused. Undecided matches: " + ", ".join(runner.undecided))
+    else:
+        print("Final standings: " + ", ".join(standings[:10]))
+    lobby.announce(standings)
+    analytics.save()
+    archive.close()
+    time.sleep(2)   # let the final messages drain
+
+
+if __name__ == "__main__":
+    tournament_main()
@@ -0,0 +1,289 @@
+# Word Chain Validation
+# Word checks in a pool of worker processes fed through shared-memory ring buffers
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: worker pool, batched dispatch, inline fallback
+#
+# Game threads call validator.check(dictionary, word). Without a pool (the
+# default, --validation-workers 0) the word is checked inline on the game
+# thread, as it always was. With a pool the check runs in a worker process,
+# so dictionary lookups, and the stricter rules in check_word() as they are
+# added, no longer hold the GIL that the socket handling needs.
+#
+# Each worker has two rings in shared memory: requests (written by the
+# server, read by the worker) and responses (the other way round). Slots
+# are fixed-size records; only the number of slots just written travels
+# over a pipe, which is also what wakes the other side. Game threads queue
+# their request and wait; one dispatcher thread takes everything queued at
+# that moment, splits it across the workers, and wakes each worker once
+# for its whole batch. The worker answers the batch the same way, and a
+# collector thread hands each answer back to the game thread waiting on it.
+#
+# A word falls back to the inline check when there is no pool, a worker
+# has died, all rings are full, the answer takes longer than
+# VALIDATION_TIMEOUT, or the worker has no dictionary for the language.
+# Queue depth, batch size and latency are in the metrics report.
+
+import atexit
+import collections
+import itertools
+import multiprocessing
+import multiprocessing.connection
+import queue
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+
+from WordChainMetrics import metrics
+
+RING_SLOTS = 1024           # requests in flight per worker
+VALIDATION_TIMEOUT = 2.0    # seconds a game waits for a worker before checking the word itself
+MAX_WORD_BYTES = 192        # UTF-8 bytes of a word in a request slot (45 letters of up to 4 bytes)
+
+REQUEST = struct.Struct("<I8sB192s")    # request id, language tag, word length, word
+RESPONSE = struct.Struct("<IB")         # request id, result
+COUNT = struct.Struct("<I")             # slots written, sent over the pipe
+INVALID, VALID, UNAVAILABLE = range(3)
+
+
+def check_word(dictionary, word):
+    # The validation rules, run by the workers and by the inline fallback alike
+    return dictionary.check(word)
+
+
+class Ring:
+    """Fixed-size slots in shared memory, written in order by one process and
+    read in order by another. Each side keeps its own position; the writer
+    tells the reader how many slots it wrote, and never has more than
+    `capacity` slots unread."""
+
+    def __init__(self, record, capacity, name=None):
+        self.record = record
+        self.capacity = capacity
+        self.memory = shared_memory.SharedMemory(name=name, create=name is None, size=record.size * capacity)
+        self.name = self.memory.name
+        self.position = 0
+
+    def put(self, *values):
+        self.record.pack_into(self.memory.buf, (self.position % self.capacity) * self.record.size, *values)
+        self.position += 1
+
+    def get(self):
+        values = self.record.unpack_from(self.memory.buf, (self.position % self.capacity) * self.record.size)
+        self.position += 1
+        return values
+
+    def close(self, unlink=False):
+        self.memory.close()
+        if unlink:
+            self.memory.unlink()
+
+
+def read_counts(reader):
+    # Slots announced on a pipe: waits for one message, then takes any others already there
+    count = COUNT.unpack(reader.recv_bytes())[0]
+    while reader.poll():
+        count += COUNT.unpack(reader.recv_bytes())[0]
+    return count
+
+
+def worker_main(request_ring, response_ring, capacity, requests, responses):
+    # Runs in the worker process: answer batches until the server goes away
+    import enchant
+    requests_in = Ring(REQUEST, capacity, request_ring)
+    responses_out = Ring(RESPONSE, capacity, response_ring)
+    dictionaries = {}   # language -> enchant.Dict, loaded on first use
+    while True:
+        try:
+            count = read_counts(requests)
+        except (EOFError, OSError):
+            break
+        for _ in range(count):
+            request_id, language, length, data = requests_in.get()
+            language = language.rstrip(b"\0").decode()
+            dictionary = dictionaries.get(language)
+            if dictionary is None:
+                try:
+                    dictionary = dictionaries[language] = enchant.Dict(language)
+                except Exception:
+                    responses_out.put(request_id, UNAVAILABLE)
+                    continue
+            word = data[:length].decode(errors="replace")
+            responses_out.put(request_id, VALID if check_word(dictionary, word) else INVALID)
+        responses.send_bytes(COUNT.pack(count))
+    requests_in.close()
+    responses_out.close()
+
+
+class Request:
+    __slots__ = ("request_id", "language", "word", "done", "result", "started")
+
+    def __init__(self, request_id, language, word):
+        self.request_id = request_id
+        self.language = language
+        self.word = word
+        self.done = threading.Event()
+        self.result = None
+        self.started = time.perf_counter()
+
+
+class Worker:
+    """One worker process with its rings and pipes, as seen from the server."""
+
+    def __init__(self, context, number, capacity):
+        self.number = number
+        self.requests = Ring(REQUEST, capacity)
+        self.responses = Ring(RESPONSE, capacity)
+        requests_in, self.requests_out = context.Pipe(duplex=False)
+        self.responses_in, responses_out = context.Pipe(duplex=False)
+        self.process = context.Process(target=worker_main, name=f"validation-{number}", daemon=True,
+                                       args=(self.requests.name, self.responses.name, capacity,
+                                             requests_in, responses_out))
+        self.process.start()
+        requests_in.close()     # the worker's ends
+        responses_out.close()
+        self.in_flight = collections.deque()    # requests sent and not yet answered, oldest first
+        self.alive = True
+        self.closed = False
+
+    def close(self):
+        if self.closed:
+            return
+        self.alive = False
+        self.closed = True
+        self.requests_out.close()
+        self.requests.close(unlink=True)
+        self.responses.close(unlink=True)
+
+
+class ValidationPool:
+    """Worker processes that check words in batches."""
+
+    def __init__(self, workers, capacity=RING_SLOTS):
+        context = multiprocessing.get_context("spawn")   # no fork of a threaded server
+        self.capacity = capacity
+        self.workers = [Worker(context, number, capacity) for number in range(workers)]
+        self._queue = queue.SimpleQueue()
+        self._ids = itertools.count()
+        self._lock = threading.Lock()   # workers' in_flight, between the dispatcher and the collector
+        metrics.gauge("validation_queued", self._queue.qsize)
+        metrics.gauge("validation_in_flight", lambda: sum(len(worker.in_flight) for worker in self.workers))
+        metrics.gauge("validation_workers_alive", lambda: sum(worker.alive for worker in self.workers))
+        threading.Thread(target=self._dispatch, name="validation-dispatch", daemon=True).start()
+        threading.Thread(target=self._collect, name="validation-collect", daemon=True).start()
+        atexit.register(self.close)
+        print(f"Validation pool: {workers} worker process(es).")
+
+    def check(self, language, word):
+        # True or False, or None if a worker could not answer
+        data = word.encode()
+        if len(data) > MAX_WORD_BYTES or len(language) > 8:
+            return None
+        request = Request(next(self._ids) & 0xFFFFFFFF, language, data)
+        self._queue.put(request)
+        if not request.done.wait(VALIDATION_TIMEOUT):
+            metrics.inc("validation_timeouts")
+            return None
+        return request.result
+
+    def _dispatch(self):
+        # Take every queued request, then wake each worker once for its share
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            with self._lock:
+                workers = sorted((worker for worker in self.workers if worker.alive), key=lambda w: len(w.in_flight))
+                shares = {worker: [] for worker in workers}
+                for i, request in enumerate(batch):
+                    # Round robin from the least loaded worker, skipping full rings
+                    for j in range(len(workers)):
+                        worker = workers[(i + j) % len(workers)]
+                        if len(worker.in_flight) + len(shares[worker]) < self.capacity:
+                            shares[worker].append(request)
+                            break
+                    else:
+                        request.done.set()      # every ring is full (or no worker is left): inline
+                for worker, requests in shares.items():
+                    for request in requests:
+                        worker.requests.put(request.request_id, request.language.encode(), len(request.word),
+                                            request.word)
+                        worker.in_flight.append(request)
+            for worker, requests in shares.items():
+                if requests:
+                    try:
+                        worker.requests_out.send_bytes(COUNT.pack(len(requests)))
+                    except OSError:
+                        self._lost(worker)
+            metrics.inc("validation_batches")
+            metrics.observe("validation_batch_size", len(batch))
+
+    def _collect(self):
+        # Hand answers back to the waiting game threads
+        while True:
+            readers = {worker.responses_in: worker for worker in self.workers if worker.alive}
+            if not readers:
+                return
+            for reader in multiprocessing.connection.wait(list(readers), timeout=1):
+                worker = readers[reader]
+                try:
+                    count = read_counts(reader)
+                except (EOFError, OSError):
+                    self._lost(worker)
+                    continue
+                now = time.perf_counter()
+                for _ in range(count):
+                    request_id, result = worker.responses.get()
+                    with self._lock:
+                        request = worker.in_flight.popleft()
+                    if request.request_id != request_id:
+                        print(f"Validation worker {worker.number} answered out of order; stopping it.")
+                        self._lost(worker)
+                        break
+                    request.result = None if result == UNAVAILABLE else result == VALID
+                    request.done.set()
+                    metrics.observe("validation_latency_ms", (now - request.started) * 1000)
+
+    def _lost(self, worker):
+        # A worker died or misbehaved: its requests fall back to the inline check
+        with self._lock:
+            if not worker.alive:
+                return
+            worker.alive = False
+            pending = list(worker.in_flight)
+            worker.in_flight.clear()
+        for request in pending:
+            request.done.set()
+        metrics.inc("validation_workers_lost")
+        print(f"Validation worker {worker.number} stopped; its words are checked inline.")
+        worker.process.kill()
+
+    def close(self):
+        for worker in self.workers:
+            worker.close()
+
+
+class Validator:
+    """Word checks for game threads: through the pool when there is one, inline otherwise."""
+
+    def __init__(self):
+        self.pool = None
+
+    def start(self, workers):
+        if workers > 0:
+            self.pool = ValidationPool(workers)
+
+    def check(self, dictionary, word):
+        language = getattr(dictionary, "tag", None)
+        if self.pool is not None and language:
+            result = self.pool.check(language, word)
+            if result is not None:
+                return result
+            metrics.inc("validation_fallbacks")
+        return check_word(dictionary, word)
+
+
+validator = Validator()
@@ -0,0 +1,190 @@
+# Word Chain Word Index
+# Precomputed index of playable dictionary words, grouped by first and last letter
+# Author: Alexander, Brandon, Jorie
+# Date: 10/19/2026    - Initial version: letter-graph index and per-game word pools
+# Updated: 10/19/2026 - Hints from the per-game pool
+#                     - Dictionary version and compact export for client-side checks
+#                     - Word lists per language (WordChainWords-<language>.txt)
+#                     - Words map to their sorted position, for per-word arrays such as the score table
+#                     - Dead ends only for word lists marked complete
+#                     - A list stops counting as complete when any playable word is left out of the index
+#
+# PyEnchant can check a word but cannot list its dictionary, so the index is
+# built from a plain word list (one word per line) filtered through the same
+# enchant dictionary the server validates with. Words live in 26 x 26 groups
+# keyed by (first letter, last letter); a group is one slot of a flat list
+# indexed first * 26 + last.
+#
+# A word list is usually a subset of what enchant accepts, and the index
+# only holds words of two or more letters a-z, so it drops words the server
+# would accept: "a", "don't", "e-mail" and the umlauts and accents of de_DE
+# or fr_FR. "No indexed word starts with this letter" therefore does not
+# mean nobody can answer. Only a list whose first line is COMPLETE_MARKER,
+# and that had none of the dictionary's words dropped, is trusted to say so
+# (see dead_end()).
+
+from array import array
+import gzip
+import hashlib
+import os
+import random
+import sys
+
+WORD_LIST_PATHS = ("WordChainWords.txt", "/usr/share/dict/words", "/usr/dict/words")
+CLIENT_DICTIONARY_FILE = "WordChainClientWords.gz"
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+COMPLETE_MARKER = "# complete"     # first line of a word list that holds every word the dictionary accepts
+
+
+def letter_index(letter):
+    return ord(letter) - 97
+
+
+class WordIndex:
+    """Every playable word, grouped by (first letter, last letter)."""
+
+    def __init__(self, words, complete=False):
+        # words: lowercase words the dictionary accepts
+        self.groups = [[] for _ in range(26 * 26)]
+        seen = set()
+        for word in words:
+            if not word.islower():
+                continue
+            if len(word) < 2 or not word.isalpha() or not word.isascii():
+                complete = False    # a playable word the index cannot hold
+                continue
+            if word in seen:
+                continue
+            seen.add(word)
+            self.groups[letter_index(word[0]) * 26 + letter_index(word[-1])].append(word)
+        for group in self.groups:
+            random.shuffle(group)   # so bots do not always open with the same words
+        # Clients compare this with their local copy before trusting it
+        self.sorted_words = sorted(seen)
+        # Every word with its position in sorted_words, so per-word tables can be arrays
+        self.words = {word: slot for slot, word in enumerate(self.sorted_words)}
+        self.scores = None      # ScoreTable in scoring mode (WordChainScoring.py)
+        self.complete = complete    # holds every word the dictionary accepts
+        self.version = hashlib.sha1("\n".join(self.sorted_words).encode()).hexdigest()[:12]
+        self.group_counts = array("I", (len(group) for group in self.groups))
+        self.starting_counts = array("I", (sum(self.group_counts[f * 26:f * 26 + 26]) for f in range(26)))
+
+    def __len__(self):
+        return len(self.words)
+
+    def new_pool(self):
+        return WordPool(self)
+
+
+class WordPool:
+    """The words still available in one game.
+
+    Holds per-game copies of the group and starting-letter counts, which
+    are decremented as words are played, so "how many words can still be
+    played from this letter?" is a single array lookup.
+    """
+
+    __slots__ = ("index", "used", "group_counts", "starting_counts", "_cursors")
+
+    def __init__(self, index):
+        self.index = index
+        self.used = set()
+        self.group_counts = array("I", index.group_counts)
+        self.starting_counts = array("I", index.starting_counts)
+        self._cursors = {}      # group -> position before which every word is used
+
+    def mark_used(self, word):
+        if word in self.used:
+            return
+        self.used.add(word)
+        if word in self.index.words:
+            group = letter_index(word[0]) * 26 + letter_index(word[-1])
+            self.group_counts[group] -= 1
+            self.starting_counts[group // 26] -= 1
+
+    def remaining(self, letter):
+        # Unused indexed words that start with `letter`
+        if not "a" <= letter <= "z":
+            return 0    # the index only holds words that start with a-z
+        return self.starting_counts[letter_index(letter)]
+
+    def dead_end(self, letter):
+        # True only if no valid unused word can start with `letter`: the index
+        # must hold every word the dictionary accepts, and none of them is left
+        return self.index.complete and "a" <= letter <= "z" and not self.remaining(letter)
+
+    def take(self, group):
+        # Next unused word in a group. The cursor only moves forward, so this
+        # is amortised O(1) over a game. The group must have words left.
+        words = self.index.groups[group]
+        pos = self._cursors.get(group, 0)
+        while words[pos] in self.used:
+            pos += 1
+        self._cursors[group] = pos
+        return words[pos]
+
+    def any_word(self, letter):
+        # Some unused word starting with `letter`, or None
+        if not self.remaining(letter):
+            return None
+        first = letter_index(letter)
+        for group in range(first * 26, first * 26 + 26):
+            if self.group_counts[group]:
+                return self.take(group)
+        return None
+
+    def hint(self, letter=None):
+        # A playable suggestion: an unused word starting with `letter`, or
+        # with any letter for the opening move
+        if letter is not None:
+            return self.any_word(letter)
+        for first in random.sample(LETTERS, 26):
+            word = self.any_word(first)
+            if word is not None:
+                return word
+        return None
+
+
+def word_list_paths(language):
+    # A list named after the language comes first; the general lists are English
+    paths = (f"WordChainWords-{language}.txt",)
+    if language.startswith("en"):
+        paths += WORD_LIST_PATHS
+    return paths
+
+
+def load_word_index(dictionary, paths=WORD_LIST_PATHS):
+    # Build the index from the first word list found, keeping only words the
+    # server's dictionary accepts. Returns None if no word list is available.
+    for path in paths:
+        if os.path.exists(path):
+            break
+    else:
+        return None
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        complete = f.readline().strip() == COMPLETE_MARKER
+        f.seek(0)
+        # Moves are lowercased before they are checked, so the list is too
+        candidates = {line.strip().lower() for line in f if not line.startswith("#")}
+    # Every word the dictionary accepts goes to the index, which notes any it cannot hold
+    return WordIndex((word for word in candidates if word and dictionary.check(word)), complete)
+
+
+def export_client_dictionary(index, path=CLIENT_DICTIONARY_FILE):
+    # Compact copy of the index for clients: a version line, then the sorted words, gzipped
+    temp_path = path + ".tmp"
+    with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+        f.write(f"# wordchain-dictionary {index.version}\n")
+        f.write("\n".join(index.sorted_words) + "\n")
+    os.replace(temp_path, path)
+
+
+if __name__ == "__main__":
+    # python WordChainWordIndex.py [output file]: export the client word list
+    from WordChainServer import load_dictionary
+    index = load_word_index(load_dictionary())
+    if index is None:
+        sys.exit("No word list found.")
+    output = sys.argv[1] if len(sys.argv) > 1 else CLIENT_DICTIONARY_FILE
+    export_client_dictionary(index, output)
+    print(f"Wrote {len(index)} words (dictionary version {index.version}) to {output}")
@@ -0,0 +1,81 @@
+# Shared fixtures for the Word Chain tests
+#
+# The modules are scripts in the repository root, so the root is put on the
+# import path. Tests that need a running server use the `server` fixture,
+# which starts WordChainServer.py in a temporary directory (so its records,
+# archive and analytics files stay out of the repository) and is skipped
+# when PyEnchant is not installed.
+
+import os
+import socket
+import subprocess
+import sys
+import time
+import types
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SERVER_START_TIMEOUT = 30   # seconds for the server to load its dictionary and listen
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_line(path, text, timeout=SERVER_START_TIMEOUT):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if os.path.exists(path):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                if text in f.read():
+                    return True
+        time.sleep(0.1)
+    return False
+
+
+def start_server(directory, port, *args):
+    log_path = os.path.join(directory, f"server-{port}.log")
+    log = open(log_path, "a")
+    process = subprocess.Popen([sys.executable, "-u", os.path.join(ROOT, "WordChainServer.py"),
+                                "--port", str(port), "--spectator-port", str(free_port()), "--unix", "-", *args],
+                               cwd=directory, stdout=log, stderr=subprocess.STDOUT)
+    log.close()
+    return types.SimpleNamespace(port=port, process=process, log=log_path)
+
+
+def stop_server(server):
+    if server.process.poll() is None:
+        server.process.terminate()
+        try:
+            server.process.wait(5)
+        except subprocess.TimeoutExpired:
+            server.process.kill()
+
+
+@pytest.fixture
+def server(tmp_path):
+    pytest.importorskip("enchant")
+    running = start_server(str(tmp_path), free_port())
+    try:
+        if not wait_for_line(running.log, "Word Chain server is ready"):
+            pytest.fail("the server did not start:\n" + open(running.log).read())
+        yield running
+    finally:
+        stop_server(running)
+
+
+def next_of(client, kind, timeout=10):
+    # The next event of type `kind` from a blocking Client, skipping the others
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        event = client.next_event(timeout=end - time.monotonic())
+        if isinstance(event, kind):
+            return event
+        if event is not None and type(event).__name__ == "Disconnected":
+            raise AssertionError(f"disconnected while waiting for {kind.__name__}: {event.text}")
+    raise AssertionError(f"no {kind.__name__} within {timeout}s")
@@ -0,0 +1,55 @@
+# The admin control socket (WordChainAdmin.py)
+
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from WordChainAdmin import SessionTable, admin_command, admin_listener
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+class Player:
+    def __init__(self, addr):
+        self.addr = addr
+        self.text = ""
+        self.finished = False
+
+    def send(self, text):
+        self.text += text
+
+    def finish(self):
+        self.finished = True
+
+
+def listen(path, sessions, actions):
+    threading.Thread(target=admin_listener, args=(path, sessions, actions), daemon=True).start()
+    end = time.monotonic() + 5
+    while not os.path.exists(path):
+        assert time.monotonic() < end, "the admin socket never appeared"
+        time.sleep(0.05)
+
+
+def test_sessions_queue_and_end(tmp_path):
+    path = str(tmp_path / "admin")
+    sessions = SessionTable()
+    players = [Player(("203.0.113.5", 4000)), Player(("203.0.113.6", 4001))]
+    sessions.open(3, players)
+    sessions.update(3, state="playing", round=1, turn=4, last_word="tiger", current=2)
+    sessions.waiting = 5
+    listen(path, sessions, {"echo": lambda args: " ".join(args) + "\n"})
+
+    table = admin_command(path, ["sessions"])
+    assert "tiger" in table and "Player 2 (203.0.113.6:4001)" in table
+    assert admin_command(path, ["queue"]) == "Players waiting: 5\nGames running: 1\nDraining: no\n"
+    assert admin_command(path, ["echo", "a", "b"]) == "a b\n"
+    assert admin_command(path, ["nope"]).startswith("Unknown command. Commands: sessions, queue, echo")
+
+    assert sessions.end(3) and sessions.was_ended(3)
+    assert all(player.finished and "An administrator ended this game." in player.text for player in players)
+    sessions.close(3)
+    assert admin_command(path, ["sessions"]) == "No games running.\n"
+    assert not sessions.end(3)
@@ -0,0 +1,48 @@
+# Gameplay statistics in array-backed aggregates (WordChainAnalytics.py)
+
+from WordChainAnalytics import Analytics, CountMinSketch, CHAIN_BUCKETS, letter_slot
+
+
+def play(analytics):
+    for word in ("apple", "eagle", "elephant", "tiger", "apple"):
+        analytics.word(word)
+    analytics.elimination("timeout", "r")
+    analytics.game_over(5, "r")
+    analytics.elimination("used", "t")
+    analytics.game_over(300, "t")       # longer than the histogram: counted in its last bucket
+
+
+def test_events_are_aggregated_and_survive_a_restart(tmp_path):
+    analytics = Analytics()
+    analytics.enabled = True
+    analytics.directory = str(tmp_path)
+    play(analytics)
+    analytics.drain()
+    assert (analytics.games, analytics.words) == (2, 5)
+    assert analytics.eliminations["timeout"] == 1 and analytics.eliminations["used"] == 1
+    assert analytics.letter_plays[letter_slot("e")] == 3 and analytics.letter_deaths[letter_slot("r")] == 1
+    assert analytics.chain_lengths[CHAIN_BUCKETS - 1] == 1
+    assert "Average chain length: 152.5" in analytics.query(["summary"])
+    assert analytics.query(["words", "1"]).splitlines()[1].split() == ["apple", "2"]
+
+    analytics.save("20261019-10")
+    restored = Analytics()
+    restored.directory = str(tmp_path)
+    restored.restore()
+    assert restored.query(["summary"]) == analytics.query(["summary"])
+    assert restored.sketch.estimate("apple") == 2
+
+
+def test_disabled_analytics_drop_events():
+    analytics = Analytics()
+    play(analytics)
+    assert len(analytics._events) == 0
+
+
+def test_sketch_estimates_are_never_too_low():
+    sketch = CountMinSketch(width=64, depth=4)     # small, so words share counters
+    counts = {f"word{n}": n % 7 + 1 for n in range(200)}
+    for word, count in counts.items():
+        sketch.add(word, count)
+    assert all(sketch.estimate(word) >= count for word, count in counts.items())
+    assert sketch.total == sum(counts.values())
@@ -0,0 +1,83 @@
+# The game archive's segments and indexes (WordChainArchive.py)
+
+import os
+import time
+
+import WordChainArchive
+from WordChainArchive import GameArchive
+
+
+def add_games(archive, count):
+    for n in range(count):
+        words = ["apple", "egg"] if n % 2 else ["tiger", "rabbit", f"word{n}"]
+        archive.add("en_US", [(1, 1, "Ada"), (2, None, "guest")], [1, 2], words)
+
+
+def settle(archive, indexes, timeout=10):
+    # Until the background thread has written every sealed journal and merged down to `indexes`
+    end = time.monotonic() + timeout
+    while archive._sealing or archive._indexes != indexes:
+        assert time.monotonic() < end, f"the archive did not catch up: {archive._indexes}"
+        time.sleep(0.05)
+
+
+def test_segments_and_merged_indexes_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(WordChainArchive, "SEGMENT_GAMES", 2)
+    directory = str(tmp_path / "archive")
+    archive = GameArchive()
+    archive.start(directory)
+    add_games(archive, 17)     # 8 segments and one game left in the journal
+    settle(archive, [(1, 8), (9, 16)])     # eight one-segment indexes, merged four at a time
+
+    assert archive._segments == [(first, first + 1) for first in range(1, 17, 2)]
+
+    assert archive.find("w:egg", limit=3) == [16, 14, 12]
+    assert archive.find("w:word16") == [17]     # still in the journal
+    assert archive.find("n:ada", limit=100) == list(range(17, 0, -1))
+    assert archive.find("p:1", limit=2) == [17, 16]
+    assert [game["words"] for game in archive.games([3, 4, 17])] == \
+        [["tiger", "rabbit", "word2"], ["apple", "egg"], ["tiger", "rabbit", "word16"]]
+    archive.close()
+
+    # A new process finds the same games, and carries on numbering after them
+    restarted = GameArchive()
+    restarted.start(directory)
+    assert restarted.find("w:word4") == [5]
+    assert restarted.find("w:word16") == [17]
+    assert restarted.add("en_US", [(1, 1, "Ada")], [1], ["zebra"]) == 18
+    restarted.close()
+
+
+def test_recovery_drops_merged_away_indexes(tmp_path, monkeypatch):
+    monkeypatch.setattr(WordChainArchive, "SEGMENT_GAMES", 2)
+    directory = str(tmp_path / "archive")
+    archive = GameArchive()
+    archive.start(directory)
+    add_games(archive, 8)
+    settle(archive, [(1, 8)])
+    archive.close()
+
+    # A crash after writing the merged index but before removing what it replaced
+    WordChainArchive.write_compressed(os.path.join(directory, "index-0000000003-0000000004.idx"), "{}")
+    restarted = GameArchive()
+    restarted.start(directory)
+    assert restarted._indexes == [(1, 8)]
+    assert not os.path.exists(os.path.join(directory, "index-0000000003-0000000004.idx"))
+    assert restarted.find("w:word6") == [7]
+    restarted.close()
+
+
+def test_memory_estimate_counts_games_in_memory_and_cached_indexes(tmp_path, monkeypatch):
+    monkeypatch.setattr(WordChainArchive, "SEGMENT_GAMES", 2)
+    archive = GameArchive()
+    archive.start(str(tmp_path / "archive"))
+    add_games(archive, 1)
+    one_game = archive.memory_used()
+    assert one_game > 0
+    add_games(archive, 1)      # sealed and written out: nothing left in memory
+    settle(archive, [(1, 2)])
+    archive._cache.clear()
+    assert archive.memory_used() == 0
+    archive.find("n:ada")       # parses and caches the index
+    assert archive.memory_used() > 0
+    archive.close()
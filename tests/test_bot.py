@@ -0,0 +1,37 @@
+# The computer opponent (WordChainBot.py)
+
+import pytest
+
+from WordChainBot import BotConnection
+from WordChainWordIndex import WordIndex
+
+WORDS = ["tea", "tiger", "rabbit", "apple", "ant", "egg"]
+
+
+def turn(bot, *lines):
+    bot.send("".join(line + "\n" for line in lines) + "Your turn.\n")
+    return bot.recv(1024).decode()
+
+
+def test_hard_bot_leaves_the_opponent_fewest_answers():
+    bot = BotConnection(WordIndex(WORDS), "hard")
+    # After "eat": "tea" leaves two words starting with a, "tiger" only one with r
+    assert turn(bot, "Welcome to Word Chain! You are Player 2 of 2.", "Player 1 used 'eat'.") == "tiger"
+    assert turn(bot, "Player 1 used 'rabbit'.") == "tea"
+    assert turn(bot, "Player 1 used 'apple'.") == "egg"    # the only word starting with e
+    assert turn(bot, "Player 1 used 'gnu'.") == "\n"        # nothing starts with u: the turn is conceded
+
+
+def test_bot_answers_the_prompts_after_a_game():
+    bot = BotConnection(WordIndex(WORDS), "easy")
+    bot.send("Rematch?\n")
+    assert bot.recv(1024) == b"yes"
+    bot.send("Please enter your name for the record: ")
+    assert bot.recv(1024) == b"computer (easy)"
+    bot.close()
+    assert bot.recv(1024) == b"" and not bot.send("Your turn.\n")
+
+
+def test_unknown_difficulty_is_refused():
+    with pytest.raises(ValueError):
+        BotConnection(WordIndex(WORDS), "impossible")
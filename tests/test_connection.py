@@ -0,0 +1,131 @@
+# Connections (WordChainConnection.py): output buffers, and input read by the writer thread
+
+import socket
+import time
+
+import pytest
+
+import WordChainConnection
+from WordChainConnection import Connection, ConnectionWriter, FLOOD_STRIKES, HEARTBEAT, MAX_FRAME, RATE_BURST, SLOW_DOWN
+
+
+@pytest.fixture
+def pair():
+    peer, sock = socket.socketpair()
+    conn = Connection(sock, ConnectionWriter(), addr=("203.0.113.5", 4000))
+    conn.settimeout(5)
+    yield peer, conn
+    conn.close()
+    peer.close()
+
+
+def test_a_heartbeat_split_across_reads_is_stripped(pair):
+    peer, conn = pair
+    peer.sendall(b"/heart")
+    time.sleep(0.3)                 # read on its own: it may still be a heartbeat
+    assert conn.poll() is None
+    peer.sendall(b"beat\napple\n")
+    assert conn.recv(1024) == b"apple\n" and conn.heartbeats
+
+
+def test_only_whole_heartbeat_lines_are_stripped(pair):
+    peer, conn = pair
+    peer.sendall(b"tiger")          # no newline (the legacy client): read at once
+    assert conn.recv(1024) == b"tiger"
+    peer.sendall(b"say /heartbeat\n/heartbeat\n")
+    assert conn.recv(1024) == b"say /heartbeat\n"
+
+
+def test_a_heartbeating_peer_that_goes_silent_is_reaped(monkeypatch):
+    monkeypatch.setattr(WordChainConnection, "HEARTBEAT_INTERVAL", 0.2)
+    writer = ConnectionWriter(reap_after=1.5)
+    (silent_peer, silent), (beating_peer, beating), (quiet_peer, quiet) = \
+        [(peer, Connection(sock, writer)) for peer, sock in (socket.socketpair() for _ in range(3))]
+    silent_peer.sendall(HEARTBEAT)      # then nothing more
+    beating_peer.settimeout(5)
+    received = b""
+    end = time.monotonic() + 3
+    while time.monotonic() < end:
+        beating_peer.sendall(HEARTBEAT)
+        time.sleep(0.3)
+    while HEARTBEAT not in received:
+        received += beating_peer.recv(1024)
+    assert silent.closed and silent.recv(1024) == b""
+    assert not beating.closed and beating.poll() is None     # heartbeats never reach the game
+    assert not quiet.closed      # never sent a heartbeat: left to TCP keepalive
+    for sock in (silent_peer, beating_peer, quiet_peer, beating, quiet):
+        sock.close()
+
+
+def test_heartbeats_are_free_and_dropped_words_are_answered(pair):
+    peer, conn = pair
+    peer.sendall(b"/heartbeat\n" * 40 + b"w\n" * RATE_BURST)
+    words = b""
+    while len(words) < 2 * RATE_BURST:
+        words += conn.recv(1024)
+    assert words == b"w\n" * RATE_BURST      # no heartbeat took a word's place
+    peer.sendall(b"apple\n")                 # over the budget: not read, and the player is told
+    peer.settimeout(5)
+    assert peer.recv(1024) == SLOW_DOWN
+    assert conn.poll() is None and conn.strikes == 1
+
+
+def fill(conn, chunk=b"x" * 4096, limit=64 * 1024 * 1024):
+    # Send until a message is refused; returns the bytes accepted
+    sent = 0
+    while conn.send(chunk):
+        sent += len(chunk)
+        assert sent < limit, "the output buffer never filled"
+    return sent
+
+
+def test_a_peer_that_stops_reading_is_disconnected_without_blocking_the_sender():
+    peer, sock = socket.socketpair()
+    conn = Connection(sock, ConnectionWriter(), high_watermark=16 * 1024, low_watermark=4 * 1024)
+    started = time.monotonic()
+    fill(conn)
+    assert conn.closed and time.monotonic() - started < 2
+    assert not conn.send(b"more")
+    peer.close()
+
+
+def test_drop_policy_discards_messages_until_the_peer_catches_up():
+    peer, sock = socket.socketpair()
+    conn = Connection(sock, ConnectionWriter(), policy="drop", high_watermark=16 * 1024, low_watermark=4 * 1024)
+    sent = fill(conn)
+    assert not conn.closed and conn.dropped == 1
+    peer.settimeout(5)
+    received = 0
+    while received < sent:
+        received += len(peer.recv(65536))
+    assert received == sent     # everything queued arrives, nothing refused does
+    assert conn.send(b"again\n") and peer.recv(64) == b"again\n"
+    conn.close()
+    peer.close()
+
+
+def wait_until(condition, timeout=5):
+    end = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def test_floods_and_oversized_frames_disconnect():
+    writer = ConnectionWriter()
+    flood_peer, sock = socket.socketpair()
+    flooder = Connection(sock, writer, addr=("203.0.113.5", 4000))
+    flood_peer.sendall(b"w\n" * RATE_BURST)
+    for _ in range(FLOOD_STRIKES):
+        time.sleep(0.02)            # one read each, all over the budget
+        flood_peer.sendall(b"w\n" * RATE_BURST)
+    assert wait_until(lambda: flooder.closed) and flooder.strikes == FLOOD_STRIKES
+
+    big_peer, sock = socket.socketpair()
+    local = Connection(sock, writer, addr=("127.0.0.1", 4000))     # exempt from the rate limits, not the size limit
+    big_peer.sendall(b"x" * (MAX_FRAME + 1) + b"\n")
+    assert wait_until(lambda: local.closed)
+    for sock in (flood_peer, big_peer):
+        sock.close()
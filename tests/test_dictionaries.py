@@ -0,0 +1,59 @@
+# The shared, lazily loaded dictionary cache (WordChainDictionaries.py)
+
+import threading
+
+import pytest
+
+from WordChainDictionaries import DictionaryCache, LanguageUnavailable, ENCHANT_DICTIONARY_BYTES, is_language_tag
+
+
+class Loader:
+    def __init__(self, gate=None):
+        self.loads = []
+        self.gate = gate
+
+    def __call__(self, language):
+        self.loads.append(language)
+        if self.gate is not None:
+            assert self.gate.wait(5)
+        if language == "xx_XX":
+            raise LanguageUnavailable(language)
+        return f"dictionary {language}", None
+
+
+def test_rooms_waiting_for_one_language_share_its_load():
+    gate = threading.Event()
+    load = Loader(gate)
+    cache = DictionaryCache(load)
+    entries = []
+    rooms = [threading.Thread(target=lambda: entries.append(cache.get("de_DE"))) for _ in range(4)]
+    for room in rooms:
+        room.start()
+    gate.set()
+    for room in rooms:
+        room.join(5)
+    assert load.loads == ["de_DE"] and len(entries) == 4
+    assert all(entry is entries[0] for entry in entries)
+
+
+def test_least_recently_used_languages_are_dropped_over_the_cap():
+    load = Loader()
+    cache = DictionaryCache(load, capacity=2 * ENCHANT_DICTIONARY_BYTES)
+    cache.get("en_US")
+    cache.get("de_DE")
+    cache.get("en_US")          # now the most recently used
+    cache.get("fr_FR")
+    assert cache.languages() == ["fr_FR", "en_US"]
+    assert cache.size == 2 * ENCHANT_DICTIONARY_BYTES
+    cache.get("de_DE")
+    assert load.loads == ["en_US", "de_DE", "fr_FR", "de_DE"]
+
+
+def test_unavailable_languages_are_not_cached():
+    load = Loader()
+    cache = DictionaryCache(load)
+    for _ in range(2):
+        with pytest.raises(LanguageUnavailable):
+            cache.get("xx_XX")
+    assert load.loads == ["xx_XX", "xx_XX"] and not cache.cached("xx_XX")
+    assert is_language_tag("pt_BR") and is_language_tag("de") and not is_language_tag("../etc")
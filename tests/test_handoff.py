@@ -0,0 +1,109 @@
+# Passing the listening sockets and lobby players to a new process (WordChainHandoff.py)
+
+import socket
+import threading
+
+import pytest
+
+from conftest import next_of, start_server, stop_server, wait_for_line
+from WordChainHandoff import Handoff, take_over, confirm, handoff_supported
+from WordChainProtocol import Client, Identified, Welcome
+
+pytestmark = pytest.mark.skipif(not handoff_supported(), reason="needs Unix sockets with fd passing")
+
+
+def test_sockets_and_pending_input_are_handed_over(tmp_path):
+    listener = socket.socket()
+    listener.bind(("localhost", 0))
+    listener.listen()
+    port = listener.getsockname()[1]
+    player, server_side = socket.socketpair()
+    pending = "Name ada\nLanguage de_DE\n".encode() + "é".encode("latin-1")    # any bytes survive
+
+    old = Handoff(str(tmp_path / "handoff"))
+    old.listen()
+    taken = {}
+
+    def new_process():
+        channel, listeners, waiting = take_over(old.path)
+        taken.update(listeners=listeners, waiting=waiting)
+        confirm(channel)
+
+    thread = threading.Thread(target=new_process)
+    thread.start()
+    assert old.requested.wait(5)
+    assert old.hand_over([listener], [(server_side, pending)])
+    thread.join(5)
+    listener.close()
+    server_side.close()     # the new process holds its own descriptors
+
+    (new_listener,) = taken["listeners"]
+    (new_sock, new_pending), = taken["waiting"]
+    assert new_pending == pending
+    # The same listening socket: a client connecting to the old port is accepted by the new process
+    with socket.create_connection(("localhost", port), timeout=5):
+        accepted, _ = new_listener.accept()
+        accepted.close()
+    new_sock.sendall(b"Welcome back\n")
+    assert player.recv(64) == b"Welcome back\n"
+    for sock in (new_listener, new_sock, player):
+        sock.close()
+
+
+def test_no_ready_keeps_the_old_process_serving(tmp_path):
+    old = Handoff(str(tmp_path / "handoff"))
+    old.listen()
+    channel = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    channel.connect(old.path)
+    channel.sendall(b"TAKEOVER\n")
+    assert old.requested.wait(5)
+    channel.close()     # the new process died before sending READY
+    listener = socket.socket()
+    listener.bind(("localhost", 0))
+    assert not old.hand_over([listener], [])
+    listener.close()
+
+
+def test_lobby_player_keeps_their_place_across_a_takeover(server, tmp_path):
+    with Client("localhost", server.port, name="ada") as ada:
+        next_of(ada, Identified)
+        replacement = start_server(str(tmp_path), server.port, "--takeover")
+        try:
+            assert wait_for_line(replacement.log, "Took over the listening sockets (1 player(s) waiting)"), \
+                open(replacement.log).read()
+            with Client("localhost", server.port, name="bob") as bob:
+                next_of(bob, Welcome)
+                welcome = next_of(ada, Welcome)
+                assert (welcome.seat, welcome.players) == (1, 2)
+        finally:
+            stop_server(replacement)
+
+
+def test_a_failed_game_thread_still_lets_the_old_process_drain(monkeypatch):
+    server = pytest.importorskip("WordChainServer")     # needs PyEnchant
+    from WordChainConnection import Inbox
+
+    class Player(Inbox):
+        addr = ("203.0.113.5", 4000)
+        closed = False
+
+        def close_when_flushed(self):
+            self.closed = True
+
+    class Spectators:
+        def open_game(self, game_id, text):
+            pass
+
+        def close_game(self, game_id):
+            pass
+
+    def crash(*args):
+        raise RuntimeError("game thread crashed")
+
+    monkeypatch.setattr(server, "play_game", crash)
+    players = [Player(), Player()]
+    running = server.active_games()
+    with pytest.raises(RuntimeError):
+        server.word_chain_thread(players, None, 77, Spectators())
+    assert server.active_games() == running     # drain() does not wait for it
+    assert 77 not in server.sessions.sessions and all(player.closed for player in players)
@@ -0,0 +1,34 @@
+# Who a player is: names register new players, tokens log existing ones in
+
+import time
+
+from conftest import next_of
+from WordChainProtocol import Client, Identified, Message, Token
+
+
+def events_for(client, seconds):
+    end = time.monotonic() + seconds
+    events = []
+    while time.monotonic() < end:
+        event = client.next_event(timeout=end - time.monotonic())
+        if event is not None:
+            events.append(event)
+    return events
+
+
+def test_only_the_token_logs_in_as_a_registered_name(server):
+    with Client("localhost", server.port, name="ada") as ada:
+        identified = next_of(ada, Identified)
+        token = next_of(ada, Token).token
+    assert identified.name == "ada"
+
+    # Someone else claiming the name is a guest and never sees the token
+    with Client("localhost", server.port, name="ada") as impostor:
+        events = events_for(impostor, 2)
+    assert not any(isinstance(event, (Identified, Token)) for event in events)
+    assert any(isinstance(event, Message) and "already registered" in event.text for event in events)
+
+    with Client("localhost", server.port, token=token) as ada:
+        events = events_for(ada, 2)
+    assert any(isinstance(event, Identified) and event.player_id == identified.player_id for event in events)
+    assert not any(isinstance(event, Token) for event in events)
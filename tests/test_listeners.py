@@ -0,0 +1,37 @@
+# TCP, IPv6 and Unix socket listeners accepting as one (WordChainListeners.py)
+
+import socket
+
+import pytest
+
+from conftest import free_port
+from WordChainListeners import UNIX_PEER, open_listeners
+
+
+def test_every_listener_feeds_the_same_accept(tmp_path):
+    port = free_port()
+    path = str(tmp_path / "game.sock")
+    group = open_listeners(port, unix_path=path)
+    group.settimeout(5)
+    try:
+        with socket.create_connection(("127.0.0.1", port)):
+            sock, addr = group.accept()
+            assert addr[0] == "127.0.0.1"
+            sock.close()
+        if hasattr(socket, "AF_UNIX"):
+            with socket.socket(socket.AF_UNIX) as client:
+                client.connect(path)
+                sock, addr = group.accept()
+                assert addr[0] == UNIX_PEER
+                sock.close()
+        if any(sock.family == socket.AF_INET6 for sock in group.sockets):     # IPv6 is available here
+            with socket.create_connection(("::1", port)):
+                sock, addr = group.accept()
+                assert addr[0] == "::1"
+                sock.close()
+        assert f"0.0.0.0:{port}" in group.describe()
+        group.settimeout(0.1)
+        with pytest.raises(socket.timeout):
+            group.accept()
+    finally:
+        group.close()
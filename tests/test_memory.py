@@ -0,0 +1,45 @@
+# Memory accounting per subsystem and budgets (WordChainMemory.py)
+
+import argparse
+
+import pytest
+
+from WordChainAdmin import SessionTable
+from WordChainMemory import MemoryAccounting, parse_budget, sessions_memory, SESSION_BYTES
+
+
+def test_budgets_refuse_new_games_until_memory_is_back_under():
+    memory = MemoryAccounting()
+    used = {"records": 3 * 2 ** 20}
+    memory.estimate("records", lambda: used["records"])
+    memory.estimate("caches", lambda: 1 / 0)      # a failing estimator counts as nothing
+    memory.budgets = dict([parse_budget("records=2")])
+    memory.sample()
+    assert memory.refusing() == "records over its 2.0 MB budget"
+    assert memory.estimated["caches"] == 0
+    assert "New games: refused" in memory.report()
+
+    used["records"] = 2 ** 20
+    memory.sample()
+    assert memory.refusing() is None
+    report = memory.report()
+    assert "records" in report and "1.0 MB" in report and "New games: accepted" in report
+
+
+def test_budget_names_are_checked():
+    assert parse_budget("rss=1.5") == ("rss", 3 * 2 ** 19)
+    for text in ("nothing=5", "records", "records=lots"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_budget(text)
+
+
+def test_sessions_memory_grows_with_the_words_played():
+    class Player:
+        addr = ("203.0.113.5", 4000)
+
+    sessions = SessionTable()
+    sessions.open(1, [Player(), Player()])
+    empty = sessions_memory(sessions)
+    assert empty == SESSION_BYTES
+    sessions.update(1, words=("apple", "eagle"))
+    assert sessions_memory(sessions) > empty
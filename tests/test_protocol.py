@@ -0,0 +1,49 @@
+# The client protocol library (WordChainProtocol.py): decoding and connection failures
+
+import asyncio
+import socket
+import threading
+
+from conftest import free_port
+from WordChainProtocol import AsyncClient, Client, Decoder, Disconnected, NamePrompt, Redirect, WordPlayed, YourTurn
+
+
+def coordinator(line):
+    # Accepts one client and redirects it with `line`; returns the port
+    listener = socket.socket()
+    listener.bind(("localhost", 0))
+    listener.listen()
+
+    def serve():
+        sock, _ = listener.accept()
+        sock.sendall(line.encode())
+        sock.recv(1024)
+        sock.close()
+        listener.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    return listener.getsockname()[1]
+
+
+def test_lines_split_across_reads_decode_once():
+    decoder = Decoder()
+    assert decoder.feed(b"Player 2 used 'ap") == []
+    events = decoder.feed(b"ple'.\nYour turn.\nPlease enter your name for the record: ")
+    assert [type(event) for event in events] == [WordPlayed, YourTurn, NamePrompt]
+    assert (events[0].seat, events[0].word) == (2, "apple")
+
+
+def test_unreachable_game_node_ends_in_disconnected():
+    port = coordinator(f"Redirect localhost {free_port()} ticket\n")    # nothing listens there
+    with Client("localhost", port, name="ada") as client:
+        assert type(client.next_event(timeout=5)) is Redirect
+        assert type(client.next_event(timeout=5)) is Disconnected
+
+
+def test_unreachable_game_node_ends_in_disconnected_async():
+    async def play():
+        port = coordinator(f"Redirect localhost {free_port()} ticket\n")
+        async with AsyncClient("localhost", port, name="ada") as client:
+            return [type(await client.next_event(timeout=5)) for _ in range(2)]
+
+    assert asyncio.run(play()) == [Redirect, Disconnected]
@@ -0,0 +1,79 @@
+# Records kept in memory and journaled (WordChainRecords.py), and the shared records service
+
+import json
+import os
+import socket
+import threading
+
+from WordChainProfiles import ProfileCache
+from WordChainRecords import RecordStore
+from WordChainRecordsService import handle_records_client
+
+
+def test_journal_replays_after_a_restart(tmp_path):
+    profiles = ProfileCache(str(tmp_path / "players.txt"))
+    ada, bob = profiles.register("ada"), profiles.register("bob")
+    path = str(tmp_path / "records.txt")
+    store = RecordStore(profiles, path)
+    store.record([(ada.player_id, True, 12), (bob.player_id, False, 7)])
+    store.record([(bob.player_id, True, 3), (ada.player_id, False, 9)])
+    assert not os.path.exists(path)     # only the journal has been written
+
+    with open(os.path.splitext(path)[0] + ".journal", "a") as f:
+        f.write(f"{ada.player_id},ada,9")   # a line cut short by a crash
+    restarted = RecordStore(profiles, path)
+    assert restarted.get(ada.player_id) == (1, 1, 12)
+    assert restarted.get(bob.player_id) == (1, 1, 7)
+    assert restarted.top(2) == [(ada.player_id, 12), (bob.player_id, 7)]
+
+
+def test_compaction_rewrites_the_records_file(tmp_path):
+    profiles = ProfileCache(str(tmp_path / "players.txt"))
+    ada = profiles.register("ada")
+    path = str(tmp_path / "records.txt")
+    store = RecordStore(profiles, path, compact_after=2)
+    for score in (4, 8):
+        store.record([(ada.player_id, True, score)])
+    compacting = store._compacting     # the background rewrite, unless it has already finished
+    if compacting is not None:
+        compacting.join()
+    assert open(path).read() == f"{ada.player_id},ada,2,0,8\n"
+    assert not os.path.exists(store.journal_path + ".old")
+    store.record([(ada.player_id, True, 6)])     # in the new journal, replayed over the file
+    assert RecordStore(profiles, path).get(ada.player_id) == (3, 0, 8)
+
+
+def test_name_keyed_rows_are_given_ids(tmp_path):
+    profiles = ProfileCache(str(tmp_path / "players.txt"))
+    path = str(tmp_path / "records.txt")
+    with open(path, "w") as f:
+        f.write("ada,2,1,10\nAda,1,0,14\nbob,0,3,5\n")
+    store = RecordStore(profiles, path)
+    ada = profiles.login(name="ada")
+    assert store.get(ada.player_id) == (3, 1, 14)
+    assert open(path).read().count("\n") == 2   # rewritten in the ID-keyed format
+
+
+def test_records_service_only_gives_a_profile_for_its_token(tmp_path):
+    profiles = ProfileCache(str(tmp_path / "players.txt"))
+    ada = profiles.register("ada")
+    node, service = socket.socketpair()
+    threading.Thread(target=handle_records_client,
+                     args=(service, None, None, lambda token: profiles.login(token=token), profiles.register,
+                           lambda difficulty: profiles.login(name=f"computer ({difficulty})")),
+                     daemon=True).start()
+    replies = node.makefile("r")
+
+    def call(request):
+        node.sendall((json.dumps(request) + "\n").encode())
+        return json.loads(replies.readline())
+
+    assert call({"op": "login", "name": "ada"})["profile"] is None
+    assert call({"op": "login", "token": ada.token})["profile"] == list(ada)
+    assert call({"op": "register", "name": "Ada"})["profile"] is None
+    bob = call({"op": "register", "name": "bob"})["profile"]
+    assert bob[1] == "bob" and profiles.login(token=bob[2]).player_id == bob[0]
+    computer = call({"op": "bot", "difficulty": "hard"})["profile"]
+    assert computer[1] == "computer (hard)" and computer[2] is None
+    assert not call({"op": "bot", "difficulty": "ada"})["ok"]
+    node.close()
@@ -0,0 +1,47 @@
+# Offline merge of record files (WordChainRecordsTool.py)
+
+import os
+
+from WordChainProfiles import ProfileCache, PLAYERS_FILE
+from WordChainRecordsTool import RecordsTool
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def test_merge_rekeys_sources_and_leaves_conflicts_out(tmp_path):
+    main, node = str(tmp_path / "main"), str(tmp_path / "node")
+    players = os.path.join(main, PLAYERS_FILE)
+    write(players, "1,ada,aaaa\n2,bob,bbbb\n")
+    # The main server's records; the journal's later line replaces the file's
+    write(os.path.join(main, "records.txt"), "1,ada,3,1,10\n2,bob,1,1,8\n")
+    write(os.path.join(main, "records.journal"), "1,ada,4,1,12\nnot a record\n")
+    # Another node numbered its players itself: its 1 is bob and its 2 is cy
+    write(os.path.join(node, PLAYERS_FILE), "1,bob,bbbb\n2,cy,cccc\n")
+    write(os.path.join(node, "records.txt"), "1,bob,2,0,15\n2,cy,0,2,4\n")
+    # A source without a players file shares main's, but names player 2 differently
+    write(os.path.join(str(tmp_path / "old"), "records.txt"), "2,dee,5,5,50\n")
+
+    output = os.path.join(main, "merged.txt")
+    tool = RecordsTool([os.path.join(main, "records.txt"), os.path.join(node, "records.txt"),
+                        os.path.join(str(tmp_path / "old"), "records.txt")], players)
+    stats = tool.run(output)
+
+    assert stats.invalid == 1 and stats.conflicts == 1
+    assert open(output).read() == "1,ada,4,1,12\n2,bob,3,1,15\n3,cy,0,2,4\n"
+    cy = ProfileCache(players).login(name="cy")
+    assert (cy.player_id, cy.token) == (3, "cccc")   # registered in main's players file with its token
+
+
+def test_check_writes_nothing(tmp_path):
+    players = str(tmp_path / PLAYERS_FILE)
+    write(players, "1,ada,aaaa\n")
+    write(str(tmp_path / "records.txt"), "ada,1,0,5\nzed,0,1,2\n")
+    output = str(tmp_path / "merged.txt")
+    stats = RecordsTool([str(tmp_path / "records.txt")], players, check=True).run(output)
+    assert stats.legacy == 2 and stats.players == 2 and not stats.invalid
+    assert not os.path.exists(output)
+    assert open(players).read() == "1,ada,aaaa\n"
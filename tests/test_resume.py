@@ -0,0 +1,48 @@
+# Resuming a game after a dropped connection (WordChainProtocol.Client and the server's session tokens)
+
+import time
+from socket import SHUT_RDWR
+
+from conftest import next_of
+from WordChainProtocol import Client, Decoder, GameState, Resumed, Reconnecting, YourTurn, Accepted, WordPlayed, \
+    UsedWords, SessionToken
+
+
+def test_resync_restores_game_state():
+    # The lines a server sends to a player who resumed, split mid-line and mid-character
+    state = GameState()
+    data = ("Resumed game 7: you are Player 2 of 3.\nRound 1\nTurn 4\n"
+            "Used words: apple elephant tiger\nLast word: 'tiger'. The next word must start with 'r'.\n"
+            "Your turn.\n").encode()
+    decoder = Decoder()
+    events = decoder.feed(data[:23]) + decoder.feed(data[23:])
+    for event in events:
+        state.apply(event)
+    resumed = events[0]
+    assert isinstance(resumed, Resumed) and (resumed.game_id, resumed.seat, resumed.players) == (7, 2, 3)
+    assert any(isinstance(event, UsedWords) for event in events)
+    assert isinstance(events[-1], YourTurn)
+    assert state.used_words == {"apple", "elephant", "tiger"}
+    assert state.last_letter == "r"
+    assert state.turn == 4
+
+
+def test_player_resumes_after_connection_drops(server):
+    with Client("localhost", server.port, name="ada") as ada:
+        time.sleep(0.3)     # ada is seated first
+        with Client("localhost", server.port, name="bob") as bob:
+            next_of(ada, SessionToken)
+            next_of(ada, YourTurn)
+
+            # The socket dies under the client; it reconnects with its session token
+            ada.sock.shutdown(SHUT_RDWR)
+            next_of(ada, Reconnecting)
+            resumed = next_of(ada, Resumed)
+            assert resumed.seat == 1 and resumed.players == 2
+            next_of(ada, YourTurn)
+
+            # The game thread never noticed: the word sent on the new socket counts
+            ada.play("apple")
+            next_of(ada, Accepted)
+            played = next_of(bob, WordPlayed)
+            assert (played.seat, played.word) == (1, "apple")
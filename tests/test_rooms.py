@@ -0,0 +1,87 @@
+# Rooms of more than two players: the turn ring and elimination (WordChainServer.py)
+
+import pytest
+
+pytest.importorskip("enchant")     # WordChainServer loads PyEnchant
+
+from WordChainConnection import Inbox
+from WordChainServer import TurnRing, play_game
+
+WORDS = {"apple", "eagle", "elephant", "tiger", "rabbit", "tree", "egg", "goat", "tea", "ant"}
+
+
+class Dictionary:
+    tag = "en_US"
+
+    def check(self, word):
+        return word in WORDS
+
+
+class Spectators:
+    def describe_game(self, game_id, text):
+        pass
+
+    def publish(self, game_id, text):
+        pass
+
+
+class Player(Inbox):
+    """Answers each "Your turn." with the next of its words."""
+
+    def __init__(self, name, words):
+        Inbox.__init__(self)
+        self.name = name
+        self.words = list(words)
+        self.closed = False
+        self.text = ""
+        self.settimeout(5)
+
+    def send(self, data):
+        self.text += data.decode() if isinstance(data, bytes) else data
+        if self.text.endswith("Your turn.\n"):
+            self._deliver((self.words.pop(0) + "\n").encode())
+
+
+def seats(ring):
+    numbers, seat = [], ring.current
+    for _ in range(len(ring)):
+        numbers.append(seat.number)
+        seat = seat.next
+    return numbers
+
+
+def test_ring_wraps_around():
+    ring = TurnRing(["a", "b", "c"])
+    turns = []
+    for _ in range(7):
+        turns.append(ring.current.number)
+        ring.advance()
+    assert turns == [1, 2, 3, 1, 2, 3, 1]
+
+
+def test_removal_passes_the_turn_on():
+    ring = TurnRing(["a", "b", "c", "d"])
+    ring.advance()                  # player 2's turn
+    ring.remove(ring.current)       # player 2 is out: player 3 is next
+    assert ring.current.number == 3 and len(ring) == 3
+    assert seats(ring) == [3, 4, 1]
+    ring.remove(ring.current.prev)  # player 1, not on turn, is out
+    assert ring.current.number == 3 and seats(ring) == [3, 4]
+    ring.advance()
+    ring.advance()
+    assert ring.current.number == 3     # two players alternate
+    ring.remove(ring.current.next)
+    assert len(ring) == 1 and ring.current.next is ring.current
+
+
+def test_finishing_order_is_the_reverse_of_elimination():
+    ada = Player("ada", ["apple", "tiger", "tree", "goat"])
+    bob = Player("bob", ["eagle", "tea"])                   # "tea" after "tiger": wrong letter
+    cy = Player("cy", ["zzz"])                              # not a word
+    dee = Player("dee", ["elephant", "rabbit", "egg", "tiger"])    # "tiger" again: already used
+    placements, words_played = play_game([ada, bob, cy, dee], Dictionary(), 0, Spectators(), 1)
+    assert [player.name for player in placements] == ["ada", "dee", "bob", "cy"]
+    assert [words_played[player] for player in placements] == [4, 3, 1, 0]
+    assert "You finished 4 of 4." in cy.text and "You finished 3 of 4." in bob.text
+    assert "You finished 2 of 4." in dee.text and ada.text.endswith("Game over! You won!\n")
+    assert "Player 3 is out! 3 players remain." in ada.text
@@ -0,0 +1,27 @@
+# Scoring mode: points by word length, rarity and chain length (WordChainScoring.py)
+
+from WordChainScoring import ScoreTable, chain_multiplier, load_frequency_ranks, RARITY_TIERS, MAX_MULTIPLIER
+from WordChainWordIndex import WordIndex
+
+
+def test_points_follow_length_and_rarity(tmp_path):
+    path = tmp_path / "frequencies.txt"
+    path.write_text("the 23135851162\nEat 100\ntea\neat 50\n")     # a repeated word keeps its first rank
+    ranks = load_frequency_ranks([str(tmp_path / "missing.txt"), str(path)])
+    assert ranks == {"the": 0, "eat": 1, "tea": 2}
+
+    table = ScoreTable(WordIndex(["eat", "tea", "elephant", "tomato"]), ranks)
+    assert table.score("eat") == table.score("tea") == 1
+    assert table.score("elephant") == 6 * (len(RARITY_TIERS) + 1)     # not in the list: the rarest
+    assert table.score("rhinoceros") == 8 * (len(RARITY_TIERS) + 1)   # not indexed: scored on the spot
+    assert table.nbytes == 4 * table.points.itemsize
+
+
+def test_without_a_frequency_list_only_length_counts(tmp_path):
+    assert load_frequency_ranks([str(tmp_path / "missing.txt")]) is None
+    table = ScoreTable(WordIndex(["ant", "elephant"]))
+    assert not table.ranked and table.score("elephant") == 6 and table.score("rhinoceros") == 8
+
+
+def test_chain_multiplier_steps_up_to_its_cap():
+    assert [chain_multiplier(n) for n in (0, 9, 10, 25, 1000)] == [1, 1, 2, 3, MAX_MULTIPLIER]
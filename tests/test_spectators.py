@@ -0,0 +1,46 @@
+# Read-only spectators of live games (WordChainSpectators.py)
+
+import socket
+import threading
+
+from WordChainConnection import ConnectionWriter
+from WordChainSpectators import SpectatorHub, handle_spectator
+
+
+def read_until(sock, text):
+    data = b""
+    while text.encode() not in data:
+        chunk = sock.recv(4096)
+        assert chunk, f"closed before {text!r}: {data!r}"
+        data += chunk
+    return data.decode()
+
+
+def spectator(hub):
+    peer, sock = socket.socketpair()
+    peer.settimeout(5)
+    threading.Thread(target=handle_spectator, args=(sock, ("203.0.113.5", 4000), hub), daemon=True).start()
+    read_until(peer, "Commands:")
+    return peer
+
+
+def test_spectators_follow_a_game_until_it_closes():
+    hub = SpectatorHub(ConnectionWriter())
+    hub.open_game(7, "2 players, waiting to start")
+    watchers = [spectator(hub), spectator(hub)]
+
+    watchers[0].sendall(b"LIST\n")
+    assert "7: 2 players, waiting to start (0 watching)" in read_until(watchers[0], "watching)")
+    watchers[0].sendall(b"SPECTATE 8\n")
+    assert "No game 8 in progress." in read_until(watchers[0], "progress.")
+    for watcher in watchers:
+        watcher.sendall(b"SPECTATE 7\n")
+        read_until(watcher, "Spectating game 7")
+    assert hub.list_games() == [(7, "2 players, waiting to start", 2)]
+
+    hub.publish(7, "Player 1 used 'apple'.\n")
+    hub.close_game(7)
+    for watcher in watchers:
+        assert "Player 1 used 'apple'." in read_until(watcher, "apple")
+        assert watcher.recv(4096) == b""        # disconnected once the queue is written
+    assert hub.list_games() == []
@@ -0,0 +1,76 @@
+# Tournament brackets, check-in, and what happens when a match cannot be played
+
+import pytest
+
+pytest.importorskip("enchant")     # WordChainTournament plays on the server's game engine
+
+import WordChainServer
+from WordChainConnection import Inbox
+from WordChainTournament import Bracket, TournamentLobby, TournamentRunner, report_results, MATCH_ATTEMPTS
+
+
+def test_failed_match_waits_for_an_admin_decision(tmp_path):
+    path = str(tmp_path / "tournament.json")
+    bracket = Bracket(["ada", "bob", "cy", "dee"])
+    bracket.start_journal(path)
+    attempts = []
+
+    def play_match(match):
+        if match["id"] == "1-0":
+            attempts.append(match["id"])
+            raise RuntimeError("game thread crashed")
+        return match["players"][1]
+
+    runner = TournamentRunner(bracket, play_match, path, retry_delay=0)
+    assert runner.run() is None
+    assert runner.undecided == ["1-0"] and len(attempts) == MATCH_ATTEMPTS
+    assert bracket.match("1-0")["winner"] is None
+
+    # The failures are not results: a restart still has the match to decide
+    bracket = Bracket.load(path)
+    assert bracket.match("1-0")["winner"] is None
+    assert bracket.match("1-1")["winner"] == "cy"
+
+    report_results(bracket, path, ["1-0=ada"])
+    assert Bracket.load(path).match("2-0")["players"] == ["ada", "cy"]
+    assert TournamentRunner(bracket, play_match, path).run()[0] == "cy"
+
+
+class Conn(Inbox):
+    def __init__(self, handshake):
+        Inbox.__init__(self)
+        self.closed = False
+        self.text = ""
+        self._deliver(handshake.encode())
+
+    def send(self, text):
+        self.text += text
+        if text.endswith("tournament name: "):
+            self._deliver(b"\n")
+
+    def close_when_flushed(self):
+        self.closed = True
+
+    close = close_when_flushed
+
+
+def test_check_in_needs_the_token_of_a_registered_player(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(WordChainServer, "profiles", None)
+    monkeypatch.setattr(WordChainServer, "record_stores", {})
+    ada = WordChainServer.local_records()[0].register("ada")
+    lobby = TournamentLobby(Bracket(["ada", "bob"]), None, None, None)
+
+    impostor = Conn("Name ada\n")
+    lobby._check_in(impostor)
+    assert "check in with their token" in impostor.text and impostor.closed
+    assert lobby._connections == {}
+
+    bob = Conn("Name bob\n")        # not a registered player: checked in by name, without a profile
+    lobby._check_in(bob)
+    assert "Checked in as bob." in bob.text and lobby._profiles["bob"] is None
+    assert WordChainServer.local_records()[0].by_name.get("bob") is None
+
+    player = Conn(f"Token {ada.token}\n")
+    lobby._check_in(player)
+    assert "Checked in as ada." in player.text and lobby._profiles["ada"] == ada
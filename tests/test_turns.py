@@ -0,0 +1,55 @@
+# Turns: the time limit and /hint requests (WordChainServer.read_move)
+
+import threading
+import time
+from socket import timeout
+
+import pytest
+
+pytest.importorskip("enchant")     # WordChainServer loads PyEnchant
+
+from WordChainConnection import Inbox
+from WordChainServer import read_move
+from WordChainWordIndex import WordIndex
+
+
+class Player(Inbox):
+    def __init__(self):
+        Inbox.__init__(self)
+        self.sent = []
+
+    def send(self, text):
+        self.sent.append(text)
+
+
+def test_hints_do_not_extend_the_turn():
+    player = Player()
+    player.settimeout(0.5)
+    pool = WordIndex(["apple", "egg"]).new_pool()
+    stop = threading.Event()
+
+    def ask_for_hints():
+        while not stop.wait(0.1):
+            if not player._inbox:   # one request per read, as a client typing them would send
+                player._deliver(b"/hint\n")
+
+    threading.Thread(target=ask_for_hints, daemon=True).start()
+    started = time.monotonic()
+    try:
+        with pytest.raises(timeout):
+            read_move(player, pool, "e", {player: 1})
+    finally:
+        stop.set()
+    assert time.monotonic() - started < 1.0
+    assert player.gettimeout() == 0.5      # the next turn gets the full time again
+    assert "Hint: try 'egg'.\nYour turn.\n" in player.sent
+    assert "No hints left this game.\nYour turn.\n" in player.sent
+
+
+def test_move_after_a_hint():
+    player = Player()
+    player.settimeout(5)
+    pool = WordIndex(["apple", "egg"]).new_pool()
+    player._deliver(b"/hint\n")
+    threading.Timer(0.1, player._deliver, (b"egg\n",)).start()
+    assert read_move(player, pool, "e", {player: 1}) == b"egg\n"
@@ -0,0 +1,62 @@
+# Word checks in worker processes (WordChainValidation.py)
+
+import threading
+
+import pytest
+
+from WordChainValidation import Ring, REQUEST, ValidationPool, Validator
+
+
+class Dictionary:
+    tag = "en_US"
+
+    def check(self, word):
+        return word in ("apple", "eagle")
+
+
+def test_ring_slots_are_read_in_order_across_wrap_around():
+    writer = Ring(REQUEST, 4)
+    reader = Ring(REQUEST, 4, writer.name)
+    try:
+        for n in range(10):
+            word = f"word{n}".encode()
+            writer.put(n, b"en_US", len(word), word)
+            request_id, language, length, data = reader.get()
+            assert (request_id, language.rstrip(b"\0"), data[:length]) == (n, b"en_US", word)
+    finally:
+        reader.close()
+        writer.close(unlink=True)
+
+
+def test_without_a_pool_words_are_checked_inline():
+    validator = Validator()
+    validator.start(0)
+    assert validator.check(Dictionary(), "apple") and not validator.check(Dictionary(), "zzz")
+
+
+def test_workers_answer_concurrent_games_and_a_dead_worker_falls_back():
+    pytest.importorskip("enchant")     # the workers load PyEnchant dictionaries
+    pool = ValidationPool(2)
+    try:
+        words = ["apple", "zzz", "eagle", "qqq"] * 25
+        results = [None] * len(words)
+
+        def game(i):
+            results[i] = pool.check("en_US", words[i])
+
+        games = [threading.Thread(target=game, args=(i,)) for i in range(len(words))]
+        for thread in games:
+            thread.start()
+        for thread in games:
+            thread.join(30)
+        assert results == [word in ("apple", "eagle") for word in words]
+        assert pool.check("xx_XX", "apple") is None     # no such dictionary: checked inline
+
+        for worker in pool.workers:
+            worker.process.kill()
+        assert pool.check("en_US", "apple") is None
+        validator = Validator()
+        validator.pool = pool
+        assert validator.check(Dictionary(), "apple")   # inline, from the game's own dictionary
+    finally:
+        pool.close()
@@ -0,0 +1,60 @@
+# The word index and per-game word pools (WordChainWordIndex.py)
+
+from WordChainWordIndex import WordIndex, COMPLETE_MARKER, load_word_index
+
+
+class AcceptAll:
+    def check(self, word):
+        return True
+
+
+def test_pool_counts_follow_played_words():
+    index = WordIndex(["apple", "ant", "tiger", "egg", "a", "Bob", "x-ray"])
+    assert sorted(index.sorted_words) == ["ant", "apple", "egg", "tiger"]
+    pool = index.new_pool()
+    assert pool.remaining("a") == 2
+    pool.mark_used("apple")
+    pool.mark_used("apple")     # counted once
+    pool.mark_used("zebra")     # not indexed: the counts are unchanged
+    assert pool.remaining("a") == 1
+    assert pool.any_word("a") == "ant"
+    pool.mark_used("ant")
+    assert pool.remaining("a") == 0 and pool.any_word("a") is None
+    assert index.new_pool().remaining("a") == 2    # every game starts from the full index
+
+
+def test_dead_end_needs_a_complete_word_list():
+    words = ["apple", "egg"]
+    partial, complete = WordIndex(words), WordIndex(words, complete=True)
+    for index in (partial, complete):
+        pool = index.new_pool()
+        pool.mark_used("apple")
+        assert pool.remaining("a") == 0
+    assert not partial.new_pool().dead_end("q")
+    assert complete.new_pool().dead_end("q")
+    assert not complete.new_pool().dead_end("e")
+    assert not complete.new_pool().dead_end("é")
+
+    # A word the index cannot hold means the list no longer has every word
+    for word in ("über", "don't", "e-mail", "a"):
+        assert not WordIndex(words + [word], complete=True).complete, word
+
+
+def test_word_list_marker(tmp_path):
+    marked, plain = tmp_path / "marked.txt", tmp_path / "plain.txt"
+    marked.write_text(f"{COMPLETE_MARKER}\napple\negg\n")
+    plain.write_text("apple\negg\n")
+    assert load_word_index(AcceptAll(), [str(marked)]).complete
+    assert not load_word_index(AcceptAll(), [str(plain)]).complete
+    assert load_word_index(AcceptAll(), [str(tmp_path / "missing.txt")]) is None
+
+
+def test_complete_list_with_words_the_index_cannot_hold(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text(f"{COMPLETE_MARKER}\nApple\negg\ndon't\n")
+    index = load_word_index(AcceptAll(), [str(path)])
+    assert index.sorted_words == ["apple", "egg"]   # moves are lowercased, so the list is too
+    assert not index.complete                       # "don't" is accepted but not indexed
+    pool = index.new_pool()
+    pool.mark_used("egg")
+    assert not pool.dead_end("d")